@@ -1,5 +1,21 @@
 """Report Generation Evaluator package."""
 
-from .evaluator import evaluate_report, evaluate_sentence, ModelProvider
+from .evaluator import (
+    evaluate_report,
+    evaluate_report_async,
+    evaluate_sentence,
+    evaluate_sentence_async,
+    ModelProvider,
+)
+from .nuggets import NuggetBank
+from .scheduler import evaluate_reports_by_sentence
 
-__all__ = ['evaluate_report', 'evaluate_sentence', 'ModelProvider']
+__all__ = [
+    'evaluate_report',
+    'evaluate_report_async',
+    'evaluate_reports_by_sentence',
+    'evaluate_sentence',
+    'evaluate_sentence_async',
+    'ModelProvider',
+    'NuggetBank',
+]
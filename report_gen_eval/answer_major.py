@@ -0,0 +1,328 @@
+"""Answer-major nugget judging.
+
+check_nugget_matches judges every candidate sentence against every gold
+answer, one prompt per (sentence, answer) pair. Only two kinds of sentences
+are ever checked against nuggets: cited sentences whose citations all
+support them and uncited negative sentences. In answer-major mode their
+nugget check is deferred until the whole report has been walked, and then:
+1. Each gold answer gets one prompt listing all candidate sentences of the
+   report (in chunks of SENTENCES_PER_PROMPT), asking which of them agree
+2. The answers are transposed back into the per-sentence matched_nuggets,
+   and the scores of the deferred sentences are set as in sentence-major mode
+3. A response that cannot be parsed falls back to the single-answer prompts
+   of that chunk, which share the cache with sentence-major mode; a
+   sentence whose fallback prompt still fails gets an error result, as a
+   failed sentence does in sentence-major mode
+
+For topics with fewer gold answers than candidate sentences this sends far
+fewer prompts; recall is computed from matched_nuggets as before.
+"""
+
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .options import EvaluationOptions
+from .prompts import (
+    NUGGET_AGREEMENT_SYSTEM,
+    NUGGET_AGREEMENT_USER,
+    NUGGET_SUPPORT_ITEM,
+    NUGGET_SUPPORT_SYSTEM,
+    NUGGET_SUPPORT_USER,
+)
+from .utils import (
+    BatchResponseError,
+    ModelProvider,
+    abatch_model_responses,
+    aget_model_response,
+    batch_model_responses,
+    get_batch_concurrency,
+    get_model_response,
+)
+
+# Key of a sentence result whose nugget check was deferred; its value is the
+# kind of sentence, which decides the score ("cited" or "negative")
+PENDING_KEY = "pending_nugget_check"
+
+# Maximum number of candidate sentences listed in one prompt
+SENTENCES_PER_PROMPT = 25
+
+# Completion tokens allowed per listed sentence ("12, ")
+TOKENS_PER_SENTENCE = 4
+
+_NUMBER_LIST = re.compile(r"^\d+(\s*,\s*\d+)*$")
+
+
+def defer_nugget_check(results: Dict[str, Any], kind: str):
+    """Mark a sentence result whose nugget check is left to the report."""
+    results[PENDING_KEY] = kind
+
+
+def build_support_prompt(item: Dict[str, Any], sentences: List[str]) -> str:
+    """Build the prompt asking which sentences agree with one gold answer.
+
+    Args:
+        item: Nugget info of the answer, as built by build_nugget_prompts
+        sentences: The candidate sentences, numbered from 1 in the prompt
+
+    Returns:
+        The user prompt
+    """
+    listed = "\n".join(
+        NUGGET_SUPPORT_ITEM.format(index=index, sentence=sentence)
+        for index, sentence in enumerate(sentences, 1)
+    )
+    return NUGGET_SUPPORT_USER.format(
+        nugget_question=item["question_text"],
+        nugget_answer=item["matched_answer"],
+        sentences=listed,
+    )
+
+
+def support_params(num_sentences: int) -> Dict[str, Any]:
+    """Get the decoding parameters of a prompt listing num_sentences sentences."""
+    return {"max_tokens": TOKENS_PER_SENTENCE * num_sentences + 10}
+
+
+def parse_support_response(response: str, num_sentences: int) -> Optional[List[str]]:
+    """Parse the list of agreeing sentences into one YES/NO per sentence.
+
+    Args:
+        response: The model response, e.g. "1, 3" or "NONE"
+        num_sentences: Number of sentences in the prompt
+
+    Returns:
+        "YES"/"NO" for each sentence in prompt order, or None if the response
+        is not a list of valid sentence numbers
+    """
+    response = response.strip().rstrip(".")
+    if response.upper() == "NONE":
+        return ["NO"] * num_sentences
+    if not _NUMBER_LIST.match(response):
+        return None
+    agreeing = {int(number) for number in response.split(",")}
+    if not all(1 <= number <= num_sentences for number in agreeing):
+        return None
+    return ["YES" if index in agreeing else "NO" for index in range(1, num_sentences + 1)]
+
+
+def single_answer_prompts(item: Dict[str, Any], sentences: List[str]) -> List[str]:
+    """Build the sentence-major prompts of one gold answer."""
+    return [
+        NUGGET_AGREEMENT_USER.format(
+            sentence=sentence,
+            nugget_question=item["question_text"],
+            nugget_answer=item["matched_answer"],
+        )
+        for sentence in sentences
+    ]
+
+
+def support_tasks(
+    sentences: List[str],
+    nugget_map: List[Dict[str, Any]],
+    known: Optional[Sequence[Sequence[Optional[str]]]] = None,
+) -> List[Tuple[int, List[int]]]:
+    """List the (answer index, sentence indices) pairs, one per prompt.
+
+    Sentences whose response to an answer is already known are left out of
+    that answer's prompts.
+    """
+    tasks = []
+    for answer in range(len(nugget_map)):
+        indices = [
+            index
+            for index in range(len(sentences))
+            if known is None or known[index][answer] is None
+        ]
+        for start in range(0, len(indices), SENTENCES_PER_PROMPT):
+            tasks.append((answer, indices[start : start + SENTENCES_PER_PROMPT]))
+    return tasks
+
+
+def transpose_answers(
+    sentences: List[str],
+    nugget_map: List[Dict[str, Any]],
+    tasks: List[Tuple[int, List[int]]],
+    answers: List[List[Optional[str]]],
+    options: EvaluationOptions,
+    known: Optional[Sequence[Sequence[Optional[str]]]] = None,
+) -> List[List[Optional[str]]]:
+    """Turn per-answer responses into one row of responses per sentence.
+
+    Args:
+        sentences: The candidate sentences
+        nugget_map: Nugget info of each gold answer
+        tasks: The (answer index, sentence indices) pair of each prompt
+        answers: The YES/NO responses of each prompt, with None for the
+            sentences whose prompt failed
+        options: The run's evaluation options, whose counters are updated
+        known: Optional responses already known for each sentence, with
+            None for the pairs that were judged
+
+    Returns:
+        One list of YES/NO responses per sentence, in nugget_map order, with
+        None for the failed pairs
+    """
+    rows = (
+        [list(row) for row in known]
+        if known is not None
+        else [[None] * len(nugget_map) for _ in sentences]
+    )
+    for (answer, indices), responses in zip(tasks, answers):
+        for index, response in zip(indices, responses):
+            rows[index][answer] = response
+    options.count("answer_major_prompts", len(tasks))
+    options.count("answer_major_pairs", sum(len(indices) for _, indices in tasks))
+    return rows
+
+
+def collect_failures(
+    tasks: List[Tuple[int, List[int]]],
+    errors: List[Optional[BatchResponseError]],
+    options: EvaluationOptions,
+) -> Dict[int, str]:
+    """Map the sentences of failed fallback prompts to their error messages.
+
+    Args:
+        tasks: The (answer index, sentence indices) pair of each prompt
+        errors: The fallback error of each prompt, or None
+        options: The run's evaluation options, whose counters are updated
+
+    Returns:
+        The error message of each failed sentence, by sentence index
+    """
+    failures = {}
+    for (_, indices), error in zip(tasks, errors):
+        if error is None:
+            continue
+        for failure in error.failures:
+            failures.setdefault(indices[failure["index"]], failure["error"])
+    options.count("answer_major_errors", len(failures))
+    return failures
+
+
+def judge_answers_transposed(
+    sentences: List[str],
+    nugget_map: List[Dict[str, Any]],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    options: Optional[EvaluationOptions] = None,
+    known: Optional[Sequence[Sequence[Optional[str]]]] = None,
+) -> Tuple[List[List[Optional[str]]], Dict[int, str]]:
+    """Judge candidate sentences against gold answers, one prompt per answer.
+
+    Prompts are sent concurrently, up to the batch concurrency limit.
+
+    Args:
+        sentences: The candidate sentences of a report
+        nugget_map: Nugget info of each gold answer, as built by
+            build_nugget_prompts
+        provider: The model provider to use
+        model_name: Optional specific model name
+        options: The run's evaluation options, whose counters are updated
+        known: Optional responses already known for each sentence (e.g.
+            literal answer matches), with None for the pairs to judge
+
+    Returns:
+        Tuple of (rows, failures): one list of YES/NO responses per sentence,
+        in nugget_map order, and the error message of each sentence whose
+        fallback prompt still failed after its retries, by sentence index
+    """
+    tasks = support_tasks(sentences, nugget_map, known)
+
+    def judge(
+        task: Tuple[int, List[int]]
+    ) -> Tuple[List[Optional[str]], Optional[BatchResponseError]]:
+        answer, indices = task
+        chunk = [sentences[index] for index in indices]
+        try:
+            responses = parse_support_response(
+                get_model_response(
+                    NUGGET_SUPPORT_SYSTEM,
+                    build_support_prompt(nugget_map[answer], chunk),
+                    provider=provider,
+                    model_name=model_name,
+                    params=support_params(len(chunk)),
+                    structured=True,
+                ),
+                len(chunk),
+            )
+        except RuntimeError:
+            responses = None
+        if responses is None:
+            options.count("answer_major_fallbacks")
+            try:
+                responses = batch_model_responses(
+                    NUGGET_AGREEMENT_SYSTEM,
+                    single_answer_prompts(nugget_map[answer], chunk),
+                    provider,
+                    model_name,
+                )
+            except BatchResponseError as e:
+                # The other prompts of the chunk were still answered
+                return e.responses, e
+        return responses, None
+
+    workers = min(get_batch_concurrency(), len(tasks))
+    if workers <= 1:
+        outcomes = [judge(task) for task in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(judge, tasks))
+    answers = [responses for responses, _ in outcomes]
+    failures = collect_failures(tasks, [error for _, error in outcomes], options)
+    return transpose_answers(sentences, nugget_map, tasks, answers, options, known), failures
+
+
+async def judge_answers_transposed_async(
+    sentences: List[str],
+    nugget_map: List[Dict[str, Any]],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    options: Optional[EvaluationOptions] = None,
+    known: Optional[Sequence[Sequence[Optional[str]]]] = None,
+) -> Tuple[List[List[Optional[str]]], Dict[int, str]]:
+    """Asynchronously judge candidate sentences against gold answers.
+
+    Async counterpart of judge_answers_transposed.
+    """
+    tasks = support_tasks(sentences, nugget_map, known)
+
+    async def judge(
+        task: Tuple[int, List[int]]
+    ) -> Tuple[List[Optional[str]], Optional[BatchResponseError]]:
+        answer, indices = task
+        chunk = [sentences[index] for index in indices]
+        try:
+            responses = parse_support_response(
+                await aget_model_response(
+                    NUGGET_SUPPORT_SYSTEM,
+                    build_support_prompt(nugget_map[answer], chunk),
+                    provider=provider,
+                    model_name=model_name,
+                    params=support_params(len(chunk)),
+                    structured=True,
+                ),
+                len(chunk),
+            )
+        except RuntimeError:
+            responses = None
+        if responses is None:
+            options.count("answer_major_fallbacks")
+            try:
+                responses = await abatch_model_responses(
+                    NUGGET_AGREEMENT_SYSTEM,
+                    single_answer_prompts(nugget_map[answer], chunk),
+                    provider,
+                    model_name,
+                )
+            except BatchResponseError as e:
+                return e.responses, e
+        return responses, None
+
+    outcomes = await asyncio.gather(*(judge(task) for task in tasks))
+    answers = [responses for responses, _ in outcomes]
+    failures = collect_failures(tasks, [error for _, error in outcomes], options)
+    return transpose_answers(sentences, nugget_map, tasks, answers, options, known), failures
@@ -0,0 +1,159 @@
+"""Deterministic fast path for nugget agreement.
+
+Many gold answers are short literal values ("20,919", "3.7%", "October
+2020", "Approximately 83%"). When a sentence contains such an answer
+literally, asking the model whether they agree adds latency and cost but no
+information. In answer-match mode, nugget answers are first compared with
+the sentence after normalization:
+1. Text is case-folded and split into number, word and unit tokens;
+   thousands separators, trailing decimal zeros, ordinal suffixes and
+   "percent" spellings are normalized, and month abbreviations expanded
+2. Hedges at the start of an answer ("approximately", "about", ...) are
+   dropped
+3. An answer matches if its tokens appear contiguously in the sentence
+
+Only answers with a number, or with two to MAX_LITERAL_TOKENS tokens, are
+eligible; single words and long answers are always judged by the model.
+Only cited sentences are matched literally. An uncited negative sentence
+is rewarded when a nugget confirms it, and a literal hit cannot tell "the
+rate was 3.7%" from "there is no evidence the rate was 3.7%", so those are
+always judged by the model.
+Matches found this way skip the model call and are recorded in
+matched_nuggets with "evaluator": ANSWER_MATCH_EVALUATOR.
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+from .options import EvaluationOptions
+
+# Evaluator recorded for nugget matches accepted without a model call
+ANSWER_MATCH_EVALUATOR = "answer_match"
+
+# Longest answer (in tokens) that is matched literally
+MAX_LITERAL_TOKENS = 6
+
+_TOKEN = re.compile(r"\d+(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|[^\W\d_]+|[%$€£¥]")
+
+_MONTHS = {
+    "jan": "january",
+    "feb": "february",
+    "mar": "march",
+    "apr": "april",
+    "jun": "june",
+    "jul": "july",
+    "aug": "august",
+    "sep": "september",
+    "sept": "september",
+    "oct": "october",
+    "nov": "november",
+    "dec": "december",
+}
+
+_PERCENT_WORDS = {"percent", "pct", "percentage"}
+
+_ORDINAL_SUFFIXES = {"st", "nd", "rd", "th"}
+
+_HEDGES = {
+    "approximately",
+    "approx",
+    "about",
+    "around",
+    "roughly",
+    "nearly",
+    "almost",
+    "circa",
+    "estimated",
+}
+
+
+def normalize_number(token: str) -> str:
+    """Drop thousands separators and trailing decimal zeros from a number."""
+    token = token.replace(",", "")
+    if "." in token:
+        token = token.rstrip("0").rstrip(".")
+    return token
+
+
+def literal_tokens(text: str) -> List[str]:
+    """Split a text into normalized number, word and unit tokens."""
+    tokens = []
+    for token in _TOKEN.findall(unicodedata.normalize("NFKC", text).casefold()):
+        if token[0].isdigit():
+            tokens.append(normalize_number(token))
+        elif token in _PERCENT_WORDS:
+            tokens.append("%")
+        elif token == "cent" and tokens and tokens[-1] == "per":
+            tokens[-1] = "%"
+        elif token in _ORDINAL_SUFFIXES and tokens and tokens[-1].isdigit():
+            continue
+        else:
+            tokens.append(_MONTHS.get(token, token))
+    return tokens
+
+
+def answer_tokens(answer: str) -> Optional[List[str]]:
+    """Get the tokens an answer is matched with.
+
+    Returns:
+        The answer's tokens without leading hedges, or None if the answer is
+        not eligible for literal matching
+    """
+    tokens = literal_tokens(answer)
+    while tokens and (
+        tokens[0] in _HEDGES or (tokens[0] == "an" and tokens[1:2] == ["estimated"])
+    ):
+        tokens = tokens[1:]
+    if not tokens or len(tokens) > MAX_LITERAL_TOKENS:
+        return None
+    if len(tokens) < 2 and not any(token[0].isdigit() for token in tokens):
+        return None
+    return tokens
+
+
+def contains_tokens(tokens: List[str], span: List[str]) -> bool:
+    """Check whether span appears contiguously in tokens."""
+    size = len(span)
+    return any(
+        tokens[start : start + size] == span
+        for start in range(len(tokens) - size + 1)
+        if tokens[start] == span[0]
+    )
+
+
+def literal_matches(
+    sentence: str,
+    nugget_map: List[Dict[str, Any]],
+    options: Optional[EvaluationOptions] = None,
+    kind: str = "cited",
+) -> Tuple[List[Optional[str]], List[Dict[str, Any]]]:
+    """Find the nugget answers a sentence contains literally.
+
+    Args:
+        sentence: The sentence to check
+        nugget_map: Nugget info of each answer, as built by build_nugget_prompts
+        options: Optional evaluation options of the run; answers are only
+            matched when answer_match is set, and the counters are updated
+        kind: The kind of sentence, "cited" or "negative"; negative
+            sentences are never matched literally
+
+    Returns:
+        Tuple of ("YES" for each literal match and None for the answers left
+        to the model, nugget_map with the literal matches marked with their
+        evaluator)
+    """
+    known: List[Optional[str]] = [None] * len(nugget_map)
+    if options is None or not options.answer_match or kind != "cited":
+        return known, nugget_map
+
+    tokens = literal_tokens(sentence)
+    marked = list(nugget_map)
+    for index, nugget_info in enumerate(nugget_map):
+        span = answer_tokens(nugget_info["matched_answer"])
+        if span is not None and contains_tokens(tokens, span):
+            known[index] = "YES"
+            marked[index] = dict(nugget_info, evaluator=ANSWER_MATCH_EVALUATOR)
+    options.count("answer_match_pairs", len(nugget_map))
+    options.count("answer_match_hits", sum(response is not None for response in known))
+    return known, marked
@@ -0,0 +1,318 @@
+"""Persistent judgment cache for model responses.
+
+This module stores YES/NO judgments on disk so that identical model calls are
+only paid for once, even across separate runs of the evaluator. It provides:
+1. A SQLite-backed cache that is safe to share between threads and processes
+2. Stable cache keys derived from the provider, model and prompts
+3. Size and age based eviction
+4. Hit/miss statistics
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Environment variable that enables the cache without any code changes
+CACHE_PATH_ENV = "REPORT_GEN_EVAL_CACHE"
+
+
+class JudgmentCache:
+    """On-disk cache of model responses keyed by a hash of the request.
+
+    Each thread gets its own SQLite connection, and SQLite's own locking makes
+    the cache safe to share between processes (e.g. several runs of
+    run_report_gen_eval.sh pointed at the same file).
+
+    Args:
+        path: Path to the SQLite database file
+        max_entries: Optional maximum number of cached responses to keep
+        max_age: Optional maximum age of a cached response in seconds
+        evict_every: Number of writes between automatic eviction passes
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+        evict_every: int = 1000,
+    ):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS judgments (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    model_name TEXT,
+                    system_prompt TEXT,
+                    user_prompt TEXT,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS judgments_accessed ON judgments (accessed_at)"
+            )
+        self.evict()
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model_name: Optional[str],
+        system_prompt: str,
+        user_prompt: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Build the cache key for a model request.
+
+        Args:
+            provider: The model provider
+            model_name: The resolved model name
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            params: Decoding parameters (temperature, max_tokens, ...)
+
+        Returns:
+            A hex SHA-256 digest identifying the request
+        """
+        payload = json.dumps(
+            [provider, model_name, system_prompt, user_prompt, params or {}],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached response text, or None on a miss or an expired entry
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT response, created_at FROM judgments WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with conn:
+            conn.execute(
+                "UPDATE judgments SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        with self._lock:
+            self._hits += 1
+        return row[0]
+
+    def put(
+        self,
+        key: str,
+        response: str,
+        provider: str = None,
+        model_name: str = None,
+        system_prompt: str = None,
+        user_prompt: str = None,
+    ):
+        """Store a response in the cache.
+
+        Args:
+            key: Cache key from make_key
+            response: The response text to store
+            provider: The model provider (stored for inspection)
+            model_name: The model name (stored for inspection)
+            system_prompt: The system prompt (stored for inspection)
+            user_prompt: The user prompt (stored for inspection)
+        """
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO judgments VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    provider,
+                    model_name,
+                    system_prompt,
+                    user_prompt,
+                    response,
+                    now,
+                    now,
+                ),
+            )
+        with self._lock:
+            self._writes += 1
+            run_eviction = self.evict_every and self._writes % self.evict_every == 0
+        if run_eviction:
+            self.evict()
+
+    def evict(self) -> int:
+        """Remove expired entries and trim the cache to max_entries.
+
+        Least recently used entries are removed first when trimming.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        conn = self._connection()
+        with conn:
+            if self.max_age is not None:
+                cursor = conn.execute(
+                    "DELETE FROM judgments WHERE created_at < ?",
+                    (time.time() - self.max_age,),
+                )
+                removed += cursor.rowcount
+            if self.max_entries is not None:
+                cursor = conn.execute(
+                    """DELETE FROM judgments WHERE key IN (
+                        SELECT key FROM judgments ORDER BY accessed_at DESC
+                        LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,),
+                )
+                removed += cursor.rowcount
+        if removed:
+            logger.debug(f"Evicted {removed} cached judgments from {self.path}")
+            with self._lock:
+                self._evictions += removed
+        return removed
+
+    def entries(
+        self, system_prompt: Optional[str] = None
+    ) -> Iterator[Tuple[str, str, str, str]]:
+        """Iterate over cached entries.
+
+        Args:
+            system_prompt: Optional system prompt to restrict the entries to
+
+        Yields:
+            Tuples of (provider, model_name, user_prompt, response)
+        """
+        query = "SELECT provider, model_name, user_prompt, response FROM judgments"
+        params = ()
+        if system_prompt is not None:
+            query += " WHERE system_prompt = ?"
+            params = (system_prompt,)
+        yield from self._connection().execute(query, params)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM judgments").fetchone()[0]
+
+    def clear(self):
+        """Remove every entry from the cache and reset the statistics."""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM judgments")
+        with self._lock:
+            self._hits = self._misses = self._writes = self._evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics for this process.
+
+        Returns:
+            Dictionary with hits, misses, writes, evictions, hit_rate and entries
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            stats = {
+                "path": self.path,
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+        stats["entries"] = len(self)
+        return stats
+
+
+_judgment_cache: Optional[JudgmentCache] = None
+_judgment_cache_lock = threading.Lock()
+_env_checked = False
+
+
+def configure_judgment_cache(
+    path: str,
+    max_entries: Optional[int] = None,
+    max_age: Optional[float] = None,
+) -> JudgmentCache:
+    """Enable the process-wide judgment cache.
+
+    Args:
+        path: Path to the SQLite database file
+        max_entries: Optional maximum number of cached responses to keep
+        max_age: Optional maximum age of a cached response in seconds
+
+    Returns:
+        The configured cache
+    """
+    global _judgment_cache, _env_checked
+    with _judgment_cache_lock:
+        _judgment_cache = JudgmentCache(path, max_entries=max_entries, max_age=max_age)
+        _env_checked = True
+    logger.info(f"Using judgment cache at {path}")
+    return _judgment_cache
+
+
+def disable_judgment_cache():
+    """Disable the process-wide judgment cache."""
+    global _judgment_cache, _env_checked
+    with _judgment_cache_lock:
+        _judgment_cache = None
+        _env_checked = True
+
+
+def get_judgment_cache() -> Optional[JudgmentCache]:
+    """Get the process-wide judgment cache.
+
+    The cache is disabled unless configure_judgment_cache was called or the
+    REPORT_GEN_EVAL_CACHE environment variable points at a cache file.
+
+    Returns:
+        The active cache, or None if caching is disabled
+    """
+    global _judgment_cache, _env_checked
+    if not _env_checked:
+        with _judgment_cache_lock:
+            if not _env_checked:
+                path = os.environ.get(CACHE_PATH_ENV)
+                if path:
+                    _judgment_cache = JudgmentCache(path)
+                _env_checked = True
+    return _judgment_cache
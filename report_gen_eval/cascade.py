@@ -0,0 +1,503 @@
+"""Local classifier cascade for the sentence-only judgments.
+
+check_negative and requires_citation depend only on the sentence, are asked
+for every uncited sentence, and their answers repeat across runs. A cascade
+answers the confident cases locally and escalates the rest to the provider:
+1. A logistic regression on hashed character n-grams is trained per
+   judgment from the judgments already in the judgment cache (the sentence
+   is recovered by parsing the cached prompt against its template)
+2. At evaluation time, a sentence whose predicted probability is at least
+   the threshold (or at most 1 - threshold) is answered locally; the
+   others go to the model as before
+3. Local answers are recorded with "evaluator": CASCADE_EVALUATOR in the
+   sentence's model responses
+
+Training holds out a deterministic sample of the sentences and reports the
+agreement of the local answers with the LLM on it. The holdout fraction and
+the training cache are saved with the models, so agreement can be checked
+later on the held-out sentences of any cache (training sentences are left
+out unless --include-training is given). Train and check with:
+    report-eval-cascade train cache/judgments.sqlite -o cascade.npz
+    report-eval-cascade agreement cascade.npz cache/judgments.sqlite
+or equivalently `python -m report_gen_eval.cascade ...`.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import JudgmentCache
+from .prefilter import DEFAULT_DIMENSIONS, ngram_buckets
+from .prompts import (
+    CHECK_NEGATIVE_SYSTEM,
+    CHECK_NEGATIVE_USER,
+    REQUIRES_CITATION_SYSTEM,
+    REQUIRES_CITATION_USER,
+)
+from .utils import is_yes_no_response, modify_model_response
+
+logger = logging.getLogger(__name__)
+
+# Judgments the cascade can answer, with their (system, user) prompt templates
+CASCADE_JUDGMENTS = {
+    "check_negative": (CHECK_NEGATIVE_SYSTEM, CHECK_NEGATIVE_USER),
+    "requires_citation": (REQUIRES_CITATION_SYSTEM, REQUIRES_CITATION_USER),
+}
+
+# Evaluator recorded for judgments answered by the cascade
+CASCADE_EVALUATOR = "cascade"
+
+# Minimum predicted probability of a local answer
+DEFAULT_CASCADE_THRESHOLD = 0.95
+
+# Fraction of the cached sentences held out to measure agreement
+DEFAULT_HOLDOUT = 0.2
+
+# Training settings of the logistic regressions
+DEFAULT_EPOCHS = 300
+DEFAULT_LEARNING_RATE = 0.1
+DEFAULT_L2 = 1e-4
+
+
+def prompt_sentence(template: str, user_prompt: str) -> Optional[str]:
+    """Recover the sentence of a user prompt built from a template.
+
+    Args:
+        template: The user prompt template, with one {sentence} placeholder
+        user_prompt: A prompt built from the template
+
+    Returns:
+        The sentence, or None if the prompt was not built from the template
+    """
+    prefix, suffix = template.split("{sentence}")
+    if (
+        len(user_prompt) < len(prefix) + len(suffix)
+        or not user_prompt.startswith(prefix)
+        or not user_prompt.endswith(suffix)
+    ):
+        return None
+    return user_prompt[len(prefix) : len(user_prompt) - len(suffix)]
+
+
+def sentence_features(
+    sentences: Sequence[str], dimensions: int = DEFAULT_DIMENSIONS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build the sparse feature matrix of sentences.
+
+    Features are hashed character n-gram counts, log-scaled and normalized
+    to unit length per sentence.
+
+    Returns:
+        Tuple of (row, column, value) arrays of the non-zero features
+    """
+    rows, columns, values = [], [], []
+    for row, sentence in enumerate(sentences):
+        buckets, counts = np.unique(
+            ngram_buckets(sentence, dimensions), return_counts=True
+        )
+        weights = np.log1p(counts.astype(np.float64))
+        weights /= max(np.linalg.norm(weights), 1e-12)
+        rows.append(np.full(len(buckets), row, dtype=np.int64))
+        columns.append(buckets)
+        values.append(weights)
+    if not rows:
+        empty = np.zeros(0)
+        return empty.astype(np.int64), empty.astype(np.int64), empty
+    return np.concatenate(rows), np.concatenate(columns), np.concatenate(values)
+
+
+class LogisticModel:
+    """Logistic regression over sparse hashed features.
+
+    Args:
+        weights: Feature weights
+        bias: Intercept
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float = 0.0):
+        self.weights = weights
+        self.bias = bias
+
+    @property
+    def dimensions(self) -> int:
+        return len(self.weights)
+
+    @classmethod
+    def fit(
+        cls,
+        sentences: Sequence[str],
+        labels: Sequence[bool],
+        dimensions: int = DEFAULT_DIMENSIONS,
+        epochs: int = DEFAULT_EPOCHS,
+        learning_rate: float = DEFAULT_LEARNING_RATE,
+        l2: float = DEFAULT_L2,
+    ) -> "LogisticModel":
+        """Train on labelled sentences with full-batch Adam.
+
+        Args:
+            sentences: The training sentences
+            labels: Whether each sentence was answered YES
+            dimensions: Number of hashed features
+            epochs: Number of passes over the data
+            learning_rate: Adam step size
+            l2: L2 penalty on the weights
+
+        Returns:
+            The trained model
+        """
+        rows, columns, values = sentence_features(sentences, dimensions)
+        y = np.asarray(labels, dtype=np.float64)
+        n = max(len(y), 1)
+        params = np.zeros(dimensions + 1)
+        moment, velocity = np.zeros_like(params), np.zeros_like(params)
+        beta1, beta2 = 0.9, 0.999
+        for step in range(1, epochs + 1):
+            weights, bias = params[:-1], params[-1]
+            logits = (
+                np.bincount(rows, weights=values * weights[columns], minlength=len(y))
+                + bias
+            )
+            errors = (1 / (1 + np.exp(-logits)) - y) / n
+            gradient = np.empty_like(params)
+            gradient[:-1] = (
+                np.bincount(columns, weights=values * errors[rows], minlength=dimensions)
+                + l2 * weights
+            )
+            gradient[-1] = errors.sum()
+            moment = beta1 * moment + (1 - beta1) * gradient
+            velocity = beta2 * velocity + (1 - beta2) * gradient**2
+            params -= (
+                learning_rate
+                * (moment / (1 - beta1**step))
+                / (np.sqrt(velocity / (1 - beta2**step)) + 1e-8)
+            )
+        return cls(params[:-1], float(params[-1]))
+
+    def predict(self, sentences: Sequence[str]) -> np.ndarray:
+        """Get the probability of a YES answer for each sentence."""
+        rows, columns, values = sentence_features(sentences, self.dimensions)
+        logits = (
+            np.bincount(rows, weights=values * self.weights[columns], minlength=len(sentences))
+            + self.bias
+        )
+        return 1 / (1 + np.exp(-logits))
+
+
+class Cascade:
+    """Local models of the sentence-only judgments, with a confidence threshold.
+
+    Safe to share between threads.
+
+    Args:
+        models: Map of judgment names (see CASCADE_JUDGMENTS) to their models
+        threshold: Minimum predicted probability of a local answer
+        metadata: Optional description of the training data
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, LogisticModel],
+        threshold: float = DEFAULT_CASCADE_THRESHOLD,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        if not 0.5 < threshold <= 1.0:
+            raise ValueError("Cascade threshold must be above 0.5 and at most 1")
+        self.models = models
+        self.threshold = threshold
+        self.metadata = metadata or {}
+
+    def answer(self, name: str, sentence: str) -> Optional[str]:
+        """Answer a judgment locally if the model is confident enough.
+
+        Returns:
+            "YES" or "NO", or None if the judgment must go to the provider
+        """
+        model = self.models.get(name)
+        if model is None:
+            return None
+        probability = float(model.predict([sentence])[0])
+        if probability >= self.threshold:
+            return "YES"
+        if probability <= 1 - self.threshold:
+            return "NO"
+        return None
+
+    def save(self, path: str):
+        """Save the models and metadata to a .npz file."""
+        arrays = {"metadata": np.array(json.dumps(self.metadata))}
+        for name, model in self.models.items():
+            arrays[f"{name}.weights"] = model.weights
+            arrays[f"{name}.bias"] = np.array(model.bias)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str, threshold: float = DEFAULT_CASCADE_THRESHOLD) -> "Cascade":
+        """Load a cascade saved with save."""
+        with np.load(path, allow_pickle=False) as arrays:
+            models = {
+                name: LogisticModel(
+                    arrays[f"{name}.weights"], float(arrays[f"{name}.bias"])
+                )
+                for name in CASCADE_JUDGMENTS
+                if f"{name}.weights" in arrays
+            }
+            metadata = json.loads(str(arrays["metadata"]))
+        return cls(models, threshold, metadata)
+
+    def describe(self) -> Dict[str, Any]:
+        """Get the judgments, threshold and training metadata of the cascade."""
+        return {
+            "judgments": sorted(self.models),
+            "threshold": self.threshold,
+            **self.metadata,
+        }
+
+
+def cached_examples(
+    cache: JudgmentCache,
+    name: str,
+    provider: Optional[str] = None,
+    model_name: Optional[str] = None,
+) -> List[Tuple[str, bool]]:
+    """Collect the (sentence, answered YES) examples of a judgment from the cache.
+
+    Args:
+        cache: The judgment cache
+        name: The judgment name (see CASCADE_JUDGMENTS)
+        provider: Optional provider to restrict the examples to
+        model_name: Optional model name to restrict the examples to
+
+    Returns:
+        One example per distinct sentence; prompts that do not match the
+        current template are skipped
+    """
+    system_prompt, template = CASCADE_JUDGMENTS[name]
+    examples = {}
+    for entry_provider, entry_model, user_prompt, response in cache.entries(system_prompt):
+        if provider is not None and entry_provider != provider:
+            continue
+        if model_name is not None and entry_model != model_name:
+            continue
+        sentence = prompt_sentence(template, user_prompt)
+        # Malformed answers cached by older versions are not examples
+        if sentence is not None and is_yes_no_response(response):
+            examples[sentence] = modify_model_response(response) == "YES"
+    return list(examples.items())
+
+
+def is_held_out(sentence: str, fraction: float) -> bool:
+    """Decide deterministically whether a sentence is held out of training."""
+    digest = hashlib.sha256(sentence.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64 < fraction
+
+
+def agreement_report(
+    cascade: Cascade, examples: Dict[str, List[Tuple[str, bool]]]
+) -> Dict[str, Any]:
+    """Measure how the cascade's local answers agree with the LLM.
+
+    Args:
+        cascade: The cascade to check
+        examples: Map of judgment names to (sentence, LLM answered YES) examples
+
+    Returns:
+        Map of judgment names to the number of examples, the fraction
+        answered locally (coverage) and the fraction of local answers that
+        agree with the LLM
+    """
+    report = {}
+    for name, pairs in examples.items():
+        if name not in cascade.models or not pairs:
+            continue
+        answers = [cascade.answer(name, sentence) for sentence, _ in pairs]
+        local = [
+            answer == ("YES" if label else "NO")
+            for answer, (_, label) in zip(answers, pairs)
+            if answer is not None
+        ]
+        report[name] = {
+            "examples": len(pairs),
+            "local": len(local),
+            "coverage": len(local) / len(pairs),
+            "agreement": sum(local) / len(local) if local else None,
+        }
+    return {"threshold": cascade.threshold, "judgments": report}
+
+
+def cascade_agreement(
+    cascade: Cascade,
+    cache: JudgmentCache,
+    provider: Optional[str] = None,
+    model_name: Optional[str] = None,
+    include_training: bool = False,
+) -> Dict[str, Any]:
+    """Measure the agreement of a trained cascade with the judgments in a cache.
+
+    Sentences the cascade was trained on would inflate its agreement and
+    coverage, so only the sentences held out at training are checked, unless
+    include_training is set.
+
+    Args:
+        cascade: The cascade to check, with the holdout of its training in
+            its metadata
+        cache: The judgment cache to compare with
+        provider: Optional provider whose judgments to compare with
+        model_name: Optional model whose judgments to compare with
+        include_training: Whether to also check the training sentences
+
+    Returns:
+        The agreement report (see agreement_report), with the holdout
+        fraction used and whether training sentences were included
+    """
+    holdout = cascade.metadata.get("holdout")
+    if holdout is None and not include_training:
+        # Models saved before the holdout was recorded
+        logger.warning(
+            "The cascade does not record its holdout; checking every cached sentence"
+        )
+        include_training = True
+    examples = {}
+    for name in cascade.models:
+        pairs = cached_examples(cache, name, provider, model_name)
+        if not include_training:
+            pairs = [pair for pair in pairs if is_held_out(pair[0], holdout)]
+        examples[name] = pairs
+    report = agreement_report(cascade, examples)
+    report["holdout"] = holdout
+    report["include_training"] = include_training
+    return report
+
+
+def train_cascade(
+    cache: JudgmentCache,
+    provider: Optional[str] = None,
+    model_name: Optional[str] = None,
+    threshold: float = DEFAULT_CASCADE_THRESHOLD,
+    holdout: float = DEFAULT_HOLDOUT,
+    epochs: int = DEFAULT_EPOCHS,
+) -> Tuple[Cascade, Dict[str, Any]]:
+    """Train a cascade from the judgments in a cache.
+
+    Args:
+        cache: The judgment cache to learn from
+        provider: Optional provider whose judgments to learn
+        model_name: Optional model whose judgments to learn
+        threshold: Confidence threshold of the trained cascade
+        holdout: Fraction of the sentences held out to measure agreement
+        epochs: Number of training passes
+
+    Returns:
+        Tuple of (the cascade, its agreement report on the held-out sentences)
+    """
+    models = {}
+    held_out = {}
+    counts = {}
+    for name in CASCADE_JUDGMENTS:
+        examples = cached_examples(cache, name, provider, model_name)
+        train = [pair for pair in examples if not is_held_out(pair[0], holdout)]
+        held_out[name] = [pair for pair in examples if is_held_out(pair[0], holdout)]
+        counts[name] = {"train": len(train), "held_out": len(held_out[name])}
+        if not train:
+            logger.warning(f"No cached {name} judgments to train on")
+            continue
+        models[name] = LogisticModel.fit(
+            [sentence for sentence, _ in train],
+            [label for _, label in train],
+            epochs=epochs,
+        )
+        logger.info(f"Trained {name} on {len(train)} sentences")
+
+    cascade = Cascade(
+        models,
+        threshold,
+        {
+            "provider": provider,
+            "model_name": model_name,
+            "training_cache": cache.path,
+            "holdout": holdout,
+            "examples": counts,
+        },
+    )
+    return cascade, agreement_report(cascade, held_out)
+
+
+def main():
+    """Train or check the local judgment cascade."""
+    parser = argparse.ArgumentParser(
+        description="Train and check the local cascade for check_negative and requires_citation"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="Train a cascade from a judgment cache")
+    train.add_argument("cache_path", help="Path to the judgment cache")
+    train.add_argument("-o", "--output", required=True, help="Path of the .npz model file")
+    train.add_argument("-p", "--model-provider", help="Only learn this provider's judgments")
+    train.add_argument("-m", "--model-name", help="Only learn this model's judgments")
+    train.add_argument(
+        "--holdout",
+        type=float,
+        default=DEFAULT_HOLDOUT,
+        help="Fraction of sentences held out for the agreement report (default: %(default)s)",
+    )
+    train.add_argument(
+        "--epochs",
+        type=int,
+        default=DEFAULT_EPOCHS,
+        help="Training passes (default: %(default)s)",
+    )
+
+    check = commands.add_parser(
+        "agreement", help="Report the agreement of a cascade with cached judgments"
+    )
+    check.add_argument("model_path", help="Path of the .npz model file")
+    check.add_argument("cache_path", help="Path to the judgment cache")
+    check.add_argument("-p", "--model-provider", help="Only check this provider's judgments")
+    check.add_argument("-m", "--model-name", help="Only check this model's judgments")
+    check.add_argument(
+        "--include-training",
+        action="store_true",
+        help="Also check the sentences the cascade was trained on (inflates the agreement)",
+    )
+
+    for command in (train, check):
+        command.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_CASCADE_THRESHOLD,
+            help="Minimum predicted probability of a local answer (default: %(default)s)",
+        )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    cache = JudgmentCache(args.cache_path)
+    if args.command == "train":
+        cascade, report = train_cascade(
+            cache,
+            args.model_provider,
+            args.model_name,
+            args.threshold,
+            args.holdout,
+            args.epochs,
+        )
+        cascade.save(args.output)
+    else:
+        cascade = Cascade.load(args.model_path, args.threshold)
+        report = cascade_agreement(
+            cascade,
+            cache,
+            args.model_provider,
+            args.model_name,
+            args.include_training,
+        )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Bulk resolution of cited documents.
+
+Resolving citations one document at a time while sentences are evaluated
+mixes random document reads in with model calls. This module resolves every
+citation of a run up front instead:
+1. Cited document IDs are collected from all reports and grouped by collection
+2. Each collection is read in one bulk lookup, before any model calls
+3. The resolved texts are kept in a per-run DocTable that the evaluator
+   consults before falling back to individual lookups
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .docstore import document_cache, normalize_collection
+from .routing import route_collections
+
+logger = logging.getLogger(__name__)
+
+
+def format_citation_text(title: str, text: str) -> str:
+    """Format a cited document the way it is shown to the model."""
+    return f"Title: {title}\n\nContent: {text}"
+
+
+def cited_doc_ids(report: Dict[str, Any]) -> List[str]:
+    """Get the document IDs cited by a report, in order of first citation.
+
+    Args:
+        report: The report, with sentences and their citations
+
+    Returns:
+        The unique cited document IDs
+    """
+    doc_ids = {}
+    for sentence in report.get("sentences") or []:
+        citations = sentence.get("citations")
+        if isinstance(citations, list):
+            doc_ids.update(dict.fromkeys(citations))
+    return list(doc_ids)
+
+
+class DocTable:
+    """Per-run table of resolved citation texts.
+
+    Entries are keyed by (collection, doc_id). A document that was looked up
+    and not found is recorded as None, so the evaluator can skip that
+    collection without another lookup. Pairs that are not in the table at
+    all were never looked up (e.g. because the collection failed to load).
+    """
+
+    def __init__(self):
+        self._texts: Dict[Tuple[str, str], Optional[str]] = {}
+        self.stats: Dict[str, Any] = {}
+
+    def add(self, doc_id: str, collection: str, text: Optional[str]):
+        """Record the formatted text of a document, or None if it is missing."""
+        self._texts[(normalize_collection(collection), doc_id)] = text
+
+    def has(self, doc_id: str, collection: str) -> bool:
+        """Check whether a document was looked up in a collection."""
+        return (normalize_collection(collection), doc_id) in self._texts
+
+    def get(self, doc_id: str, collection: str) -> Optional[str]:
+        """Get the formatted text of a document, or None if it is missing."""
+        return self._texts.get((normalize_collection(collection), doc_id))
+
+    def __len__(self) -> int:
+        return sum(text is not None for text in self._texts.values())
+
+
+def resolve_citations(
+    reports: Iterable[Dict[str, Any]], verbose: bool = False
+) -> DocTable:
+    """Resolve the citations of every report in bulk.
+
+    Each cited document is looked up in the collections of its report that
+    can hold it (see routing), in order, like the per-sentence lookup, but
+    every round of lookups is grouped by collection and done in one bulk
+    read per collection.
+
+    Args:
+        reports: The reports of the run
+        verbose: Whether to log resolution statistics
+
+    Returns:
+        The DocTable of resolved citations; its stats attribute holds the
+        number of citations (unique per report), cited documents, how many
+        were resolved and the per collection lookup counts and times
+    """
+    start = time.monotonic()
+    table = DocTable()
+    collection_stats: Dict[str, Dict[str, Any]] = {}
+    failed_collections: Dict[str, str] = {}
+
+    # Documents still to resolve, with the collections left to try for each
+    pending: Dict[str, List[str]] = {}
+    citations = 0
+    for report in reports:
+        collections = report.get("collection_ids") or []
+        for doc_id in cited_doc_ids(report):
+            citations += 1
+            remaining = pending.setdefault(doc_id, [])
+            remaining.extend(
+                c
+                for c in map(normalize_collection, route_collections(doc_id, collections))
+                if c not in remaining
+            )
+    cited = set(pending)
+    pending = {doc_id: remaining for doc_id, remaining in pending.items() if remaining}
+    resolved: Set[str] = set()
+
+    while pending:
+        # Try every pending document in the next collection on its list
+        wanted: Dict[str, List[str]] = defaultdict(list)
+        for doc_id, remaining in pending.items():
+            wanted[remaining.pop(0)].append(doc_id)
+
+        for collection, doc_ids in wanted.items():
+            if collection in failed_collections:
+                continue
+            collection_start = time.monotonic()
+            try:
+                found = document_cache.get_many(sorted(doc_ids), collection)
+            except Exception as e:
+                logger.warning(f"Could not load collection {collection}: {e}")
+                failed_collections[collection] = str(e)
+                continue
+            for doc_id in doc_ids:
+                document = found.get(doc_id) or {}
+                if document.get("title") is not None and document.get("text") is not None:
+                    table.add(
+                        doc_id,
+                        collection,
+                        format_citation_text(document["title"], document["text"]),
+                    )
+                    resolved.add(doc_id)
+                else:
+                    table.add(doc_id, collection, None)
+            stats = collection_stats.setdefault(
+                collection, {"requested": 0, "found": 0, "seconds": 0.0}
+            )
+            stats["requested"] += len(doc_ids)
+            stats["found"] += len(found)
+            stats["seconds"] += time.monotonic() - collection_start
+
+        pending = {
+            doc_id: remaining
+            for doc_id, remaining in pending.items()
+            if doc_id not in resolved and remaining
+        }
+
+    table.stats = {
+        "citations": citations,
+        "cited_documents": len(cited),
+        "resolved": len(resolved),
+        "unresolved": len(cited) - len(resolved),
+        "collections": collection_stats,
+        "failed_collections": failed_collections,
+        "seconds": time.monotonic() - start,
+    }
+    if verbose:
+        logger.info(
+            f"Resolved {len(resolved)}/{len(cited)} cited documents "
+            f"in {table.stats['seconds']:.1f}s"
+        )
+    return table
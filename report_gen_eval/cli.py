@@ -10,18 +10,40 @@ It handles:
 """
 
 import argparse
+import asyncio
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 from tqdm import tqdm
 import sys
 import traceback
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
-from .evaluator import evaluate_report, ModelProvider
-from .utils import load_jsonl, save_jsonl
+from .evaluator import evaluate_report, evaluate_report_async, ModelProvider
+from .cascade import DEFAULT_CASCADE_THRESHOLD, Cascade
+from .citations import DocTable, resolve_citations
+from .nuggets import NuggetBank
+from .options import EvaluationOptions
+from .output import CompactOutput, compact_failure_record
+from .passages import DEFAULT_PASSAGE_TOKENS, PassageSelector
+from .routing import routing_index
+from .scheduler import DEFAULT_SENTENCE_WORKERS, SentenceScheduler
+from .validation import REQUIRED_FIELDS, check_report_schema, validate_reports
+from .cache import configure_judgment_cache, get_judgment_cache
+from .utils import (
+    load_jsonl,
+    save_jsonl,
+    get_client_pool_stats,
+    get_document_cache_stats,
+    set_async_concurrency,
+    set_batch_concurrency,
+    DEFAULT_ASYNC_CONCURRENCY,
+    DEFAULT_BATCH_CONCURRENCY,
+)
+from .rate_limit import configure_rate_limits, get_rate_limiter_stats
+from .concurrency import configure_adaptive_concurrency, get_concurrency_stats
 
 # Configure logging
 logging.basicConfig(
@@ -30,21 +52,43 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def validate_report_fields(report: Dict[str, Any]):
+    """Check that a report has every field required for evaluation.
+
+    Args:
+        report: The report to check
+
+    Raises:
+        ValueError: If any required field is missing
+    """
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in report]
+    if missing_fields:
+        raise ValueError(
+            f"Missing required fields in report: {', '.join(missing_fields)}"
+        )
+
+
 def process_report(
     report: Dict[str, Any],
-    nuggets_file: str = None,
+    nuggets_file: Union[str, NuggetBank] = None,
     provider: str = ModelProvider.TOGETHER,
     model_name: str = None,
     verbose: bool = False,
+    doc_table: Optional[DocTable] = None,
+    compact_output: Optional[CompactOutput] = None,
+    options: Optional[EvaluationOptions] = None,
 ) -> Dict[str, Any]:
     """Process a single report with error handling.
 
     Args:
         report: The report to process
-        nuggets_file: Path to the nuggets file
+        nuggets_file: Path to the nuggets file, or the NuggetBank of the run
         provider: The model provider to use
         model_name: Optional specific model name
         verbose: Whether to enable verbose logging
+        doc_table: Optional citations resolved in bulk for the run
+        compact_output: Optional CompactOutput for reference-only results
+        options: Optional evaluation options of the run
 
     Returns:
         The evaluation results or None if processing failed
@@ -58,13 +102,7 @@ def process_report(
         if verbose:
             logger.info(f"Processing report {report_id}")
 
-        # Validate required fields
-        required_fields = ["request_id", "run_id", "collection_ids", "sentences"]
-        missing_fields = [field for field in required_fields if field not in report]
-        if missing_fields:
-            raise ValueError(
-                f"Missing required fields in report: {', '.join(missing_fields)}"
-            )
+        validate_report_fields(report)
 
         # Process the report with evaluate_report
         if verbose:
@@ -75,6 +113,9 @@ def process_report(
             provider=provider,
             model_name=model_name,
             verbose=verbose,
+            doc_table=doc_table,
+            compact_output=compact_output,
+            options=options,
         )
 
         if result is None:
@@ -92,6 +133,281 @@ def process_report(
         return None
 
 
+async def process_report_async(
+    report: Dict[str, Any],
+    nuggets_file: Union[str, NuggetBank] = None,
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    verbose: bool = False,
+    doc_table: Optional[DocTable] = None,
+    compact_output: Optional[CompactOutput] = None,
+    options: Optional[EvaluationOptions] = None,
+) -> Dict[str, Any]:
+    """Process a single report on the async engine with error handling.
+
+    Args:
+        report: The report to process
+        nuggets_file: Path to the nuggets file, or the NuggetBank of the run
+        provider: The model provider to use
+        model_name: Optional specific model name
+        verbose: Whether to enable verbose logging
+        doc_table: Optional citations resolved in bulk for the run
+        compact_output: Optional CompactOutput for reference-only results
+        options: Optional evaluation options of the run
+
+    Returns:
+        The evaluation results or None if processing failed
+    """
+    try:
+        report_id = report.get("request_id", "unknown")
+        if verbose:
+            logger.info(f"Processing report {report_id}")
+        validate_report_fields(report)
+
+        result = await evaluate_report_async(
+            report,
+            nuggets_file=nuggets_file,
+            provider=provider,
+            model_name=model_name,
+            verbose=verbose,
+            doc_table=doc_table,
+            compact_output=compact_output,
+            options=options,
+        )
+        if result is None:
+            raise ValueError("Failed to evaluate report")
+
+        if verbose:
+            logger.info(f"Completed processing report {report_id}")
+        return result
+    except Exception as e:
+        if verbose:
+            logger.error(
+                f"Error processing report {report.get('request_id', 'unknown')}: {str(e)}"
+            )
+            logger.debug("Stack trace:", exc_info=True)
+        return None
+
+
+async def process_reports_async(
+    reports: List[Dict[str, Any]],
+    nuggets_file: Union[str, NuggetBank] = None,
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    verbose: bool = False,
+    doc_table: Optional[DocTable] = None,
+    compact_output: Optional[CompactOutput] = None,
+    options: Optional[EvaluationOptions] = None,
+) -> List[Dict[str, Any]]:
+    """Process every report concurrently on a single event loop.
+
+    Args:
+        reports: The reports to process
+        nuggets_file: Path to the nuggets file, or the NuggetBank of the run
+        provider: The model provider to use
+        model_name: Optional specific model name
+        verbose: Whether to enable verbose logging
+        doc_table: Optional citations resolved in bulk for the run
+        compact_output: Optional CompactOutput for reference-only results
+        options: Optional evaluation options of the run
+
+    Returns:
+        The evaluation results in input order, with None for failed reports
+    """
+    with tqdm(
+        total=len(reports), desc="Processing reports", disable=not verbose
+    ) as pbar:
+
+        async def run(report: Dict[str, Any]):
+            result = await process_report_async(
+                report,
+                nuggets_file=nuggets_file,
+                provider=provider,
+                model_name=model_name,
+                verbose=verbose,
+                doc_table=doc_table,
+                compact_output=compact_output,
+                options=options,
+            )
+            pbar.update(1)
+            return result
+
+        return list(await asyncio.gather(*(run(report) for report in reports)))
+
+
+def run_report_threads(
+    args: argparse.Namespace,
+    reports: List[Dict[str, Any]],
+    nuggets: NuggetBank,
+    doc_table: DocTable,
+    results: List[Dict[str, Any]],
+    failed_reports: List[Dict[str, Any]],
+    compact_output: Optional[CompactOutput] = None,
+    options: Optional[EvaluationOptions] = None,
+):
+    """Process reports on a thread pool, one thread per report.
+
+    Args:
+        args: Parsed command line arguments
+        reports: The reports to process
+        nuggets: The nugget bank shared by every worker
+        doc_table: The citations resolved in bulk for the run
+        results: List that successful evaluations are appended to
+        failed_reports: List that failure records are appended to
+        compact_output: Optional CompactOutput for reference-only results
+        options: Optional evaluation options of the run
+    """
+    with ThreadPoolExecutor(max_workers=args.batch_size) as executor:
+        future_to_report = {
+            executor.submit(
+                process_report,
+                report,
+                nuggets_file=nuggets,
+                provider=args.model_provider,
+                model_name=args.model_name,
+                verbose=args.verbose,
+                doc_table=doc_table,
+                compact_output=compact_output,
+                options=options,
+            ): report
+            for report in reports
+        }
+
+        with tqdm(
+            total=len(reports), desc="Processing reports", disable=not args.verbose
+        ) as pbar:
+            for future in as_completed(future_to_report):
+                try:
+                    result = future.result()
+                    if result is not None:
+                        results.append(result)
+                    else:
+                        report = future_to_report[future]
+                        failed_reports.append(
+                            {
+                                "report_id": report.get("request_id", "unknown"),
+                                "error": "Evaluation returned None",
+                                "report_data": report,
+                            }
+                        )
+                    pbar.update(1)
+                except Exception as e:
+                    report = future_to_report[future]
+                    report_id = report.get("request_id", "unknown")
+                    error_msg = f"Error processing report {report_id}: {str(e)}"
+                    if args.verbose:
+                        logger.error(error_msg)
+                        logger.debug("Stack trace:", exc_info=True)
+                    failed_reports.append(
+                        {
+                            "report_id": report_id,
+                            "error": str(e),
+                            "traceback": traceback.format_exc(),
+                            "report_data": report,
+                        }
+                    )
+                    pbar.update(1)
+
+
+def run_sentence_scheduler(
+    args: argparse.Namespace,
+    reports: List[Dict[str, Any]],
+    nuggets: NuggetBank,
+    doc_table: DocTable,
+    results: List[Dict[str, Any]],
+    failed_reports: List[Dict[str, Any]],
+    compact_output: Optional[CompactOutput] = None,
+    options: Optional[EvaluationOptions] = None,
+) -> SentenceScheduler:
+    """Process the sentences of all reports on one shared thread pool.
+
+    Args:
+        args: Parsed command line arguments
+        reports: The reports to process
+        nuggets: The nugget bank shared by every worker
+        doc_table: The citations resolved in bulk for the run
+        results: List that successful evaluations are appended to
+        failed_reports: List that failure records are appended to
+        compact_output: Optional CompactOutput for reference-only results
+        options: Optional evaluation options of the run
+
+    Returns:
+        The scheduler, for its statistics
+    """
+    scheduler = SentenceScheduler(
+        nuggets_file=nuggets,
+        provider=args.model_provider,
+        model_name=args.model_name,
+        verbose=args.verbose,
+        doc_table=doc_table,
+        compact_output=compact_output,
+        max_workers=args.sentence_workers,
+        options=options,
+    )
+    with tqdm(
+        total=sum(len(report["sentences"]) for report in reports),
+        desc="Processing sentences",
+        disable=not args.verbose,
+    ) as pbar:
+        outcomes = scheduler.run(reports, on_sentence=lambda: pbar.update(1))
+    for report, (result, error) in zip(reports, outcomes):
+        if result is not None:
+            results.append(result)
+        else:
+            failed_reports.append(
+                {
+                    "report_id": report.get("request_id", "unknown"),
+                    "error": error or "Evaluation returned None",
+                    "report_data": report,
+                }
+            )
+    return scheduler
+
+
+def collect_run_metrics(
+    results: List[Dict[str, Any]],
+    failed_reports: List[Dict[str, Any]],
+    doc_table: Optional[DocTable] = None,
+    rejected_reports: Optional[List[Dict[str, Any]]] = None,
+    scheduler: Optional[SentenceScheduler] = None,
+    options: Optional[EvaluationOptions] = None,
+) -> Dict[str, Any]:
+    """Collect the operational metrics of a run.
+
+    Args:
+        results: Successful report evaluations
+        failed_reports: Failure records
+        doc_table: The citations resolved in bulk for the run
+        rejected_reports: Records of the reports rejected by validation
+        scheduler: The sentence scheduler of the run, if one was used
+        options: The evaluation options of the run
+
+    Returns:
+        Dictionary with report counts, citation resolution and routing,
+        sentence scheduling, the evaluation options and their counters, and
+        the statistics of the judgment cache, the model client pool, the
+        document cache, the rate limiters and the adaptive concurrency
+        limiters (including the history of their limits)
+    """
+    cache = get_judgment_cache()
+    return {
+        "reports": {
+            "succeeded": len(results),
+            "failed": len(failed_reports),
+            "rejected": len(rejected_reports or []),
+        },
+        "judgment_cache": cache.stats() if cache is not None else None,
+        "model_clients": get_client_pool_stats(),
+        "documents": get_document_cache_stats(),
+        "citation_resolution": doc_table.stats if doc_table is not None else None,
+        "citation_routing": routing_index.stats(),
+        "sentence_scheduler": scheduler.stats() if scheduler is not None else None,
+        "evaluation": options.stats() if options is not None else None,
+        "rate_limiters": get_rate_limiter_stats(),
+        "concurrency": get_concurrency_stats(),
+    }
+
+
 def main():
     """Main entry point for the CLI.
 
@@ -132,10 +448,184 @@ def main():
         type=str,
         help="Specific model name to use (defaults to provider-specific default)",
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=["thread", "async", "sentence"],
+        default="thread",
+        help="Evaluation engine: one thread per report, a single asyncio event loop, or one thread pool shared by the sentences of all reports (default: thread)",
+    )
+    parser.add_argument(
+        "--sentence-workers",
+        type=int,
+        default=DEFAULT_SENTENCE_WORKERS,
+        help=f"Number of sentences evaluated at once on the sentence engine (default: {DEFAULT_SENTENCE_WORKERS})",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_ASYNC_CONCURRENCY,
+        help=f"Maximum number of model calls in flight on the async engine (default: {DEFAULT_ASYNC_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--prompt-concurrency",
+        type=int,
+        default=DEFAULT_BATCH_CONCURRENCY,
+        help=f"Maximum number of prompts of one batch sent at once on the thread engine (default: {DEFAULT_BATCH_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        help="Maximum number of model requests per minute (default: limit advertised by the provider)",
+    )
+    parser.add_argument(
+        "--tokens-per-minute",
+        type=float,
+        help="Maximum number of model tokens per minute (default: limit advertised by the provider)",
+    )
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Adapt the number of in-flight model calls to the provider (AIMD)",
+    )
+    parser.add_argument(
+        "--adaptive-initial",
+        type=int,
+        default=8,
+        help="Initial in-flight model call limit with --adaptive-concurrency (default: 8)",
+    )
+    parser.add_argument(
+        "--adaptive-max",
+        type=int,
+        default=256,
+        help="Maximum in-flight model call limit with --adaptive-concurrency (default: 256)",
+    )
+    parser.add_argument(
+        "--latency-target",
+        type=float,
+        help="Call latency in seconds above which --adaptive-concurrency stops raising the limit",
+    )
+    parser.add_argument(
+        "--cache-path",
+        type=str,
+        help="Path to a persistent judgment cache shared across runs (default: disabled)",
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        help="Maximum number of cached judgments to keep (default: unlimited)",
+    )
+    parser.add_argument(
+        "--cache-max-age-days",
+        type=float,
+        help="Maximum age in days of a cached judgment (default: unlimited)",
+    )
+    parser.add_argument(
+        "--allow-missing-nuggets",
+        action="store_true",
+        help="Evaluate reports that have no nuggets instead of rejecting them",
+    )
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="Issue the judgments of uncited sentences at once and discard the unneeded ones (lower latency, extra calls)",
+    )
+    parser.add_argument(
+        "--nugget-batch-size",
+        type=int,
+        default=0,
+        help="Judge up to this many nugget answers in one structured prompt (default: one prompt per answer)",
+    )
+    parser.add_argument(
+        "--nugget-batch-audit",
+        type=float,
+        default=0.0,
+        help="Fraction of structured nugget prompts also judged one answer at a time, to measure agreement (default: 0)",
+    )
+    parser.add_argument(
+        "--answer-major",
+        action="store_true",
+        help="Judge nuggets with one prompt per gold answer listing all candidate sentences of a report",
+    )
+    parser.add_argument(
+        "--prefilter-top-k",
+        type=int,
+        default=0,
+        help="Only judge the top-k nugget answers of each sentence by lexical similarity (default: all)",
+    )
+    parser.add_argument(
+        "--prefilter-threshold",
+        type=float,
+        help="Also judge the nugget answers at least this similar to a sentence (see report-eval-prefilter)",
+    )
+    parser.add_argument(
+        "--answer-match",
+        action="store_true",
+        help="Accept nugget answers that a sentence contains literally (numbers, dates, short spans) without a model call",
+    )
+    parser.add_argument(
+        "--cascade-model",
+        type=str,
+        help="Answer confident check_negative and requires_citation judgments with this local model (see report-eval-cascade)",
+    )
+    parser.add_argument(
+        "--cascade-threshold",
+        type=float,
+        default=DEFAULT_CASCADE_THRESHOLD,
+        help="Minimum predicted probability of a local cascade answer (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--first-instance-top-k",
+        type=int,
+        default=0,
+        help="Only list the top-k most similar earlier sentences in first instance checks (default: all, see report-eval-history)",
+    )
+    parser.add_argument(
+        "--first-instance-max-tokens",
+        type=int,
+        default=0,
+        help="Cap on the estimated tokens of the earlier sentences listed in first instance checks (default: no cap)",
+    )
+    parser.add_argument(
+        "--passage-budget",
+        type=int,
+        default=0,
+        help="Shorten cited documents longer than this many estimated tokens to their passages most similar to the sentence in relevance prompts (default: send whole documents)",
+    )
+    parser.add_argument(
+        "--passage-tokens",
+        type=int,
+        default=DEFAULT_PASSAGE_TOKENS,
+        help="Size of a cited document passage, in estimated tokens (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--compact-output",
+        action="store_true",
+        help="Record cited documents by doc id and SHA-256 instead of embedding their texts",
+    )
+    parser.add_argument(
+        "--export-documents",
+        action="store_true",
+        help="With --compact-output, write the deduplicated cited texts to documents_<input>.jsonl",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging"
     )
     args = parser.parse_args()
+    if args.export_documents and not args.compact_output:
+        parser.error("--export-documents requires --compact-output")
+    if args.answer_major and args.nugget_batch_size > 1:
+        parser.error("--answer-major cannot be combined with --nugget-batch-size")
+    if args.answer_major and (args.prefilter_top_k or args.prefilter_threshold is not None):
+        parser.error("--answer-major cannot be combined with the prefilter")
+    if not 0.5 < args.cascade_threshold <= 1.0:
+        parser.error("--cascade-threshold must be above 0.5 and at most 1")
+    if args.first_instance_top_k < 0 or args.first_instance_max_tokens < 0:
+        parser.error("--first-instance-top-k and --first-instance-max-tokens must not be negative")
+    if args.passage_budget < 0:
+        parser.error("--passage-budget must not be negative")
+    if args.passage_tokens <= 0:
+        parser.error("--passage-tokens must be positive")
 
     # Set logging level based on verbosity
     if args.verbose:
@@ -166,6 +656,34 @@ def main():
                 f"Failed to create output directory {args.output_dir}: {str(e)}"
             )
 
+        # Set up request pacing
+        set_batch_concurrency(args.prompt_concurrency)
+        if args.requests_per_minute or args.tokens_per_minute:
+            configure_rate_limits(
+                args.model_provider,
+                requests_per_minute=args.requests_per_minute,
+                tokens_per_minute=args.tokens_per_minute,
+            )
+
+        if args.adaptive_concurrency:
+            configure_adaptive_concurrency(
+                initial=min(args.adaptive_initial, args.adaptive_max),
+                maximum=args.adaptive_max,
+                latency_target=args.latency_target,
+            )
+
+        # Set up the judgment cache
+        if args.cache_path:
+            configure_judgment_cache(
+                args.cache_path,
+                max_entries=args.cache_max_entries,
+                max_age=(
+                    args.cache_max_age_days * 24 * 3600
+                    if args.cache_max_age_days is not None
+                    else None
+                ),
+            )
+
         # Load input data
         if args.verbose:
             logger.info(f"Loading data from {args.input_file}")
@@ -178,6 +696,75 @@ def main():
         except json.JSONDecodeError as e:
             raise ValueError(f"Failed to parse input file {args.input_file}: {str(e)}")
 
+        # Load and index the nuggets once for every worker
+        try:
+            nuggets = NuggetBank.from_file(args.nuggets_file)
+        except json.JSONDecodeError as e:
+            raise ValueError(
+                f"Failed to parse nuggets file {args.nuggets_file}: {str(e)}"
+            )
+        if args.verbose:
+            logger.info(f"Loaded nuggets for {len(nuggets)} queries")
+
+        # Resolve every citation in one sweep per collection before any model calls
+        doc_table = resolve_citations(
+            [report for report in reports if not check_report_schema(report)],
+            verbose=args.verbose,
+        )
+
+        # Only schedule reports that can be evaluated to completion
+        reports, rejected_reports = validate_reports(
+            reports,
+            nuggets=None if args.allow_missing_nuggets else nuggets,
+            doc_table=doc_table,
+            verbose=args.verbose,
+        )
+        compact_output = (
+            CompactOutput(export_texts=args.export_documents)
+            if args.compact_output
+            else None
+        )
+
+        options = EvaluationOptions(
+            speculative=args.speculative,
+            nugget_batch_size=args.nugget_batch_size,
+            nugget_batch_audit=args.nugget_batch_audit,
+            answer_major=args.answer_major,
+            prefilter_top_k=args.prefilter_top_k,
+            prefilter_threshold=args.prefilter_threshold,
+            answer_match=args.answer_match,
+            cascade=(
+                Cascade.load(args.cascade_model, args.cascade_threshold)
+                if args.cascade_model
+                else None
+            ),
+            first_instance_top_k=args.first_instance_top_k,
+            first_instance_max_tokens=args.first_instance_max_tokens,
+            passages=(
+                PassageSelector(args.passage_budget, args.passage_tokens)
+                if args.passage_budget
+                else None
+            ),
+        )
+
+        if rejected_reports:
+            rejected_file = (
+                Path(args.output_dir)
+                / f"rejected_reports_{Path(args.input_file).stem}.jsonl"
+            )
+            logger.warning(
+                f"Rejected {len(rejected_reports)} reports that cannot be evaluated, "
+                f"see {rejected_file}"
+            )
+            save_jsonl(
+                [compact_failure_record(r) for r in rejected_reports]
+                if compact_output is not None
+                else rejected_reports,
+                str(rejected_file),
+            )
+        if not reports:
+            raise ValueError("No reports passed validation")
+
         # Validate batch size
         if args.batch_size < 1:
             raise ValueError("Batch size must be at least 1")
@@ -195,59 +782,96 @@ def main():
             )
         results = []
         failed_reports = []
+        scheduler = None
 
-        with ThreadPoolExecutor(max_workers=args.batch_size) as executor:
-            future_to_report = {
-                executor.submit(
-                    process_report,
-                    report,
-                    nuggets_file=args.nuggets_file,
+        if args.engine == "async":
+            set_async_concurrency(args.max_concurrency)
+            async_results = asyncio.run(
+                process_reports_async(
+                    reports,
+                    nuggets_file=nuggets,
                     provider=args.model_provider,
                     model_name=args.model_name,
                     verbose=args.verbose,
-                ): report
-                for report in reports
-            }
-
-            with tqdm(
-                total=len(reports), desc="Processing reports", disable=not args.verbose
-            ) as pbar:
-                for future in as_completed(future_to_report):
-                    try:
-                        result = future.result()
-                        if result is not None:
-                            results.append(result)
-                        else:
-                            report = future_to_report[future]
-                            failed_reports.append(
-                                {
-                                    "report_id": report.get("request_id", "unknown"),
-                                    "error": "Evaluation returned None",
-                                    "report_data": report,
-                                }
-                            )
-                        pbar.update(1)
-                    except Exception as e:
-                        report = future_to_report[future]
-                        report_id = report.get("request_id", "unknown")
-                        error_msg = f"Error processing report {report_id}: {str(e)}"
-                        if args.verbose:
-                            logger.error(error_msg)
-                            logger.debug("Stack trace:", exc_info=True)
-                        failed_reports.append(
-                            {
-                                "report_id": report_id,
-                                "error": str(e),
-                                "traceback": traceback.format_exc(),
-                                "report_data": report,
-                            }
-                        )
-                        pbar.update(1)
+                    doc_table=doc_table,
+                    compact_output=compact_output,
+                    options=options,
+                )
+            )
+            for report, result in zip(reports, async_results):
+                if result is not None:
+                    results.append(result)
+                else:
+                    failed_reports.append(
+                        {
+                            "report_id": report.get("request_id", "unknown"),
+                            "error": "Evaluation returned None",
+                            "report_data": report,
+                        }
+                    )
+
+        elif args.engine == "sentence":
+            if args.sentence_workers < 1:
+                raise ValueError("Sentence workers must be at least 1")
+            scheduler = run_sentence_scheduler(
+                args,
+                reports,
+                nuggets,
+                doc_table,
+                results,
+                failed_reports,
+                compact_output=compact_output,
+                options=options,
+            )
+
+        else:
+            run_report_threads(
+                args,
+                reports,
+                nuggets,
+                doc_table,
+                results,
+                failed_reports,
+                compact_output=compact_output,
+                options=options,
+            )
 
         # Report summary
         if args.verbose:
             logger.info("\nProcessing complete:")
             logger.info(f"- Successfully processed: {len(results)} reports")
+        cache = get_judgment_cache()
+        if cache is not None:
+            cache_stats = cache.stats()
+            logger.info(
+                f"- Judgment cache: {cache_stats['hits']} hits, "
+                f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.1%} hit rate)"
+            )
+        pool_stats = get_client_pool_stats()
+        if args.verbose:
+            logger.info(
+                f"- Model clients: {pool_stats['created']} created, "
+                f"{pool_stats['reused']} reused"
+            )
+            for name, collection_stats in get_document_cache_stats()[
+                "collections"
+            ].items():
+                logger.info(
+                    f"- Collection {name}: {collection_stats['backend']} with "
+                    f"{collection_stats['documents']} documents, loaded in "
+                    f"{collection_stats['load_time']:.1f}s"
+                )
+            for name, limiter_stats in get_rate_limiter_stats().items():
+                logger.info(
+                    f"- Rate limiter {name}: {limiter_stats['waits']} waits "
+                    f"({limiter_stats['wait_time']:.1f}s), "
+                    f"{limiter_stats['rate_limited']} rate limit errors"
+                )
+            for name, concurrency_stats in get_concurrency_stats().items():
+                logger.info(
+                    f"- Concurrency {name}: limit {concurrency_stats['limit']}, "
+                    f"{len(concurrency_stats['history']) - 1} adjustments"
+                )
         if failed_reports:
             if args.verbose:
                 logger.warning(f"- Failed to process: {len(failed_reports)} reports")
@@ -259,7 +883,12 @@ def main():
             )
             if args.verbose:
                 logger.info(f"Saving failed reports to {failed_file}")
-            save_jsonl(failed_reports, str(failed_file))
+            save_jsonl(
+                [compact_failure_record(r) for r in failed_reports]
+                if compact_output is not None
+                else failed_reports,
+                str(failed_file),
+            )
 
         # Save successful results
         if results:
@@ -272,8 +901,37 @@ def main():
         elif args.verbose:
             logger.warning("No successful results to save")
 
-        # Exit with error if any reports failed
-        if failed_reports:
+        # Save the cited texts referenced by compact results
+        if compact_output is not None and compact_output.export_texts:
+            documents_file = (
+                Path(args.output_dir) / f"documents_{Path(args.input_file).stem}.jsonl"
+            )
+            if args.verbose:
+                logger.info(f"Saving cited documents to {documents_file}")
+            save_jsonl(compact_output.documents(), str(documents_file))
+
+        # Save run metrics
+        metrics_file = (
+            Path(args.output_dir) / f"run_metrics_{Path(args.input_file).stem}.json"
+        )
+        if args.verbose:
+            logger.info(f"Saving run metrics to {metrics_file}")
+        with open(metrics_file, "w", encoding="utf-8") as f:
+            json.dump(
+                collect_run_metrics(
+                    results,
+                    failed_reports,
+                    doc_table,
+                    rejected_reports,
+                    scheduler,
+                    options,
+                ),
+                f,
+                indent=2,
+            )
+
+        # Exit with error if any reports failed or were rejected
+        if failed_reports or rejected_reports:
             sys.exit(1)
 
     except Exception as e:
@@ -0,0 +1,253 @@
+"""Adaptive concurrency control for model provider calls.
+
+This module limits how many model calls are in flight at once for each
+provider and model, and adapts that limit to how the provider behaves using
+additive-increase/multiplicative-decrease (AIMD):
+1. While calls succeed with healthy latency, the limit grows by a fixed step
+   once per window of successful calls
+2. On a rate limit error (429) or a timeout, the limit is cut by a factor
+3. Every change of the limit is recorded so it can be reported in run metrics
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Default settings for every adaptive limiter
+DEFAULT_INITIAL_CONCURRENCY = 8
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_CONCURRENCY = 256
+
+
+def is_overload_error(error: Exception) -> bool:
+    """Check whether an error means the provider is overloaded.
+
+    Args:
+        error: The exception raised by a model call
+
+    Returns:
+        True for rate limit (429) errors and timeouts
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    message = str(error).lower()
+    return "429" in message or "timed out" in message or "timeout" in message
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on the number of concurrent calls to one provider and model.
+
+    Args:
+        initial: Initial concurrency limit
+        minimum: Lowest concurrency limit
+        maximum: Highest concurrency limit
+        increase: Amount added to the limit after a window of healthy calls
+        decrease: Factor the limit is multiplied by on overload
+        latency_target: Optional latency in seconds above which a successful
+            call does not count as healthy
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_INITIAL_CONCURRENCY,
+        minimum: int = DEFAULT_MIN_CONCURRENCY,
+        maximum: int = DEFAULT_MAX_CONCURRENCY,
+        increase: int = 1,
+        decrease: float = 0.5,
+        latency_target: Optional[float] = None,
+    ):
+        if not minimum <= initial <= maximum:
+            raise ValueError("Concurrency limits must satisfy minimum <= initial <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self._condition = threading.Condition()
+        self._limit = initial
+        self._in_flight = 0
+        self._healthy = 0
+        self._epoch = 0
+        self._successes = 0
+        self._overloads = 0
+        self._started = time.monotonic()
+        self._history: List[Tuple[float, int, str]] = [(0.0, initial, "initial")]
+
+    @property
+    def limit(self) -> int:
+        """The current concurrency limit."""
+        return self._limit
+
+    def _try_acquire(self) -> Optional[int]:
+        if self._in_flight < self._limit:
+            self._in_flight += 1
+            return self._epoch
+        return None
+
+    def acquire(self) -> int:
+        """Block until a call may start.
+
+        Returns:
+            A token to pass to release
+        """
+        with self._condition:
+            while True:
+                token = self._try_acquire()
+                if token is not None:
+                    return token
+                self._condition.wait()
+
+    async def acquire_async(self, poll_interval: float = 0.005) -> int:
+        """Wait until a call may start without blocking the event loop.
+
+        Args:
+            poll_interval: Seconds between checks for a free slot
+
+        Returns:
+            A token to pass to release
+        """
+        while True:
+            with self._condition:
+                token = self._try_acquire()
+            if token is not None:
+                return token
+            await asyncio.sleep(poll_interval)
+
+    def release(
+        self,
+        token: int,
+        latency: float,
+        error: Optional[Exception] = None,
+        cancelled: bool = False,
+    ):
+        """Finish a call and adapt the limit to its outcome.
+
+        Args:
+            token: The token returned by acquire
+            latency: Duration of the call in seconds
+            error: The exception raised by the call, if any
+            cancelled: Whether the call was cancelled; it frees its slot
+                without adapting the limit
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if cancelled:
+                pass
+            elif error is not None and is_overload_error(error):
+                self._overloads += 1
+                # Calls started before the last decrease all saw the old limit,
+                # so a burst of errors from them only counts once
+                if token == self._epoch:
+                    self._set_limit(int(self._limit * self.decrease), "decrease")
+                    self._epoch += 1
+                    self._healthy = 0
+            elif error is None:
+                self._successes += 1
+                if self.latency_target is None or latency <= self.latency_target:
+                    self._healthy += 1
+                    if self._healthy >= self._limit:
+                        self._healthy = 0
+                        self._set_limit(self._limit + self.increase, "increase")
+            self._condition.notify_all()
+
+    def _set_limit(self, limit: int, reason: str):
+        limit = max(self.minimum, min(self.maximum, limit))
+        if limit != self._limit:
+            self._limit = limit
+            self._history.append((time.monotonic() - self._started, limit, reason))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the current limit, its history and call counts.
+
+        Returns:
+            Dictionary with limit, in_flight, successes, overloads and history
+            (a list of [seconds since start, limit, reason])
+        """
+        with self._condition:
+            return {
+                "limit": self._limit,
+                "in_flight": self._in_flight,
+                "successes": self._successes,
+                "overloads": self._overloads,
+                "history": [list(entry) for entry in self._history],
+            }
+
+
+_settings: Optional[Dict[str, Any]] = None
+_limiters: Dict[Tuple[str, Optional[str]], AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def configure_adaptive_concurrency(
+    initial: int = DEFAULT_INITIAL_CONCURRENCY,
+    minimum: int = DEFAULT_MIN_CONCURRENCY,
+    maximum: int = DEFAULT_MAX_CONCURRENCY,
+    latency_target: Optional[float] = None,
+):
+    """Enable adaptive concurrency control for every provider and model.
+
+    Args:
+        initial: Initial concurrency limit
+        minimum: Lowest concurrency limit
+        maximum: Highest concurrency limit
+        latency_target: Optional latency in seconds above which calls stop
+            raising the limit
+    """
+    global _settings
+    with _limiters_lock:
+        _settings = {
+            "initial": initial,
+            "minimum": minimum,
+            "maximum": maximum,
+            "latency_target": latency_target,
+        }
+        _limiters.clear()
+
+
+def disable_adaptive_concurrency():
+    """Disable adaptive concurrency control."""
+    global _settings
+    with _limiters_lock:
+        _settings = None
+        _limiters.clear()
+
+
+def get_concurrency_limiter(
+    provider: str, model_name: Optional[str] = None
+) -> Optional[AdaptiveConcurrencyLimiter]:
+    """Get the adaptive concurrency limiter for a provider and model.
+
+    Args:
+        provider: The model provider
+        model_name: The model name
+
+    Returns:
+        The shared limiter, or None if adaptive concurrency is disabled
+    """
+    if _settings is None:
+        return None
+    key = (provider, model_name)
+    with _limiters_lock:
+        if _settings is None:
+            return None
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(**_settings)
+            _limiters[key] = limiter
+        return limiter
+
+
+def get_concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    """Get the statistics of every adaptive concurrency limiter.
+
+    Returns:
+        Dictionary mapping "provider/model" to the limiter statistics
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {
+        f"{provider}/{model_name}": limiter.stats()
+        for (provider, model_name), limiter in limiters.items()
+    }
@@ -0,0 +1,583 @@
+"""On-disk document store for cited document lookup.
+
+The document lookup pickles hold a whole collection in one dictionary, so
+the first lookup in a collection has to unpickle millions of documents. This
+module provides a store that only reads the documents that are asked for:
+1. Documents are grouped into compressed blocks in a single data file,
+   which is memory-mapped
+2. A SQLite index maps each document ID to its block and position
+3. Recently used blocks are kept decoded in a small LRU cache
+4. A converter builds a store from an existing doc_mapping pickle
+5. A thread-safe, per-process cache of loaded collections, in which
+   concurrent loads of the same collection (or block) run only once
+
+Convert the pickles once with:
+    report-eval-docstore neuclir-docs-lookup
+or equivalently `python -m report_gen_eval.docstore neuclir-docs-lookup`.
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import pickle
+import shutil
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the doc_mapping pickles and the converted stores
+DOCS_LOOKUP_DIR = "neuclir-docs-lookup"
+
+DATA_FILE = "documents.bin"
+INDEX_FILE = "index.sqlite"
+
+# Number of documents compressed together in one block
+DEFAULT_BLOCK_SIZE = 64
+
+
+def normalize_collection(collection: str) -> str:
+    """Map the three-letter collection variants onto the lookup names.
+
+    Args:
+        collection: The collection ID (e.g., 'neuclir/1/zho')
+
+    Returns:
+        The collection ID used by the lookup files (e.g., 'neuclir/1/zh')
+    """
+    return collection.replace("zho", "zh").replace("fas", "fa").replace("rus", "ru")
+
+
+def mapping_path(collection: str, lookup_dir: str = DOCS_LOOKUP_DIR) -> str:
+    """Get the path of the doc_mapping pickle of a collection."""
+    return os.path.join(lookup_dir, f"doc_mapping_{collection.replace('/', '_')}.pkl")
+
+
+def store_path(collection: str, lookup_dir: str = DOCS_LOOKUP_DIR) -> str:
+    """Get the path of the document store of a collection."""
+    return os.path.join(lookup_dir, f"doc_store_{collection.replace('/', '_')}")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls for the same key.
+
+    The first thread to ask for a key runs the loader; threads asking for the
+    same key while it runs wait for it and share its result (or exception).
+    Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Run loader for key, or wait for the call already running for it.
+
+        Args:
+            key: Identifies the value being loaded
+            loader: Function that loads the value
+
+        Returns:
+            The value returned by the loader
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = loader()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class DocumentStore:
+    """Read-only document store with lazy per-document reads.
+
+    Safe to share between threads: each thread gets its own index
+    connection, and the memory-mapped data file is only read.
+
+    Args:
+        path: Directory of the store, as written by write_store
+        block_cache_size: Number of decoded blocks to keep in memory
+    """
+
+    def __init__(self, path: str, block_cache_size: int = 128):
+        self.path = str(path)
+        self.block_cache_size = block_cache_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._blocks: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._block_loads = SingleFlight()
+        self._reads = 0
+        self._block_hits = 0
+
+        index_file = os.path.join(self.path, INDEX_FILE)
+        if not os.path.exists(index_file):
+            raise FileNotFoundError(f"Document store index not found: {index_file}")
+        self._file = open(os.path.join(self.path, DATA_FILE), "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        )
+        meta = dict(self._connection().execute("SELECT key, value FROM meta"))
+        self.compressed = meta.get("compression") == "zlib"
+        self.document_count = int(meta.get("documents", 0))
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            uri = f"file:{os.path.abspath(os.path.join(self.path, INDEX_FILE))}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True)
+            self._local.conn = conn
+        return conn
+
+    def _read_block(self, offset: int, length: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            block = self._blocks.get(offset)
+            if block is not None:
+                self._blocks.move_to_end(offset)
+                self._block_hits += 1
+                return block
+        return self._block_loads.do(offset, lambda: self._decode_block(offset, length))
+
+    def _decode_block(self, offset: int, length: int) -> List[Dict[str, Any]]:
+        payload = self._data[offset : offset + length]
+        if self.compressed:
+            payload = zlib.decompress(payload)
+        block = json.loads(payload)
+
+        with self._lock:
+            self._reads += 1
+            self._blocks[offset] = block
+            while len(self._blocks) > self.block_cache_size:
+                self._blocks.popitem(last=False)
+        return block
+
+    def get(self, docid: str) -> Optional[Dict[str, Any]]:
+        """Look up a document.
+
+        Args:
+            docid: The document ID
+
+        Returns:
+            The document (with at least title and text), or None if the
+            document is not in the store
+        """
+        row = (
+            self._connection()
+            .execute(
+                "SELECT offset, length, position FROM documents WHERE docid = ?",
+                (docid,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        offset, length, position = row
+        return self._read_block(offset, length)[position]
+
+    def get_many(self, docids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up many documents in one sweep over the data file.
+
+        The documents are read in block order, so each block is decoded once.
+
+        Args:
+            docids: The document IDs
+
+        Returns:
+            Dictionary mapping the IDs found in the store to their documents
+        """
+        docids = list(dict.fromkeys(docids))
+        rows = []
+        conn = self._connection()
+        # Stay well below SQLite's limit on the number of query parameters
+        for start in range(0, len(docids), 500):
+            chunk = docids[start : start + 500]
+            rows.extend(
+                conn.execute(
+                    "SELECT docid, offset, length, position FROM documents "
+                    f"WHERE docid IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        rows.sort(key=lambda row: (row[1], row[3]))
+        return {
+            docid: self._read_block(offset, length)[position]
+            for docid, offset, length, position in rows
+        }
+
+    def __contains__(self, docid: str) -> bool:
+        return (
+            self._connection()
+            .execute("SELECT 1 FROM documents WHERE docid = ?", (docid,))
+            .fetchone()
+            is not None
+        )
+
+    def __len__(self) -> int:
+        return self.document_count
+
+    def stats(self) -> Dict[str, Any]:
+        """Get block read statistics.
+
+        Returns:
+            Dictionary with documents, block_reads, block_hits, shared_reads
+            (reads that waited on the same block being decoded by another
+            thread) and cached_blocks
+        """
+        with self._lock:
+            return {
+                "path": self.path,
+                "documents": self.document_count,
+                "block_reads": self._reads,
+                "block_hits": self._block_hits,
+                "shared_reads": self._block_loads.shared,
+                "cached_blocks": len(self._blocks),
+            }
+
+    def close(self):
+        """Release the memory map and the data file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+class DocumentCache:
+    """Thread-safe cache of loaded document collections.
+
+    Each collection is loaded on first use, from its document store when one
+    has been converted and from its doc_mapping pickle otherwise. Concurrent
+    first uses of a collection share a single load.
+
+    Args:
+        lookup_dir: Directory holding the pickles and document stores
+    """
+
+    def __init__(self, lookup_dir: str = DOCS_LOOKUP_DIR):
+        self.lookup_dir = lookup_dir
+        self._lock = threading.Lock()
+        self._collections: Dict[str, Any] = {}
+        self._load_times: Dict[str, float] = {}
+        self._loads = SingleFlight()
+        self._lookups = 0
+        self._misses = 0
+
+    def collection(self, collection: str) -> Any:
+        """Get a loaded collection, loading it on first use.
+
+        Args:
+            collection: The collection ID (e.g., 'neuclir/1/zh')
+
+        Returns:
+            A DocumentStore, or the dictionary loaded from the pickle
+
+        Raises:
+            FileNotFoundError: If the collection has neither a store nor a pickle
+        """
+        collection = normalize_collection(collection)
+        with self._lock:
+            documents = self._collections.get(collection)
+        if documents is not None:
+            return documents
+        return self._loads.do(collection, lambda: self._load(collection))
+
+    def _load(self, collection: str) -> Any:
+        with self._lock:
+            # Another thread may have finished loading it since the first check
+            if collection in self._collections:
+                return self._collections[collection]
+
+        start = time.monotonic()
+        path = store_path(collection, self.lookup_dir)
+        if os.path.isdir(path):
+            documents = DocumentStore(path)
+        else:
+            with open(mapping_path(collection, self.lookup_dir), "rb") as f:
+                documents = pickle.load(f)
+        elapsed = time.monotonic() - start
+        logger.info(f"Loaded collection {collection} in {elapsed:.1f}s")
+
+        with self._lock:
+            self._collections[collection] = documents
+            self._load_times[collection] = elapsed
+        return documents
+
+    def get(self, docid: str, collection: str) -> Optional[Dict[str, Any]]:
+        """Look up a document.
+
+        Args:
+            docid: The document ID
+            collection: The collection ID
+
+        Returns:
+            The document, or None if it is not in the collection
+        """
+        document = self.collection(collection).get(docid)
+        with self._lock:
+            self._lookups += 1
+            if not document:
+                self._misses += 1
+        return document
+
+    def get_many(
+        self, docids: Iterable[str], collection: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Look up many documents of one collection at once.
+
+        Args:
+            docids: The document IDs
+            collection: The collection ID
+
+        Returns:
+            Dictionary mapping the IDs found in the collection to their documents
+        """
+        docids = list(docids)
+        documents = self.collection(collection)
+        if isinstance(documents, DocumentStore):
+            found = documents.get_many(docids)
+        else:
+            found = {docid: documents.get(docid) for docid in docids}
+        found = {docid: document for docid, document in found.items() if document}
+        with self._lock:
+            self._lookups += len(docids)
+            self._misses += len(docids) - len(found)
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the loaded collections and lookup statistics.
+
+        Returns:
+            Dictionary with lookups, misses, shared_loads (first uses that
+            waited on another thread's load) and, per loaded collection, its
+            backend, document count, load time and store statistics
+        """
+        with self._lock:
+            collections = dict(self._collections)
+            stats = {
+                "lookups": self._lookups,
+                "misses": self._misses,
+                "shared_loads": self._loads.shared,
+                "collections": {},
+            }
+            load_times = dict(self._load_times)
+        for collection, documents in collections.items():
+            is_store = isinstance(documents, DocumentStore)
+            stats["collections"][collection] = {
+                "backend": "store" if is_store else "pickle",
+                "documents": len(documents),
+                "load_time": load_times.get(collection),
+                **({"store": documents.stats()} if is_store else {}),
+            }
+        return stats
+
+    def clear(self, collection: Optional[str] = None):
+        """Unload one collection, or every collection and the statistics.
+
+        Args:
+            collection: The collection to unload; all of them if None
+        """
+        with self._lock:
+            if collection is None:
+                unloaded = list(self._collections.values())
+                self._collections.clear()
+                self._load_times.clear()
+                self._lookups = self._misses = 0
+            else:
+                collection = normalize_collection(collection)
+                unloaded = [self._collections.pop(collection, None)]
+                self._load_times.pop(collection, None)
+        for documents in unloaded:
+            if isinstance(documents, DocumentStore):
+                documents.close()
+
+
+# Process-wide cache used by get_text_from_id_fast
+document_cache = DocumentCache()
+
+
+def write_store(
+    documents: Iterable[Tuple[str, Dict[str, Any]]],
+    path: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    compress: bool = True,
+) -> int:
+    """Write documents to a new document store.
+
+    The store is written next to its final location and moved into place
+    once complete, so readers never see a partial store.
+
+    Args:
+        documents: Pairs of (docid, document)
+        path: Directory of the store to create (replaced if it exists)
+        block_size: Number of documents per block
+        compress: Whether to zlib-compress the blocks
+
+    Returns:
+        Number of documents written
+    """
+    if block_size < 1:
+        raise ValueError("Block size must be at least 1")
+    path = str(path).rstrip("/")
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    conn = sqlite3.connect(os.path.join(tmp_path, INDEX_FILE))
+    count = 0
+    with open(os.path.join(tmp_path, DATA_FILE), "wb") as data, conn:
+        conn.execute(
+            """CREATE TABLE documents (
+                docid TEXT PRIMARY KEY,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                position INTEGER NOT NULL
+            )"""
+        )
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        def flush(docids: List[str], block: List[Dict[str, Any]]):
+            payload = json.dumps(block, ensure_ascii=False).encode("utf-8")
+            if compress:
+                payload = zlib.compress(payload)
+            offset = data.tell()
+            data.write(payload)
+            conn.executemany(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                [
+                    (docid, offset, len(payload), position)
+                    for position, docid in enumerate(docids)
+                ],
+            )
+
+        docids, block = [], []
+        for docid, document in documents:
+            docids.append(str(docid))
+            block.append(document)
+            count += 1
+            if len(block) >= block_size:
+                flush(docids, block)
+                docids, block = [], []
+        if block:
+            flush(docids, block)
+
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("compression", "zlib" if compress else "none"),
+                ("block_size", str(block_size)),
+                ("documents", str(count)),
+            ],
+        )
+    conn.close()
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return count
+
+
+def convert_pickle(
+    pickle_file: str,
+    path: Optional[str] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    compress: bool = True,
+) -> int:
+    """Convert a doc_mapping pickle into a document store.
+
+    Args:
+        pickle_file: Path to a doc_mapping_<collection>.pkl file
+        path: Directory of the store to create; defaults to the doc_store_
+            directory next to the pickle
+        block_size: Number of documents per block
+        compress: Whether to zlib-compress the blocks
+
+    Returns:
+        Number of documents written
+    """
+    if path is None:
+        directory, name = os.path.split(pickle_file)
+        name = name[: -len(".pkl")] if name.endswith(".pkl") else name
+        path = os.path.join(directory, name.replace("doc_mapping_", "doc_store_", 1))
+    logger.info(f"Loading {pickle_file}")
+    with open(pickle_file, "rb") as f:
+        mapping = pickle.load(f)
+    count = write_store(mapping.items(), path, block_size=block_size, compress=compress)
+    logger.info(f"Wrote {count} documents to {path}")
+    return count
+
+
+def main():
+    """Convert doc_mapping pickles into document stores."""
+    parser = argparse.ArgumentParser(
+        description="Convert document lookup pickles into indexed document stores"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[DOCS_LOOKUP_DIR],
+        help="Pickle files, or directories whose doc_mapping_*.pkl files are converted",
+    )
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help="Number of documents compressed together (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-compress", action="store_true", help="Store blocks uncompressed"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    pickle_files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            pickle_files.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.startswith("doc_mapping_") and name.endswith(".pkl")
+            )
+        else:
+            pickle_files.append(path)
+    if not pickle_files:
+        parser.error("No doc_mapping pickles found")
+
+    for pickle_file in pickle_files:
+        convert_pickle(
+            pickle_file, block_size=args.block_size, compress=not args.no_compress
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -32,21 +32,42 @@ The framework calculates two primary metrics:
 - Precision = (Rewarded sentences) / (Total scored sentences)
 """
 
+import asyncio
 import os
 import traceback
 from dotenv import load_dotenv
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 import json
 from tqdm import tqdm
 import logging
 
 # Import utility functions
+from .answer_match import literal_matches
+from .answer_major import (
+    PENDING_KEY,
+    defer_nugget_check,
+    judge_answers_transposed,
+    judge_answers_transposed_async,
+)
+from .citations import DocTable, format_citation_text
+from .history import report_history
+from .nugget_batch import judge_nuggets_batched, judge_nuggets_batched_async
+from .nuggets import NuggetBank
+from .options import DEFAULT_OPTIONS, EvaluationOptions
+from .output import CompactOutput
+from .passages import citation_passages
+from .prefilter import prefilter_report
+from .routing import route_collections
+from .speculative import AsyncUncitedJudgments, UncitedJudgments, judgment_record
 from .utils import (
+    DROPPED_RESPONSE,
     ModelProvider,
     get_model_response,
+    aget_model_response,
     modify_model_response,
     get_text_from_id_fast,
     batch_model_responses,
+    abatch_model_responses,
     load_jsonl,
     save_jsonl,
 )
@@ -91,15 +112,77 @@ def check_citations_relevance(
     Returns:
         True if all citations are relevant, False if any citation is irrelevant
     """
+    responses = judge_citations_relevance(sentence, citation_texts, provider, model_name)
+    return "NO" not in responses
+
+
+def judge_citations_relevance(
+        sentence: str,
+        citation_texts: List[str],
+        provider: str = ModelProvider.TOGETHER,
+        model_name: str = None,
+        options: Optional[EvaluationOptions] = None,
+) -> List[Optional[str]]:
+    """Judge whether each citation supports a sentence, stopping on the first NO.
+
+    A single unsupportive citation already penalizes the sentence, so the
+    citations are judged a few at a time and once one is judged NO no more
+    judgments are sent.
+
+    Args:
+        sentence: The sentence to check
+        citation_texts: List of citation texts to check against
+        provider: The model provider to use
+        model_name: Optional specific model name
+        options: Optional evaluation options; with a passage selector, long
+            documents are shortened to their passages most similar to the
+            sentence (see passages)
+
+    Returns:
+        "YES"/"NO" for each judged citation, DROPPED_RESPONSE for each
+        citation whose call was in flight when the checks stopped and None
+        for each citation never sent, in citation order
+    """
     user_prompts = [
         CHECK_RELEVANCE_USER.format(sentence=sentence, citation_content=doc_text)
-        for doc_text in citation_texts
+        for doc_text in citation_passages(sentence, citation_texts, options)
     ]
 
-    responses = batch_model_responses(
-        CHECK_RELEVANCE_SYSTEM, user_prompts, provider, model_name
+    return batch_model_responses(
+        CHECK_RELEVANCE_SYSTEM, user_prompts, provider, model_name, stop_on="NO"
     )
-    return all(response == "YES" for response in responses)
+
+
+def citation_relevance_context(
+    responses: List[Optional[str]], options: EvaluationOptions
+) -> Dict[str, Any]:
+    """Describe which citations were judged for relevance and which were skipped.
+
+    Citations whose call was sent but whose answer was dropped are listed
+    apart from those never sent, since only the latter saved a call.
+
+    Args:
+        responses: The responses of judge_citations_relevance
+        options: The run's evaluation options, whose counters are updated
+
+    Returns:
+        The context of the citation_relevance model response
+    """
+    judged = [
+        i for i, response in enumerate(responses)
+        if response is not None and response != DROPPED_RESPONSE
+    ]
+    dropped = [i for i, response in enumerate(responses) if response == DROPPED_RESPONSE]
+    skipped = [i for i, response in enumerate(responses) if response is None]
+    options.count("relevance_judged", len(judged))
+    options.count("relevance_dropped", len(dropped))
+    options.count("relevance_skipped", len(skipped))
+    return {
+        "num_citations": len(responses),
+        "judged_citations": judged,
+        "dropped_citations": dropped,
+        "skipped_citations": skipped,
+    }
 
 
 def check_citations_relevance_detail(
@@ -138,6 +221,8 @@ def check_nugget_matches(
     nuggets: List[Dict[str, Any]],
     provider: str = ModelProvider.TOGETHER,
     model_name: str = None,
+    options: Optional[EvaluationOptions] = None,
+    kind: str = "cited",
 ) -> List[Dict[str, Any]]:
     """Check which nuggets match a sentence.
 
@@ -150,17 +235,61 @@ def check_nugget_matches(
         nuggets: List of nuggets to check against
         provider: The model provider to use
         model_name: Optional specific model name
+        options: Optional evaluation options; with answer_match, answers the
+            sentence contains literally are accepted without a model call,
+            and with a nugget_batch_size above 1, answers are judged with
+            structured multi-answer prompts
+        kind: The kind of sentence, "cited" or "negative"; only cited
+            sentences are matched literally (see answer_match)
 
     Returns:
         List of matched nugget dictionaries, each containing:
         - question_text: The nugget question
         - matched_answer: The specific answer that matched
         - importance: The importance level of the nugget
+        - evaluator: ANSWER_MATCH_EVALUATOR, only for literal matches
 
     Note:
         A sentence can match multiple nuggets, but each nugget is only counted once
         even if multiple gold answers match.
     """
+    user_prompts, nugget_map = build_nugget_prompts(sentence, nuggets)
+    if not user_prompts:
+        return []
+
+    # Answers the sentence contains literally are accepted without a model call
+    responses, nugget_map = literal_matches(sentence, nugget_map, options, kind)
+    pending = [i for i, response in enumerate(responses) if response is None]
+    if not pending:
+        judged = []
+    elif options is not None and options.nugget_batch_size > 1:
+        judged = judge_nuggets_batched(
+            sentence, [nugget_map[i] for i in pending], provider, model_name, options
+        )
+    else:
+        judged = batch_model_responses(
+            NUGGET_AGREEMENT_SYSTEM,
+            [user_prompts[i] for i in pending],
+            provider,
+            model_name,
+        )
+    for i, response in zip(pending, judged):
+        responses[i] = response
+    return collect_matched_nuggets(responses, nugget_map)
+
+
+def build_nugget_prompts(
+    sentence: str, nuggets: List[Dict[str, Any]]
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Build one nugget agreement prompt per (nugget, gold answer) pair.
+
+    Args:
+        sentence: The sentence to check
+        nuggets: List of nuggets to check against
+
+    Returns:
+        Tuple of (user prompts, nugget info for each prompt)
+    """
     user_prompts = []
     nugget_map = []  # Keep track of which prompt corresponds to which nugget/answer
 
@@ -180,27 +309,150 @@ def check_nugget_matches(
                     "importance": nugget["info"]["importance"],
                 }
             )
+    return user_prompts, nugget_map
 
-    if not user_prompts:
-        return []
 
-    responses = batch_model_responses(
-        NUGGET_AGREEMENT_SYSTEM, user_prompts, provider, model_name
-    )
+def collect_matched_nuggets(
+    responses: List[str], nugget_map: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Collect the nuggets whose agreement prompt was answered YES.
 
+    Args:
+        responses: YES/NO responses, one per prompt
+        nugget_map: Nugget info for each prompt, from build_nugget_prompts
+
+    Returns:
+        List of matched nugget dictionaries without duplicates
+    """
     matched_nuggets = []
+    matched_keys = set()
     for response, nugget_info in zip(responses, nugget_map):
         if response == "YES":
             # Only add if not already matched, don't want duplicates
             nugget_key = (nugget_info["question_text"], nugget_info["matched_answer"])
-            if nugget_key not in [
-                (n["question_text"], n["matched_answer"]) for n in matched_nuggets
-            ]:
+            if nugget_key not in matched_keys:
+                matched_keys.add(nugget_key)
                 matched_nuggets.append(nugget_info)
 
     return matched_nuggets
 
 
+def deferred_sentences(
+    results: List[Optional[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Get the sentence results whose nugget check was deferred."""
+    return [result for result in results if result is not None and PENDING_KEY in result]
+
+
+def apply_nugget_matches(
+    pending: List[Dict[str, Any]],
+    rows: List[List[Optional[str]]],
+    nugget_maps: List[List[Dict[str, Any]]],
+    failures: Optional[Dict[int, str]] = None,
+):
+    """Set the matched nuggets and scores of deferred sentence results.
+
+    Args:
+        pending: The deferred sentence results (updated in place)
+        rows: YES/NO responses of each sentence, in nugget_map order
+        nugget_maps: Nugget info of each gold answer, for each sentence
+        failures: Optional error message of each sentence whose nugget
+            check failed, by position in pending; those sentences get a
+            score of 0 and the error, as in sentence_error_result
+    """
+    failures = failures or {}
+    for index, (result, row, nugget_map) in enumerate(zip(pending, rows, nugget_maps)):
+        kind = result.pop(PENDING_KEY)
+        if index in failures:
+            result["score"] = 0
+            result["error"] = failures[index]
+            continue
+        matched_nuggets = collect_matched_nuggets(row, nugget_map)
+        result["matched_nuggets"] = matched_nuggets
+        if kind == "negative":
+            # Reward if any nugget confirms, penalize if none supports the claim
+            result["score"] = 1 if matched_nuggets else -1
+        else:
+            result["score"] = len(matched_nuggets)  # Reward for each matched nugget
+
+
+def resolve_deferred_nuggets(
+    results: List[Optional[Dict[str, Any]]],
+    nuggets: Optional[List[Dict[str, Any]]],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    options: Optional[EvaluationOptions] = None,
+):
+    """Run the deferred nugget checks of a report in answer-major order.
+
+    Sentence results left by evaluate_sentence in answer-major mode are
+    judged with one prompt per gold answer listing all of them, and get the
+    matched nuggets and score sentence-major mode would have given them.
+    With answer_match, answers a sentence contains literally are left out of
+    the prompts. A sentence whose prompt still fails after its retries gets
+    an error result instead of failing the report.
+
+    Args:
+        results: The sentence results of a report; None entries are skipped
+            (updated in place)
+        nuggets: The nuggets of the report
+        provider: The model provider to use
+        model_name: Optional specific model name
+        options: Optional evaluation options of the run
+    """
+    pending = deferred_sentences(results)
+    if not pending:
+        return
+    _, nugget_map = build_nugget_prompts("", nuggets or [])
+    known, nugget_maps = zip(
+        *(
+            literal_matches(result["sentence"], nugget_map, options, result[PENDING_KEY])
+            for result in pending
+        )
+    )
+    rows, failures = judge_answers_transposed(
+        [result["sentence"] for result in pending],
+        nugget_map,
+        provider,
+        model_name,
+        options or DEFAULT_OPTIONS,
+        known,
+    )
+    apply_nugget_matches(pending, rows, nugget_maps, failures)
+
+
+async def resolve_deferred_nuggets_async(
+    results: List[Optional[Dict[str, Any]]],
+    nuggets: Optional[List[Dict[str, Any]]],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    options: Optional[EvaluationOptions] = None,
+):
+    """Asynchronously run the deferred nugget checks of a report.
+
+    Async counterpart of resolve_deferred_nuggets.
+    """
+    pending = deferred_sentences(results)
+    if not pending:
+        return
+    _, nugget_map = build_nugget_prompts("", nuggets or [])
+    known, nugget_maps = zip(
+        *(
+            literal_matches(result["sentence"], nugget_map, options, result[PENDING_KEY])
+            for result in pending
+        )
+    )
+    rows, failures = await judge_answers_transposed_async(
+        [result["sentence"] for result in pending],
+        nugget_map,
+        provider,
+        model_name,
+        options or DEFAULT_OPTIONS,
+        known,
+    )
+    apply_nugget_matches(pending, rows, nugget_maps, failures)
+
+
 def evaluate_sentence(
         sentence: str,
         citation_content: Optional[List[str]] = None,
@@ -209,6 +461,7 @@ def evaluate_sentence(
         provider: str = ModelProvider.TOGETHER,
         model_name: str = None,
         verbose: bool = False,
+        options: Optional[EvaluationOptions] = None,
 ) -> Dict[str, Any]:
     """Evaluate a single sentence according to the evaluation framework.
 
@@ -229,6 +482,7 @@ def evaluate_sentence(
         provider: The model provider to use
         model_name: Optional specific model name
         verbose: Whether to log debug information
+        options: Optional evaluation options of the run (see options.EvaluationOptions)
 
     Returns:
         Dictionary containing:
@@ -241,6 +495,7 @@ def evaluate_sentence(
     """
     if verbose:
         logger.debug(f"Evaluating sentence: {sentence[:100]}...")
+    options = options or DEFAULT_OPTIONS
 
     results = {
         "sentence": sentence,
@@ -275,10 +530,12 @@ def evaluate_sentence(
         citation_texts = citation_content
         results["citation_details"]["citation_texts"] = citation_texts
 
-        # Check if citations support the claim
-        all_citations_relevant = check_citations_relevance(
-            sentence, citation_texts, provider, model_name
+        # Check if citations support the claim, stopping on the first that does not
+        relevance = judge_citations_relevance(
+            sentence, citation_texts, provider, model_name, options
         )
+        all_citations_relevant = "NO" not in relevance
+        relevance_context = citation_relevance_context(relevance, options)
 
         if not all_citations_relevant:
             results["citation_details"]["citation_relevance"] = "NOT_RELEVANT"
@@ -286,7 +543,7 @@ def evaluate_sentence(
                 {
                     "type": "citation_relevance",
                     "response": "NO",
-                    "context": {"num_citations": len(citation_texts)},
+                    "context": relevance_context,
                 }
             )
             results["score"] = -1  # Penalize if any document doesn't support the claim
@@ -297,14 +554,16 @@ def evaluate_sentence(
             {
                 "type": "citation_relevance",
                 "response": "YES",
-                "context": {"num_citations": len(citation_texts)},
+                "context": relevance_context,
             }
         )
 
         # Step 2: Batch check all nugget matches
-        if nuggets:
+        if nuggets and options.answer_major:
+            defer_nugget_check(results, "cited")
+        elif nuggets:
             matched_nuggets = check_nugget_matches(
-                sentence, nuggets, provider, model_name
+                sentence, nuggets, provider, model_name, options
             )
             results["matched_nuggets"] = matched_nuggets
             if matched_nuggets:
@@ -315,80 +574,68 @@ def evaluate_sentence(
                 results["score"] = 0  # Ignore if no nuggets are matched
     else:
         # Process sentences without citations
-        is_negative = get_model_response(
-            CHECK_NEGATIVE_SYSTEM,
-            CHECK_NEGATIVE_USER.format(sentence=sentence),
-            provider=provider,
-            model_name=model_name,
+        judgments = UncitedJudgments(
+            sentence, previous_sentences, provider, model_name, options
         )
-        is_negative = modify_model_response(is_negative)
-        results["evaluation_details"]["is_negative"] = is_negative == "YES"
-        results["evaluation_details"]["model_responses"].append(
-            {"type": "check_negative", "response": is_negative}
-        )
-
-        if is_negative == "YES":
-            # For negative statements, batch check all nugget matches
-            if nuggets:
-                matched_nuggets = check_nugget_matches(
-                    sentence, nuggets, provider, model_name
-                )
-                results["matched_nuggets"] = matched_nuggets
-                if matched_nuggets:
-                    results["score"] = (
-                        1  # Reward if any nugget confirms negative statement
-                    )
-                else:
-                    results[
-                        "score"
-                    ] = -1  # Penalize if no nugget supports negative claim
-        else:
-            # For non-negative statements without citations
-            requires_cite = get_model_response(
-                REQUIRES_CITATION_SYSTEM,
-                REQUIRES_CITATION_USER.format(sentence=sentence),
-                provider=provider,
-                model_name=model_name,
-            )
-            requires_cite = modify_model_response(requires_cite)
-            results["evaluation_details"]["requires_citation"] = requires_cite == "YES"
+        try:
+            is_negative = judgments.get("check_negative")
+            results["evaluation_details"]["is_negative"] = is_negative == "YES"
             results["evaluation_details"]["model_responses"].append(
-                {"type": "requires_citation", "response": requires_cite}
+                judgment_record(judgments, "check_negative", is_negative)
             )
 
-            if requires_cite == "YES":
-                # Check if it's the first instance (this must be sequential)
-                if previous_sentences:
-                    is_first = get_model_response(
-                        FIRST_INSTANCE_SYSTEM,
-                        FIRST_INSTANCE_USER.format(
-                            sentence=sentence,
-                            previous_sentences="\n".join(previous_sentences),
-                        ),
-                        provider=provider,
-                        model_name=model_name,
-                    )
-                    is_first = modify_model_response(is_first)
-                    results["evaluation_details"]["is_first_instance"] = (
-                            is_first == "YES"
+            if is_negative == "YES":
+                judgments.finish()
+                # For negative statements, batch check all nugget matches
+                if nuggets and options.answer_major:
+                    defer_nugget_check(results, "negative")
+                elif nuggets:
+                    matched_nuggets = check_nugget_matches(
+                        sentence, nuggets, provider, model_name, options, "negative"
                     )
-                    results["evaluation_details"]["model_responses"].append(
-                        {
-                            "type": "first_instance",
-                            "response": is_first,
-                            "context": {
-                                "num_previous_sentences": len(previous_sentences)
-                            },
-                        }
-                    )
-                    results["score"] = (
-                        -1 if is_first == "YES" else 0
-                    )  # Penalize first occurrence, ignore repeats
-                else:
-                    results["evaluation_details"]["is_first_instance"] = True
-                    results["score"] = -1  # Penalize first occurrence
+                    results["matched_nuggets"] = matched_nuggets
+                    if matched_nuggets:
+                        results["score"] = (
+                            1  # Reward if any nugget confirms negative statement
+                        )
+                    else:
+                        results[
+                            "score"
+                        ] = -1  # Penalize if no nugget supports negative claim
             else:
-                results["score"] = 0  # Ignore statements not requiring citations
+                # For non-negative statements without citations
+                requires_cite = judgments.get("requires_citation")
+                results["evaluation_details"]["requires_citation"] = requires_cite == "YES"
+                results["evaluation_details"]["model_responses"].append(
+                    judgment_record(judgments, "requires_citation", requires_cite)
+                )
+
+                if requires_cite == "YES":
+                    # Check if it's the first instance among the previous sentences
+                    if previous_sentences:
+                        is_first = judgments.get("first_instance")
+                        results["evaluation_details"]["is_first_instance"] = (
+                                is_first == "YES"
+                        )
+                        results["evaluation_details"]["model_responses"].append(
+                            {
+                                "type": "first_instance",
+                                "response": is_first,
+                                "context": {
+                                    "num_previous_sentences": len(previous_sentences)
+                                },
+                            }
+                        )
+                        results["score"] = (
+                            -1 if is_first == "YES" else 0
+                        )  # Penalize first occurrence, ignore repeats
+                    else:
+                        results["evaluation_details"]["is_first_instance"] = True
+                        results["score"] = -1  # Penalize first occurrence
+                else:
+                    results["score"] = 0  # Ignore statements not requiring citations
+        finally:
+            judgments.finish()
 
     if verbose:
         logger.debug(f"Sentence evaluation complete. Score: {results['score']}")
@@ -614,10 +861,13 @@ def empty_response(sentence) -> Dict[str, Any]:
 
 def evaluate_report(
         report: Dict[str, Any],
-        nuggets_file: str = "example_nuggets.jsonl",
+        nuggets_file: Union[str, NuggetBank] = "example_nuggets.jsonl",
         provider: str = ModelProvider.TOGETHER,
         model_name: str = None,
         verbose: bool = False,
+        doc_table: Optional[DocTable] = None,
+        compact_output: Optional[CompactOutput] = None,
+        options: Optional[EvaluationOptions] = None,
 ) -> Dict[str, Any]:
     """Evaluate an entire report according to the evaluation framework.
 
@@ -626,10 +876,16 @@ def evaluate_report(
 
     Args:
         report: The report to evaluate, containing sentences and metadata
-        nuggets_file: Path to the JSONL file containing evaluation nuggets
+        nuggets_file: Path to the JSONL file containing evaluation nuggets, or
+            a NuggetBank loaded once and shared across reports
         provider: The model provider to use
         model_name: Optional specific model name
         verbose: Whether to log debug information
+        doc_table: Optional citations resolved in bulk for the run
+            (see citations.resolve_citations)
+        compact_output: Optional CompactOutput; if given, cited documents
+            are recorded by doc id and hash instead of by text
+        options: Optional evaluation options of the run (see options.EvaluationOptions)
 
     Returns:
         Dictionary containing:
@@ -646,43 +902,16 @@ def evaluate_report(
         )
 
     results = []
-    unique_nuggets_matched = set()
-    total_sentences = 0
-    rewarded_sentences = 0
-    penalized_sentences = 0
     citation_documents = {}  # Store all citation texts
+    citation_keys = {}  # Citation text -> key in citation_documents
+    doc_ids = {}  # Citation text -> doc id, for compact output
 
-    # Load nuggets if file is provided
-    nuggets = None
-    if nuggets_file and os.path.exists(nuggets_file):
-        if verbose:
-            logger.info(f"Loading nuggets from {nuggets_file}")
-        try:
-            with open(nuggets_file, "r") as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    nuggets_data = json.loads(line)
-                    if str(nuggets_data["query_id"]) == str(report["request_id"]):
-                        if verbose:
-                            logger.info(
-                                f"Found matching nuggets for report {report['request_id']}"
-                            )
-                            logger.info(f"Loaded {len(nuggets_data['items'])} nuggets")
-                        nuggets = nuggets_data["items"]
-                        break
-                if nuggets is None and verbose:
-                    logger.warning(
-                        f"No matching nuggets found for report {report['request_id']}"
-                    )
-        except Exception as e:
-            if verbose:
-                logger.error(f"Failed to load nuggets: {str(e)}")
-            raise
+    nuggets = load_nuggets(nuggets_file, report, verbose)
 
     # Extract all sentences
     sentences = report["sentences"]
-    all_sentence_texts = [s["text"] for s in sentences]
+    sentence_nuggets = prefilter_report(report, nuggets, options)
+    sentence_history = report_history(report, options)
     if verbose:
         logger.info(f"Processing {len(sentences)} sentences")
 
@@ -690,76 +919,26 @@ def evaluate_report(
     for i, sentence_data in enumerate(sentences):
         if verbose:
             logger.info(f"Processing sentence {i+1}/{len(sentences)}")
+        citation_texts = []
         try:
             # Extract citation texts from the sentence data
-            citation_texts = []
-            if "citations" in sentence_data and sentence_data["citations"]:
-                if isinstance(sentence_data["citations"], list):
-                    for doc_id in sentence_data["citations"]:
-                        # For each document ID, get the text from all possible collections
-                        for collection_id in report["collection_ids"]:
-                            title, text = get_text_from_id_fast(doc_id, collection_id)
-                            if title is not None and text is not None:
-                                doc_text = f"Title: {title}\n\nContent: {text}"
-                                citation_texts.append(doc_text)
-                                break  # Found the document, no need to check other collections
-                    # assert we found all the citations
-                    assert (
-                            len(citation_texts) == len(sentence_data["citations"])
-                    ), f"Expected {len(sentence_data['citations'])} citations, but found {len(citation_texts)}"
-                else:
-                    logger.warning(f"Unexpected citation format in sentence {i+1}")
+            citations = extract_citation_texts(i, report, sentence_data, doc_table)
+            citation_texts = [citation["text"] for citation in citations]
+            doc_ids.update((c["text"], c["doc_id"]) for c in citations)
 
             result = evaluate_sentence(
                 sentence=sentence_data["text"],
                 citation_content=citation_texts if citation_texts else None,
-                previous_sentences=all_sentence_texts[:i] if i > 0 else None,
-                nuggets=nuggets,
+                previous_sentences=sentence_history[i],
+                nuggets=sentence_nuggets[i],
                 provider=provider,
                 model_name=model_name,
                 verbose=verbose,
+                options=options,
+            )
+            results.append(
+                finalize_sentence_result(result, i, citation_documents, citation_keys)
             )
-
-            # Update metrics
-            if result["matched_nuggets"]:
-                if verbose:
-                    logger.debug(
-                        f"Sentence {i+1} matched {len(result['matched_nuggets'])} nuggets"
-                    )
-                for nugget in result["matched_nuggets"]:
-                    unique_nuggets_matched.add(
-                        (nugget["question_text"], nugget["matched_answer"])
-                    )
-
-            if result["score"] != 0:
-                total_sentences += 1
-                if result["score"] > 0:
-                    rewarded_sentences += 1
-                elif result["score"] < 0:
-                    penalized_sentences += 1
-
-            # Store citation texts if present
-            if result["citation_details"]["citation_texts"]:
-                citation_indices = []  # Track which citations were used for this sentence
-                for text in result["citation_details"]["citation_texts"]:
-                    # Find existing citation or create new one
-                    citation_key = None
-                    for key, existing_text in citation_documents.items():
-                        if text == existing_text:
-                            citation_key = key
-                            break
-
-                    if citation_key is None:
-                        citation_key = f"citation_{len(citation_documents)}"
-                        citation_documents[citation_key] = text
-
-                    citation_indices.append(citation_key)
-
-                # Store the citation indices with the result
-                result["citation_indices"] = citation_indices
-
-            result["sentence_index"] = i
-            results.append(result)
 
         except Exception as e:
             if verbose:
@@ -767,18 +946,133 @@ def evaluate_report(
                 # add traceback
                 logger.error(f"Traceback: {traceback.format_exc()}")
             results.append(
-                {
-                    "sentence": sentence_data["text"],
-                    "sentence_index": i,
-                    "score": 0,
-                    "error": str(e),
-                    "citation_details": {
-                        "has_citations": bool(citation_texts),
-                        "citation_texts": citation_texts if citation_texts else [],
-                    },
-                }
+                sentence_error_result(sentence_data["text"], i, e, citation_texts)
             )
 
+    resolve_deferred_nuggets(results, nuggets, provider, model_name, options)
+    summary = summarize_report(report, results, nuggets, citation_documents, verbose)
+    if compact_output is not None:
+        summary = compact_output.compact(summary, doc_ids)
+    return summary
+
+
+def finalize_sentence_result(
+    result: Dict[str, Any],
+    sentence_index: int,
+    citation_documents: Dict[str, str],
+    citation_keys: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Attach the sentence index and citation document keys to a sentence result.
+
+    Citation texts are stored once per report in citation_documents and each
+    sentence result refers to them by key.
+
+    Args:
+        result: The result returned by evaluate_sentence
+        sentence_index: Position of the sentence in the report
+        citation_documents: Map of citation keys to citation texts for the report (updated in place)
+        citation_keys: Reverse map of citation texts to their keys, kept by
+            the caller across the sentences of a report (updated in place);
+            rebuilt from citation_documents if not given
+
+    Returns:
+        The updated sentence result
+    """
+    if citation_keys is None:
+        citation_keys = {text: key for key, text in citation_documents.items()}
+
+    # Store citation texts if present
+    if result["citation_details"]["citation_texts"]:
+        citation_indices = []  # Track which citations were used for this sentence
+        for text in result["citation_details"]["citation_texts"]:
+            # Find existing citation or create new one
+            citation_key = citation_keys.get(text)
+            if citation_key is None:
+                citation_key = f"citation_{len(citation_documents)}"
+                citation_documents[citation_key] = text
+                citation_keys[text] = citation_key
+
+            citation_indices.append(citation_key)
+
+        # Store the citation indices with the result
+        result["citation_indices"] = citation_indices
+
+    result["sentence_index"] = sentence_index
+    return result
+
+
+def sentence_error_result(
+    sentence: str,
+    sentence_index: int,
+    error: Exception,
+    citation_texts: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Build the result recorded for a sentence whose evaluation failed.
+
+    Args:
+        sentence: The sentence text
+        sentence_index: Position of the sentence in the report
+        error: The exception raised while evaluating the sentence
+        citation_texts: The citation texts resolved before the failure
+
+    Returns:
+        A sentence result with a score of 0 and the error message
+    """
+    return {
+        "sentence": sentence,
+        "sentence_index": sentence_index,
+        "score": 0,
+        "error": str(error),
+        "citation_details": {
+            "has_citations": bool(citation_texts),
+            "citation_texts": citation_texts if citation_texts else [],
+        },
+    }
+
+
+def summarize_report(
+    report: Dict[str, Any],
+    results: List[Dict[str, Any]],
+    nuggets: Optional[List[Dict[str, Any]]],
+    citation_documents: Dict[str, str],
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """Calculate the overall metrics of a report from its sentence results.
+
+    Args:
+        report: The evaluated report
+        results: Sentence results in report order
+        nuggets: The nuggets the report was evaluated against
+        citation_documents: Map of citation keys to citation texts
+        verbose: Whether to log debug information
+
+    Returns:
+        The report evaluation, as returned by evaluate_report
+    """
+    unique_nuggets_matched = set()
+    total_sentences = 0
+    rewarded_sentences = 0
+    penalized_sentences = 0
+
+    for result in results:
+        # Update metrics
+        if result.get("matched_nuggets"):
+            if verbose:
+                logger.debug(
+                    f"Sentence {result['sentence_index']+1} matched {len(result['matched_nuggets'])} nuggets"
+                )
+            for nugget in result["matched_nuggets"]:
+                unique_nuggets_matched.add(
+                    (nugget["question_text"], nugget["matched_answer"])
+                )
+
+        if result["score"] != 0:
+            total_sentences += 1
+            if result["score"] > 0:
+                rewarded_sentences += 1
+            elif result["score"] < 0:
+                penalized_sentences += 1
+
     # Calculate overall metrics
     total_nuggets = (
         sum(len(nugget["gold_answers"]) for nugget in nuggets) if nuggets else 0
@@ -813,12 +1107,426 @@ def evaluate_report(
     }
 
 
+async def check_citations_relevance_async(
+        sentence: str,
+        citation_texts: List[str],
+        provider: str = ModelProvider.TOGETHER,
+        model_name: str = None,
+) -> bool:
+    """Asynchronously check if all citations are relevant to a sentence.
+
+    Async counterpart of check_citations_relevance.
+
+    Args:
+        sentence: The sentence to check
+        citation_texts: List of citation texts to check against
+        provider: The model provider to use
+        model_name: Optional specific model name
+
+    Returns:
+        True if all citations are relevant, False if any citation is irrelevant
+    """
+    responses = await judge_citations_relevance_async(
+        sentence, citation_texts, provider, model_name
+    )
+    return "NO" not in responses
+
+
+async def judge_citations_relevance_async(
+        sentence: str,
+        citation_texts: List[str],
+        provider: str = ModelProvider.TOGETHER,
+        model_name: str = None,
+        options: Optional[EvaluationOptions] = None,
+) -> List[Optional[str]]:
+    """Asynchronously judge each citation, stopping on the first NO.
+
+    Async counterpart of judge_citations_relevance. Judgments in flight are
+    cancelled once a citation is judged NO.
+
+    Args:
+        sentence: The sentence to check
+        citation_texts: List of citation texts to check against
+        provider: The model provider to use
+        model_name: Optional specific model name
+        options: Optional evaluation options (see judge_citations_relevance)
+
+    Returns:
+        "YES"/"NO" for each judged citation, DROPPED_RESPONSE for each
+        citation whose call was in flight when the checks stopped and None
+        for each citation never sent, in citation order
+    """
+    user_prompts = [
+        CHECK_RELEVANCE_USER.format(sentence=sentence, citation_content=doc_text)
+        for doc_text in citation_passages(sentence, citation_texts, options)
+    ]
+
+    return await abatch_model_responses(
+        CHECK_RELEVANCE_SYSTEM, user_prompts, provider, model_name, stop_on="NO"
+    )
+
+
+async def check_nugget_matches_async(
+    sentence: str,
+    nuggets: List[Dict[str, Any]],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    options: Optional[EvaluationOptions] = None,
+    kind: str = "cited",
+) -> List[Dict[str, Any]]:
+    """Asynchronously check which nuggets match a sentence.
+
+    Async counterpart of check_nugget_matches.
+
+    Args:
+        sentence: The sentence to check
+        nuggets: List of nuggets to check against
+        provider: The model provider to use
+        model_name: Optional specific model name
+        options: Optional evaluation options (see check_nugget_matches)
+        kind: The kind of sentence (see check_nugget_matches)
+
+    Returns:
+        List of matched nugget dictionaries
+    """
+    user_prompts, nugget_map = build_nugget_prompts(sentence, nuggets)
+    if not user_prompts:
+        return []
+
+    responses, nugget_map = literal_matches(sentence, nugget_map, options, kind)
+    pending = [i for i, response in enumerate(responses) if response is None]
+    if not pending:
+        judged = []
+    elif options is not None and options.nugget_batch_size > 1:
+        judged = await judge_nuggets_batched_async(
+            sentence, [nugget_map[i] for i in pending], provider, model_name, options
+        )
+    else:
+        judged = await abatch_model_responses(
+            NUGGET_AGREEMENT_SYSTEM,
+            [user_prompts[i] for i in pending],
+            provider,
+            model_name,
+        )
+    for i, response in zip(pending, judged):
+        responses[i] = response
+    return collect_matched_nuggets(responses, nugget_map)
+
+
+async def evaluate_sentence_async(
+        sentence: str,
+        citation_content: Optional[List[str]] = None,
+        previous_sentences: Optional[List[str]] = None,
+        nuggets: Optional[List[Dict[str, Any]]] = None,
+        provider: str = ModelProvider.TOGETHER,
+        model_name: str = None,
+        verbose: bool = False,
+        options: Optional[EvaluationOptions] = None,
+) -> Dict[str, Any]:
+    """Asynchronously evaluate a single sentence according to the evaluation framework.
+
+    Follows the same decision tree as evaluate_sentence and returns the same
+    result structure, but issues model calls with ainvoke.
+
+    Args:
+        sentence: The sentence to evaluate
+        citation_content: List of citation texts
+        previous_sentences: List of sentences that came before this one (for first instance checking)
+        nuggets: List of nuggets to check against
+        provider: The model provider to use
+        model_name: Optional specific model name
+        verbose: Whether to log debug information
+        options: Optional evaluation options of the run (see options.EvaluationOptions)
+
+    Returns:
+        Dictionary with the same structure as evaluate_sentence
+    """
+    if verbose:
+        logger.debug(f"Evaluating sentence: {sentence[:100]}...")
+    options = options or DEFAULT_OPTIONS
+
+    results = {
+        "sentence": sentence,
+        "evaluation_path": [],
+        "matched_nuggets": [],
+        "score": 0,
+        "citation_details": {
+            "has_citations": False,
+            "citation_texts": [],
+            "citation_relevance": None,
+        },
+        "evaluation_details": {
+            "is_negative": None,
+            "requires_citation": None,
+            "is_first_instance": None,
+            "model_responses": [],
+        },
+    }
+
+    # Step 1: Check for citations
+    has_citations = citation_content is not None and len(citation_content) > 0
+    results["citation_details"]["has_citations"] = has_citations
+    results["evaluation_path"].append(1)
+
+    if has_citations:
+        citation_texts = citation_content
+        results["citation_details"]["citation_texts"] = citation_texts
+
+        # Check if citations support the claim, stopping on the first that does not
+        relevance = await judge_citations_relevance_async(
+            sentence, citation_texts, provider, model_name, options
+        )
+        all_citations_relevant = "NO" not in relevance
+        relevance_response = "YES" if all_citations_relevant else "NO"
+        results["citation_details"]["citation_relevance"] = (
+            "RELEVANT" if all_citations_relevant else "NOT_RELEVANT"
+        )
+        results["evaluation_details"]["model_responses"].append(
+            {
+                "type": "citation_relevance",
+                "response": relevance_response,
+                "context": citation_relevance_context(relevance, options),
+            }
+        )
+        if not all_citations_relevant:
+            results["score"] = -1  # Penalize if any document doesn't support the claim
+            return results
+
+        # Step 2: Batch check all nugget matches
+        if nuggets and options.answer_major:
+            defer_nugget_check(results, "cited")
+        elif nuggets:
+            matched_nuggets = await check_nugget_matches_async(
+                sentence, nuggets, provider, model_name, options
+            )
+            results["matched_nuggets"] = matched_nuggets
+            results["score"] = len(matched_nuggets)  # Reward for each matched nugget
+    else:
+        # Process sentences without citations
+        judgments = AsyncUncitedJudgments(
+            sentence, previous_sentences, provider, model_name, options
+        )
+        try:
+            is_negative = await judgments.get("check_negative")
+            results["evaluation_details"]["is_negative"] = is_negative == "YES"
+            results["evaluation_details"]["model_responses"].append(
+                judgment_record(judgments, "check_negative", is_negative)
+            )
+
+            if is_negative == "YES":
+                judgments.finish()
+                # For negative statements, batch check all nugget matches
+                if nuggets and options.answer_major:
+                    defer_nugget_check(results, "negative")
+                elif nuggets:
+                    matched_nuggets = await check_nugget_matches_async(
+                        sentence, nuggets, provider, model_name, options, "negative"
+                    )
+                    results["matched_nuggets"] = matched_nuggets
+                    # Reward if any nugget confirms, penalize if none supports the claim
+                    results["score"] = 1 if matched_nuggets else -1
+            else:
+                # For non-negative statements without citations
+                requires_cite = await judgments.get("requires_citation")
+                results["evaluation_details"]["requires_citation"] = requires_cite == "YES"
+                results["evaluation_details"]["model_responses"].append(
+                    judgment_record(judgments, "requires_citation", requires_cite)
+                )
+
+                if requires_cite == "YES":
+                    if previous_sentences:
+                        is_first = await judgments.get("first_instance")
+                        results["evaluation_details"]["is_first_instance"] = (
+                                is_first == "YES"
+                        )
+                        results["evaluation_details"]["model_responses"].append(
+                            {
+                                "type": "first_instance",
+                                "response": is_first,
+                                "context": {
+                                    "num_previous_sentences": len(previous_sentences)
+                                },
+                            }
+                        )
+                        results["score"] = (
+                            -1 if is_first == "YES" else 0
+                        )  # Penalize first occurrence, ignore repeats
+                    else:
+                        results["evaluation_details"]["is_first_instance"] = True
+                        results["score"] = -1  # Penalize first occurrence
+        finally:
+            judgments.finish()
+
+    if verbose:
+        logger.debug(f"Sentence evaluation complete. Score: {results['score']}")
+    return results
+
+
+async def evaluate_report_async(
+        report: Dict[str, Any],
+        nuggets_file: Union[str, NuggetBank] = "example_nuggets.jsonl",
+        provider: str = ModelProvider.TOGETHER,
+        model_name: str = None,
+        verbose: bool = False,
+        doc_table: Optional[DocTable] = None,
+        compact_output: Optional[CompactOutput] = None,
+        options: Optional[EvaluationOptions] = None,
+) -> Dict[str, Any]:
+    """Asynchronously evaluate an entire report according to the evaluation framework.
+
+    The previous sentences needed for first instance checking are known up
+    front, so all sentences are evaluated concurrently. Concurrency is bounded
+    by the global async semaphore in utils. Results are identical in structure
+    to evaluate_report.
+
+    Args:
+        report: The report to evaluate, containing sentences and metadata
+        nuggets_file: Path to the JSONL file containing evaluation nuggets, or
+            a NuggetBank loaded once and shared across reports
+        provider: The model provider to use
+        model_name: Optional specific model name
+        verbose: Whether to log debug information
+        doc_table: Optional citations resolved in bulk for the run
+            (see citations.resolve_citations)
+        compact_output: Optional CompactOutput; if given, cited documents
+            are recorded by doc id and hash instead of by text
+        options: Optional evaluation options of the run (see options.EvaluationOptions)
+
+    Returns:
+        Dictionary with the same structure as evaluate_report
+    """
+    if verbose:
+        logger.info(
+            f"Starting async evaluation of report {report.get('request_id', 'unknown')}"
+        )
+
+    nuggets = load_nuggets(nuggets_file, report, verbose)
+    sentence_nuggets = prefilter_report(report, nuggets, options)
+    sentence_history = report_history(report, options)
+    doc_ids = {}  # Citation text -> doc id, for compact output
+
+    async def evaluate_one(i: int):
+        citation_texts = []
+        try:
+            kwargs, citation_texts = prepare_sentence(
+                report, i, sentence_nuggets[i], sentence_history[i], doc_table, doc_ids
+            )
+            result = await evaluate_sentence_async(
+                provider=provider,
+                model_name=model_name,
+                verbose=verbose,
+                options=options,
+                **kwargs,
+            )
+            return result, citation_texts, None
+        except Exception as e:
+            if verbose:
+                logger.error(f"Error processing sentence {i+1}: {str(e)}")
+                logger.error(f"Traceback: {traceback.format_exc()}")
+            return None, citation_texts, e
+
+    outcomes = await asyncio.gather(
+        *(evaluate_one(i) for i in range(len(report["sentences"])))
+    )
+    await resolve_deferred_nuggets_async(
+        [result for result, _, _ in outcomes], nuggets, provider, model_name, options
+    )
+    return assemble_report(
+        report, outcomes, nuggets, doc_ids, compact_output, verbose
+    )
+
+
+def prepare_sentence(
+    report: Dict[str, Any],
+    sentence_index: int,
+    nuggets: Optional[List[Dict[str, Any]]],
+    previous_sentences: Optional[List[str]],
+    doc_table: Optional[DocTable] = None,
+    doc_ids: Optional[Dict[str, str]] = None,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Resolve the inputs of one sentence of a report.
+
+    Args:
+        report: The report holding the sentence
+        sentence_index: Position of the sentence in the report
+        nuggets: The nuggets the sentence is judged against
+        previous_sentences: The earlier sentences listed in its first
+            instance check (see history.report_history)
+        doc_table: Optional citations resolved in bulk for the run
+        doc_ids: Optional map of citation texts to doc ids (updated in place)
+
+    Returns:
+        Tuple of (keyword arguments for evaluate_sentence without the model
+        settings, citation texts)
+    """
+    sentences = report["sentences"]
+    sentence_data = sentences[sentence_index]
+    citations = extract_citation_texts(sentence_index, report, sentence_data, doc_table)
+    citation_texts = [citation["text"] for citation in citations]
+    if doc_ids is not None:
+        doc_ids.update((c["text"], c["doc_id"]) for c in citations)
+    kwargs = {
+        "sentence": sentence_data["text"],
+        "citation_content": citation_texts if citation_texts else None,
+        "previous_sentences": previous_sentences,
+        "nuggets": nuggets,
+    }
+    return kwargs, citation_texts
+
+
+def assemble_report(
+    report: Dict[str, Any],
+    outcomes: List[Tuple[Optional[Dict[str, Any]], List[str], Optional[Exception]]],
+    nuggets: Optional[List[Dict[str, Any]]],
+    doc_ids: Optional[Dict[str, str]] = None,
+    compact_output: Optional[CompactOutput] = None,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """Build a report evaluation from sentences evaluated out of order.
+
+    Sentences are assembled in report order so citation keys match the
+    sequential engine.
+
+    Args:
+        report: The evaluated report
+        outcomes: One (result, citation texts, error) tuple per sentence, in
+            report order; result is None if error is set
+        nuggets: The nuggets the report was evaluated against
+        doc_ids: Map of citation texts to doc ids, for compact output
+        compact_output: Optional CompactOutput for reference-only results
+        verbose: Whether to log debug information
+
+    Returns:
+        The report evaluation, as returned by evaluate_report
+    """
+    results = []
+    citation_documents = {}
+    citation_keys = {}
+    for i, (result, citation_texts, error) in enumerate(outcomes):
+        if error is None:
+            results.append(
+                finalize_sentence_result(result, i, citation_documents, citation_keys)
+            )
+        else:
+            results.append(
+                sentence_error_result(
+                    report["sentences"][i]["text"], i, error, citation_texts
+                )
+            )
+
+    summary = summarize_report(report, results, nuggets, citation_documents, verbose)
+    if compact_output is not None:
+        summary = compact_output.compact(summary, doc_ids or {})
+    return summary
+
+
 def evaluate_report_generic_format(
     report: Dict[str, Any],
-    nuggets_file: str = "example_nuggets.jsonl",
+    nuggets_file: Union[str, NuggetBank] = "example_nuggets.jsonl",
     provider: str = ModelProvider.TOGETHER,
     model_name: str = None,
     verbose: bool = False,
+    doc_table: Optional[DocTable] = None,
 ) -> Dict[str, Any]:
     """Evaluate an entire report according to the evaluation framework.
 
@@ -827,10 +1535,13 @@ def evaluate_report_generic_format(
 
     Args:
         report: The report to evaluate, containing sentences and metadata
-        nuggets_file: Path to the JSONL file containing evaluation nuggets
+        nuggets_file: Path to the JSONL file containing evaluation nuggets, or
+            a NuggetBank loaded once and shared across reports
         provider: The model provider to use
         model_name: Optional specific model name
         verbose: Whether to log debug information
+        doc_table: Optional citations resolved in bulk for the run
+            (see citations.resolve_citations)
 
     Returns:
         Dictionary containing:
@@ -866,7 +1577,7 @@ def evaluate_report_generic_format(
         if verbose:
             logger.info(f"Processing sentence {i+1}/{len(sentences)}")
         try:
-            citations = extract_citation_texts(i, report, sentence_data)
+            citations = extract_citation_texts(i, report, sentence_data, doc_table)
 
             result = evaluate_sentence_w_diagram(
                 sentence=sentence_data["text"],
@@ -971,17 +1682,25 @@ def evaluate_report_generic_format(
     }
 
 
-def extract_citation_texts(sentence_number, report, sentence_data):
+def extract_citation_texts(sentence_number, report, sentence_data, doc_table=None):
     # Extract citation texts from the sentence data
     citations = []
     if "citations" in sentence_data and sentence_data["citations"]:
         if isinstance(sentence_data["citations"], list):
             for doc_id in sentence_data["citations"]:
-                # For each document ID, get the text from all possible collections
-                for collection_id in report["collection_ids"]:
-                    title, text = get_text_from_id_fast(doc_id, collection_id)
-                    if title is not None and text is not None:
-                        doc_text = f"Title: {title}\n\nContent: {text}"
+                # For each document ID, get the text from the collections that can hold it
+                for collection_id in route_collections(doc_id, report["collection_ids"]):
+                    # Use the run's pre-resolved citations when available
+                    if doc_table is not None and doc_table.has(doc_id, collection_id):
+                        doc_text = doc_table.get(doc_id, collection_id)
+                    else:
+                        title, text = get_text_from_id_fast(doc_id, collection_id)
+                        doc_text = (
+                            format_citation_text(title, text)
+                            if title is not None and text is not None
+                            else None
+                        )
+                    if doc_text is not None:
                         citations.append({"doc_id": doc_id, "text": doc_text})
                         break  # Found the document, no need to check other collections
             # assert we found all the citations
@@ -994,33 +1713,40 @@ def extract_citation_texts(sentence_number, report, sentence_data):
 
 
 def load_nuggets(nuggets_file, report, verbose):
-    # Load nuggets if file is provided
-    nuggets = None
-    if nuggets_file and os.path.exists(nuggets_file):
+    """Get the nuggets of a report from a nugget bank or a nuggets file.
+
+    Args:
+        nuggets_file: A NuggetBank loaded once for the run, or a path to the
+            JSONL file containing evaluation nuggets
+        report: The report whose nuggets to look up
+        verbose: Whether to log debug information
+
+    Returns:
+        The list of nuggets for the report, or None if there are none
+    """
+    if isinstance(nuggets_file, NuggetBank):
+        bank = nuggets_file
+    elif nuggets_file and os.path.exists(nuggets_file):
         if verbose:
             logger.info(f"Loading nuggets from {nuggets_file}")
         try:
-            with open(nuggets_file, "r") as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    nuggets_data = json.loads(line)
-                    if str(nuggets_data["query_id"]) == str(report["request_id"]):
-                        if verbose:
-                            logger.info(
-                                f"Found matching nuggets for report {report['request_id']}"
-                            )
-                            logger.info(f"Loaded {len(nuggets_data['items'])} nuggets")
-                        nuggets = nuggets_data["items"]
-                        break
-                if nuggets is None and verbose:
-                    logger.warning(
-                        f"No matching nuggets found for report {report['request_id']}"
-                    )
+            bank = NuggetBank.from_file(nuggets_file)
         except Exception as e:
             if verbose:
                 logger.error(f"Failed to load nuggets: {str(e)}")
             raise
+    else:
+        return None
+
+    nuggets = bank.for_report(report)
+    if verbose:
+        if nuggets is None:
+            logger.warning(
+                f"No matching nuggets found for report {report['request_id']}"
+            )
+        else:
+            logger.info(f"Found matching nuggets for report {report['request_id']}")
+            logger.info(f"Loaded {len(nuggets)} nuggets")
     return nuggets
 
 
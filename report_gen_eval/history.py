@@ -0,0 +1,295 @@
+"""Bounded history for first_instance checks.
+
+first_instance asks whether a sentence is the first instance of its claim
+among all earlier sentences of the report, so sentence i resends the i - 1
+sentences before it and the prompt tokens of a report grow quadratically.
+With a bounded history, each sentence is only compared with the earlier
+sentences most likely to restate it:
+1. The sentences of a report are turned into hashed character n-gram
+   TF-IDF vectors once (as in prefilter), and all pairs are scored with one
+   matrix product
+2. The top_k earlier sentences most similar to each sentence are kept
+3. Of those, the most similar are kept while they fit in max_tokens
+   (estimated at four characters per token); the most similar one is kept
+   even if it does not fit, so no sentence loses its whole history
+
+The kept sentences are listed in report order. A restatement that shares
+few words with its original can fall out of the window, so measure the
+agreement with full-history judgments before choosing the settings:
+    report-eval-history data/dev_reports.jsonl --top-k 3 5 10
+or equivalently `python -m report_gen_eval.history ...`.
+"""
+
+import argparse
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .options import EvaluationOptions
+from .prefilter import hashed_ngrams, tfidf_vectors
+from .prompts import FIRST_INSTANCE_SYSTEM, FIRST_INSTANCE_USER
+from .utils import ModelProvider, batch_model_responses, estimate_tokens, load_jsonl
+
+logger = logging.getLogger(__name__)
+
+# Settings compared by the agreement command by default
+DEFAULT_AGREEMENT_TOP_KS = [3, 5, 10]
+DEFAULT_AGREEMENT_MAX_TOKENS = [0]
+
+
+def sentence_tokens(sentence: str) -> int:
+    """Estimate the number of prompt tokens of a sentence in the history."""
+    return len(sentence) // 4 + 1
+
+
+def similarity_matrix(sentences: List[str]) -> np.ndarray:
+    """Score every sentence of a report against every other one.
+
+    Returns:
+        Cosine similarities of shape (len(sentences), len(sentences))
+    """
+    vectors = tfidf_vectors(hashed_ngrams(sentences))
+    return vectors @ vectors.T
+
+
+def select_history(
+    scores: np.ndarray,
+    lengths: Sequence[int],
+    index: int,
+    top_k: int = 0,
+    max_tokens: int = 0,
+) -> List[int]:
+    """Choose the earlier sentences a sentence is compared with.
+
+    Args:
+        scores: The report's similarity matrix
+        lengths: Estimated tokens of each sentence
+        index: Position of the sentence in the report
+        top_k: Keep at most the top_k most similar earlier sentences; 0
+            keeps all of them
+        max_tokens: Keep the most similar sentences while their tokens fit
+            in max_tokens, and always the most similar one; 0 disables the cap
+
+    Returns:
+        Positions of the kept sentences, in report order
+    """
+    if index == 0:
+        return []
+    # Stable sort, so ties keep the earlier sentence first
+    ranked = np.argsort(-scores[index, :index], kind="stable")
+    if top_k > 0:
+        ranked = ranked[:top_k]
+    if max_tokens > 0:
+        kept, used = [], 0
+        for position in ranked:
+            if not kept or used + lengths[position] <= max_tokens:
+                kept.append(int(position))
+                used += lengths[position]
+        return sorted(kept)
+    return sorted(int(position) for position in ranked)
+
+
+def history_windows(
+    sentences: List[str], top_k: int = 0, max_tokens: int = 0
+) -> List[Optional[List[str]]]:
+    """Get the bounded history of each sentence of a report.
+
+    Args:
+        sentences: The sentences of the report
+        top_k: Maximum number of earlier sentences per sentence; 0 disables
+        max_tokens: Maximum estimated tokens of the earlier sentences; 0
+            disables
+
+    Returns:
+        The earlier sentences each sentence is compared with, or None where
+        there are none
+    """
+    if not sentences:
+        return []
+    scores = similarity_matrix(sentences)
+    lengths = [sentence_tokens(sentence) for sentence in sentences]
+    windows = []
+    for index in range(len(sentences)):
+        kept = select_history(scores, lengths, index, top_k, max_tokens)
+        windows.append([sentences[position] for position in kept] or None)
+    return windows
+
+
+def report_history(
+    report: Dict[str, Any], options: Optional[EvaluationOptions] = None
+) -> List[Optional[List[str]]]:
+    """Get the previous sentences of each sentence of a report.
+
+    Args:
+        report: The report, with its sentences
+        options: Optional evaluation options of the run; the history is
+            bounded when first_instance_top_k or first_instance_max_tokens
+            is set, and the counters are updated
+
+    Returns:
+        One list of previous sentences per sentence (None for the first): all
+        earlier sentences when the history is not bounded, otherwise the
+        selected ones
+    """
+    sentences = [sentence["text"] for sentence in report["sentences"]]
+    if options is None or not options.bounded_history:
+        return [sentences[:index] or None for index in range(len(sentences))]
+    windows = history_windows(
+        sentences, options.first_instance_top_k, options.first_instance_max_tokens
+    )
+    lengths = [sentence_tokens(sentence) for sentence in sentences]
+    options.count("history_full_tokens", int(np.cumsum(lengths[:-1]).sum()))
+    options.count(
+        "history_tokens",
+        sum(sentence_tokens(s) for window in windows if window for s in window),
+    )
+    return windows
+
+
+def first_instance_prompt(sentence: str, previous_sentences: List[str]) -> str:
+    """Build the first_instance user prompt of a sentence."""
+    return FIRST_INSTANCE_USER.format(
+        sentence=sentence, previous_sentences="\n".join(previous_sentences)
+    )
+
+
+def agreement(
+    reports: List[Dict[str, Any]],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    top_ks: Sequence[int] = DEFAULT_AGREEMENT_TOP_KS,
+    max_tokens: Sequence[int] = DEFAULT_AGREEMENT_MAX_TOKENS,
+) -> Dict[str, Any]:
+    """Compare bounded-history first_instance judgments with full-history ones.
+
+    Every sentence after the first of every report is judged, an upper
+    bound of what the evaluator sends (which only judges uncited sentences
+    requiring a citation). Prompts whose window holds every earlier
+    sentence are identical to the full-history prompt and share its cached
+    response.
+
+    Args:
+        reports: The reports to compare on
+        provider: The model provider to use
+        model_name: Optional specific model name
+        top_ks: top_k settings to compare
+        max_tokens: max_tokens settings to compare, each combined with
+            every top_k
+
+    Returns:
+        Dictionary with the number of reports, judgments and full-history
+        prompt tokens and first instances, and for each setting the
+        fraction of judgments agreeing with full history, the number of
+        sentences it judges first instances although full history finds a
+        repeat (false_first_instances, which are penalized) or the reverse
+        (false_repeats), and the fraction of prompt tokens sent
+    """
+    settings = [(k, t) for k in top_ks for t in max_tokens]
+    full_prompts, window_prompts = [], [[] for _ in settings]
+    for report in reports:
+        sentences = [sentence["text"] for sentence in report.get("sentences", [])]
+        if len(sentences) < 2:
+            continue
+        scores = similarity_matrix(sentences)
+        lengths = [sentence_tokens(sentence) for sentence in sentences]
+        for index in range(1, len(sentences)):
+            full_prompts.append(first_instance_prompt(sentences[index], sentences[:index]))
+            for prompts, (top_k, cap) in zip(window_prompts, settings):
+                kept = select_history(scores, lengths, index, top_k, cap)
+                prompts.append(
+                    first_instance_prompt(sentences[index], [sentences[p] for p in kept])
+                )
+        logger.info(
+            f"Prepared report {report.get('request_id', 'unknown')}: "
+            f"{len(sentences) - 1} judgments"
+        )
+
+    def judge(prompts: List[str]) -> np.ndarray:
+        responses = batch_model_responses(FIRST_INSTANCE_SYSTEM, prompts, provider, model_name)
+        return np.array([response == "YES" for response in responses], dtype=bool)
+
+    def tokens(prompts: List[str]) -> int:
+        return sum(estimate_tokens(FIRST_INSTANCE_SYSTEM, prompt) for prompt in prompts)
+
+    full = judge(full_prompts)
+    full_tokens = tokens(full_prompts)
+    results = []
+    for prompts, (top_k, cap) in zip(window_prompts, settings):
+        bounded = judge(prompts)
+        results.append(
+            {
+                "top_k": top_k,
+                "max_tokens": cap,
+                "agreement": float((bounded == full).mean()) if len(full) else 1.0,
+                "false_first_instances": int((~full & bounded).sum()),
+                "false_repeats": int((full & ~bounded).sum()),
+                "token_fraction": tokens(prompts) / full_tokens if full_tokens else 0,
+            }
+        )
+
+    return {
+        "reports": sum(1 for report in reports if len(report.get("sentences", [])) > 1),
+        "judgments": len(full_prompts),
+        "prompt_tokens": full_tokens,
+        "first_instances": int(full.sum()),
+        "settings": results,
+    }
+
+
+def main():
+    """Compare bounded-history first_instance judgments with full history."""
+    parser = argparse.ArgumentParser(
+        description="Measure the agreement of bounded first_instance histories with full history"
+    )
+    parser.add_argument("input_file", help="Path to input JSONL file with reports")
+    parser.add_argument(
+        "-p",
+        "--model-provider",
+        choices=["openai", "anthropic", "together", "huggingface"],
+        default="together",
+        help="Model provider to use (default: together)",
+    )
+    parser.add_argument(
+        "-m",
+        "--model-name",
+        help="Specific model name to use (defaults to provider-specific default)",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        nargs="+",
+        default=DEFAULT_AGREEMENT_TOP_KS,
+        help="top_k settings to compare (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        nargs="+",
+        default=DEFAULT_AGREEMENT_MAX_TOKENS,
+        help="Token caps to compare with each top_k; 0 disables (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o", "--output", help="Write the comparison to this JSON file"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    comparison = agreement(
+        load_jsonl(args.input_file),
+        args.model_provider,
+        args.model_name,
+        args.top_k,
+        args.max_tokens,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(comparison, f, indent=2)
+    print(json.dumps(comparison, indent=2))
+
+
+if __name__ == "__main__":
+    main()
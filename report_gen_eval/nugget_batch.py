@@ -0,0 +1,252 @@
+"""Structured multi-answer prompts for nugget agreement.
+
+check_nugget_matches sends one prompt per (nugget, gold answer) pair, and
+each prompt repeats the full few-shot template with the same sentence. In
+batched mode, up to nugget_batch_size answers are judged in one prompt that
+asks for a numbered YES/NO line per answer:
+1. The structured response is parsed; if any item is missing, contradictory
+   or malformed, the whole chunk falls back to single-item prompts
+2. A deterministic sample of chunks (nugget_batch_audit) is also judged item
+   by item, and the agreement of the two modes is counted
+3. Prompt, fallback and agreement counts are kept on the run's
+   EvaluationOptions
+"""
+
+import asyncio
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .options import EvaluationOptions
+from .prompts import (
+    NUGGET_AGREEMENT_BATCH_ITEM,
+    NUGGET_AGREEMENT_BATCH_SYSTEM,
+    NUGGET_AGREEMENT_BATCH_USER,
+    NUGGET_AGREEMENT_SYSTEM,
+    NUGGET_AGREEMENT_USER,
+)
+from .utils import (
+    ModelProvider,
+    abatch_model_responses,
+    aget_model_response,
+    batch_model_responses,
+    get_model_response,
+)
+
+# Completion tokens allowed per item of a structured response ("12: YES\n")
+TOKENS_PER_ITEM = 6
+
+_ITEM_LINE = re.compile(r"^\s*(\d+)\s*[:.)\-]\s*(YES|NO)\b", re.IGNORECASE)
+
+
+def build_batch_prompt(sentence: str, items: List[Dict[str, Any]]) -> str:
+    """Build the structured prompt judging several nugget answers at once.
+
+    Args:
+        sentence: The sentence to check
+        items: Nugget info for each answer, as built by build_nugget_prompts
+
+    Returns:
+        The user prompt, with items numbered from 1
+    """
+    nuggets = "\n".join(
+        NUGGET_AGREEMENT_BATCH_ITEM.format(
+            index=index,
+            nugget_question=item["question_text"],
+            nugget_answer=item["matched_answer"],
+        )
+        for index, item in enumerate(items, 1)
+    )
+    return NUGGET_AGREEMENT_BATCH_USER.format(sentence=sentence, nuggets=nuggets)
+
+
+def batch_params(num_items: int) -> Dict[str, Any]:
+    """Get the decoding parameters of a structured prompt with num_items items."""
+    return {"max_tokens": TOKENS_PER_ITEM * num_items + 10}
+
+
+def parse_batch_response(response: str, num_items: int) -> Optional[List[str]]:
+    """Parse a structured response into one YES/NO answer per item.
+
+    Args:
+        response: The model response
+        num_items: Number of items in the prompt
+
+    Returns:
+        The answers in item order, or None unless every item got exactly one
+        consistent answer
+    """
+    answers: Dict[int, str] = {}
+    for line in response.splitlines():
+        match = _ITEM_LINE.match(line)
+        if not match:
+            continue
+        index, answer = int(match.group(1)), match.group(2).upper()
+        if not 1 <= index <= num_items or answers.get(index, answer) != answer:
+            return None
+        answers[index] = answer
+    if len(answers) != num_items:
+        return None
+    return [answers[index] for index in range(1, num_items + 1)]
+
+
+def single_item_prompts(sentence: str, items: List[Dict[str, Any]]) -> List[str]:
+    """Build the single-item prompts of the given nugget answers."""
+    return [
+        NUGGET_AGREEMENT_USER.format(
+            sentence=sentence,
+            nugget_question=item["question_text"],
+            nugget_answer=item["matched_answer"],
+        )
+        for item in items
+    ]
+
+
+def is_audited(user_prompt: str, fraction: float) -> bool:
+    """Decide deterministically whether a structured prompt is audited."""
+    if fraction <= 0:
+        return False
+    digest = hashlib.sha256(user_prompt.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64 < fraction
+
+
+def chunk_items(items: List[Dict[str, Any]], size: int) -> List[List[Dict[str, Any]]]:
+    """Split items into chunks of at most size items."""
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def settle_chunk(
+    chunk: List[Dict[str, Any]],
+    answers: Optional[List[str]],
+    single: Optional[List[str]],
+    options: EvaluationOptions,
+) -> List[str]:
+    """Choose the answers of a chunk and count the outcome.
+
+    Args:
+        chunk: The items of the structured prompt
+        answers: The parsed structured answers, or None if parsing failed
+        single: The single-item answers, if the chunk fell back or was audited
+        options: The run's evaluation options, whose counters are updated
+
+    Returns:
+        The structured answers, or the single-item answers when parsing failed
+    """
+    options.count("nugget_batch_prompts")
+    options.count("nugget_batch_items", len(chunk))
+    if answers is None:
+        options.count("nugget_batch_fallbacks")
+        return single
+    if single is not None:
+        options.count("nugget_batch_audited_items", len(single))
+        options.count(
+            "nugget_batch_agreements", sum(a == b for a, b in zip(answers, single))
+        )
+    return answers
+
+
+def judge_nuggets_batched(
+    sentence: str,
+    items: List[Dict[str, Any]],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    options: Optional[EvaluationOptions] = None,
+) -> List[str]:
+    """Judge nugget answers for a sentence with structured multi-answer prompts.
+
+    Chunks of nugget_batch_size items are judged concurrently.
+
+    Args:
+        sentence: The sentence to check
+        items: Nugget info for each answer, as built by build_nugget_prompts
+        provider: The model provider to use
+        model_name: Optional specific model name
+        options: The run's evaluation options (nugget_batch_size and
+            nugget_batch_audit)
+
+    Returns:
+        "YES"/"NO" for each item, in item order
+    """
+
+    def judge_chunk(chunk: List[Dict[str, Any]]) -> List[str]:
+        user_prompt = build_batch_prompt(sentence, chunk)
+        try:
+            answers = parse_batch_response(
+                get_model_response(
+                    NUGGET_AGREEMENT_BATCH_SYSTEM,
+                    user_prompt,
+                    provider=provider,
+                    model_name=model_name,
+                    params=batch_params(len(chunk)),
+                    structured=True,
+                ),
+                len(chunk),
+            )
+        except RuntimeError:
+            answers = None
+        single = None
+        if answers is None or is_audited(user_prompt, options.nugget_batch_audit):
+            single = batch_model_responses(
+                NUGGET_AGREEMENT_SYSTEM,
+                single_item_prompts(sentence, chunk),
+                provider,
+                model_name,
+            )
+        return settle_chunk(chunk, answers, single, options)
+
+    chunks = chunk_items(items, options.nugget_batch_size)
+    if len(chunks) == 1:
+        return judge_chunk(chunks[0])
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        return [
+            answer
+            for answers in executor.map(judge_chunk, chunks)
+            for answer in answers
+        ]
+
+
+async def judge_nuggets_batched_async(
+    sentence: str,
+    items: List[Dict[str, Any]],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    options: Optional[EvaluationOptions] = None,
+) -> List[str]:
+    """Asynchronously judge nugget answers with structured multi-answer prompts.
+
+    Async counterpart of judge_nuggets_batched.
+    """
+
+    async def judge_chunk(chunk: List[Dict[str, Any]]) -> List[str]:
+        user_prompt = build_batch_prompt(sentence, chunk)
+        try:
+            answers = parse_batch_response(
+                await aget_model_response(
+                    NUGGET_AGREEMENT_BATCH_SYSTEM,
+                    user_prompt,
+                    provider=provider,
+                    model_name=model_name,
+                    params=batch_params(len(chunk)),
+                    structured=True,
+                ),
+                len(chunk),
+            )
+        except RuntimeError:
+            answers = None
+        single = None
+        if answers is None or is_audited(user_prompt, options.nugget_batch_audit):
+            single = await abatch_model_responses(
+                NUGGET_AGREEMENT_SYSTEM,
+                single_item_prompts(sentence, chunk),
+                provider,
+                model_name,
+            )
+        return settle_chunk(chunk, answers, single, options)
+
+    chunks = chunk_items(items, options.nugget_batch_size)
+    return [
+        answer
+        for answers in await asyncio.gather(*(judge_chunk(c) for c in chunks))
+        for answer in answers
+    ]
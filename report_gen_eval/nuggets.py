@@ -0,0 +1,141 @@
+"""Nugget bank loading and lookup.
+
+This module loads a nuggets file once per run and indexes it, so that every
+report (and every worker thread) can look up its nuggets without rescanning
+and re-parsing the file. It provides:
+1. Indexing of nugget entries by query_id
+2. Indexing by (query_id, src_lang) for the dawn assessor banks, which hold
+   one entry per query and source language
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Collection language suffixes and the src_lang codes used by the nugget banks
+_LANGUAGE_CODES = {"zh": "zho", "fa": "fas", "ru": "rus"}
+
+
+def report_src_lang(report: Dict[str, Any]) -> Optional[str]:
+    """Get the source language of a report from its collection IDs.
+
+    Args:
+        report: The report, with collection_ids such as 'neuclir/1/zh'
+
+    Returns:
+        The three-letter language code (e.g. 'zho'), or None if the report
+        does not have exactly one language
+    """
+    languages = {
+        _LANGUAGE_CODES.get(language, language)
+        for language in (
+            str(collection_id).rstrip("/").split("/")[-1]
+            for collection_id in report.get("collection_ids") or []
+        )
+    }
+    return languages.pop() if len(languages) == 1 else None
+
+
+class NuggetBank:
+    """Read-only, indexed collection of nugget entries.
+
+    The bank is built once and can be shared by every worker of a run. When
+    several entries share a query_id (and src_lang), the first one wins, like
+    the line-by-line scan it replaces.
+
+    Args:
+        entries: Nugget entries, each with query_id and items
+        source: Optional description of where the entries came from
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], source: Optional[str] = None):
+        self.source = source
+        self._by_query: Dict[str, Dict[str, Any]] = {}
+        self._by_query_lang: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for entry in entries:
+            query_id = str(entry["query_id"])
+            self._by_query.setdefault(query_id, entry)
+            src_lang = (entry.get("info") or {}).get("src_lang")
+            if src_lang:
+                self._by_query_lang.setdefault((query_id, src_lang), entry)
+
+    @classmethod
+    def from_file(cls, nuggets_file: str) -> "NuggetBank":
+        """Load and index a nuggets JSONL file.
+
+        Args:
+            nuggets_file: Path to the JSONL file containing evaluation nuggets
+
+        Returns:
+            The indexed nugget bank
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            json.JSONDecodeError: If the file contains invalid JSON
+        """
+        entries = []
+        with open(nuggets_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entries.append(json.loads(line))
+        logger.info(f"Loaded nuggets for {len(entries)} queries from {nuggets_file}")
+        return cls(entries, source=nuggets_file)
+
+    def get_entry(
+        self, query_id: Any, src_lang: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get the nugget entry of a query.
+
+        Args:
+            query_id: The query (request) ID
+            src_lang: Optional source language; entries for that language are
+                preferred over entries without a language match
+
+        Returns:
+            The nugget entry, or None if there is none for the query
+        """
+        query_id = str(query_id)
+        if src_lang is not None:
+            entry = self._by_query_lang.get((query_id, src_lang))
+            if entry is not None:
+                return entry
+        return self._by_query.get(query_id)
+
+    def get(
+        self, query_id: Any, src_lang: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Get the nuggets of a query.
+
+        Args:
+            query_id: The query (request) ID
+            src_lang: Optional source language
+
+        Returns:
+            The list of nuggets (the entry's items), or None if there is no
+            entry for the query
+        """
+        entry = self.get_entry(query_id, src_lang)
+        return entry["items"] if entry is not None else None
+
+    def for_report(self, report: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Get the nuggets of a report, matching its language when possible.
+
+        Args:
+            report: The report, with request_id and collection_ids
+
+        Returns:
+            The list of nuggets, or None if there is no entry for the report
+        """
+        return self.get(report["request_id"], report_src_lang(report))
+
+    def query_ids(self) -> Iterator[str]:
+        """Iterate over the query IDs in the bank."""
+        return iter(self._by_query)
+
+    def __contains__(self, query_id: Any) -> bool:
+        return str(query_id) in self._by_query
+
+    def __len__(self) -> int:
+        return len(self._by_query)
@@ -0,0 +1,128 @@
+"""Run-wide evaluation options and their statistics.
+
+Optional evaluation strategies are opt-in and trade extra model spend or
+approximation for latency. They are configured once per run on an
+EvaluationOptions object that is passed down to every sentence evaluation,
+which also counts what the strategies did so it can be reported in the run
+metrics.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from .cascade import Cascade
+    from .passages import PassageSelector
+
+
+class EvaluationOptions:
+    """Optional evaluation strategies for a run.
+
+    Safe to share between threads and event loops.
+
+    Args:
+        speculative: Issue the independent judgments of an uncited sentence
+            (check_negative, requires_citation, first_instance) at the same
+            time and discard the ones the decision tree does not need
+        nugget_batch_size: Maximum number of nugget answers judged in one
+            structured prompt; 0 or 1 sends one prompt per nugget answer
+        nugget_batch_audit: Fraction of structured nugget prompts whose items
+            are also judged one by one to measure agreement
+        answer_major: Defer the nugget checks of a report's sentences and
+            judge them with one prompt per gold answer listing all candidate
+            sentences (see answer_major)
+        prefilter_top_k: Only judge the top_k nugget answers of each sentence
+            by lexical similarity (see prefilter); 0 disables
+        prefilter_threshold: Also judge the nugget answers at least this
+            similar to a sentence; None disables
+        answer_match: Accept nugget answers a sentence contains literally
+            without a model call (see answer_match)
+        cascade: Optional local models answering the confident
+            check_negative and requires_citation judgments (see cascade)
+        first_instance_top_k: Only list the top_k earlier sentences most
+            similar to a sentence in its first_instance check (see history);
+            0 lists all of them
+        first_instance_max_tokens: Cap on the estimated tokens of the
+            earlier sentences listed in a first_instance check; 0 disables
+        passages: Optional passage selector shortening long cited documents
+            in citation relevance prompts (see passages)
+    """
+
+    def __init__(
+        self,
+        speculative: bool = False,
+        nugget_batch_size: int = 0,
+        nugget_batch_audit: float = 0.0,
+        answer_major: bool = False,
+        prefilter_top_k: int = 0,
+        prefilter_threshold: Optional[float] = None,
+        answer_match: bool = False,
+        cascade: Optional["Cascade"] = None,
+        first_instance_top_k: int = 0,
+        first_instance_max_tokens: int = 0,
+        passages: Optional["PassageSelector"] = None,
+    ):
+        if nugget_batch_size < 0:
+            raise ValueError("Nugget batch size must not be negative")
+        if not 0.0 <= nugget_batch_audit <= 1.0:
+            raise ValueError("Nugget batch audit fraction must be between 0 and 1")
+        if answer_major and nugget_batch_size > 1:
+            raise ValueError("Answer-major judging cannot be combined with nugget batches")
+        if prefilter_top_k < 0:
+            raise ValueError("Prefilter top_k must not be negative")
+        if answer_major and (prefilter_top_k or prefilter_threshold is not None):
+            raise ValueError("Answer-major judging cannot be combined with the prefilter")
+        if first_instance_top_k < 0 or first_instance_max_tokens < 0:
+            raise ValueError("First instance history bounds must not be negative")
+        self.speculative = speculative
+        self.nugget_batch_size = nugget_batch_size
+        self.nugget_batch_audit = nugget_batch_audit
+        self.answer_major = answer_major
+        self.prefilter_top_k = prefilter_top_k
+        self.prefilter_threshold = prefilter_threshold
+        self.answer_match = answer_match
+        self.cascade = cascade
+        self.first_instance_top_k = first_instance_top_k
+        self.first_instance_max_tokens = first_instance_max_tokens
+        self.passages = passages
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    @property
+    def prefilter(self) -> bool:
+        """Whether sentence and nugget answer pairs are prefiltered."""
+        return self.prefilter_top_k > 0 or self.prefilter_threshold is not None
+
+    @property
+    def bounded_history(self) -> bool:
+        """Whether first_instance checks only list some earlier sentences."""
+        return self.first_instance_top_k > 0 or self.first_instance_max_tokens > 0
+
+    def count(self, name: str, amount: int = 1):
+        """Add to one of the run's counters."""
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the enabled strategies and the run's counters."""
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "speculative": self.speculative,
+            "nugget_batch_size": self.nugget_batch_size,
+            "nugget_batch_audit": self.nugget_batch_audit,
+            "answer_major": self.answer_major,
+            "prefilter_top_k": self.prefilter_top_k,
+            "prefilter_threshold": self.prefilter_threshold,
+            "answer_match": self.answer_match,
+            "cascade": self.cascade.describe() if self.cascade is not None else None,
+            "first_instance_top_k": self.first_instance_top_k,
+            "first_instance_max_tokens": self.first_instance_max_tokens,
+            "passages": self.passages.describe() if self.passages is not None else None,
+            "counts": counts,
+        }
+
+
+# Options used when none are given: every strategy disabled. Its counters
+# accumulate over every evaluation of the process that was given no options.
+DEFAULT_OPTIONS = EvaluationOptions()
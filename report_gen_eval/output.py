@@ -0,0 +1,166 @@
+"""Compact, reference-only evaluation output.
+
+Full evaluation results embed the text of every cited document, once per
+citing sentence and again in citation_documents, so result files are
+dominated by copied document text. This module provides a compact output
+mode in which:
+1. Cited documents are recorded by doc_id and the SHA-256 of their text
+2. The deduplicated texts can be exported once per run to a sidecar file
+3. Failure records refer to their report instead of embedding it
+4. Compact results can be expanded again from the sidecar file
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+# Marker stored in compact results
+COMPACT_FORMAT = "compact"
+
+
+def text_sha256(text: str) -> str:
+    """Get the hex SHA-256 digest of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CompactOutput:
+    """Converts report results to the compact format for one run.
+
+    Safe to share between threads. When texts are exported, each distinct
+    document text is kept once for the whole run.
+
+    Args:
+        export_texts: Whether to keep the document texts for a sidecar file
+    """
+
+    def __init__(self, export_texts: bool = False):
+        self.export_texts = export_texts
+        self._lock = threading.Lock()
+        self._documents: Dict[str, Dict[str, Any]] = {}
+
+    def _reference(self, text: str, doc_ids: Dict[str, str]) -> Dict[str, Any]:
+        digest = text_sha256(text)
+        doc_id = doc_ids.get(text)
+        if self.export_texts:
+            with self._lock:
+                self._documents.setdefault(
+                    digest, {"sha256": digest, "doc_id": doc_id, "text": text}
+                )
+        return {"doc_id": doc_id, "sha256": digest}
+
+    def compact(
+        self, result: Dict[str, Any], doc_ids: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Replace the document texts of a report result with references.
+
+        Each sentence's citation_details.citation_texts is replaced by
+        citation_refs, and each citation_documents entry by a reference.
+
+        Args:
+            result: The result returned by evaluate_report (updated in place)
+            doc_ids: Map of citation texts to their doc ids
+
+        Returns:
+            The compact result
+        """
+        doc_ids = doc_ids or {}
+        references: Dict[str, Dict[str, Any]] = {}
+
+        def reference(text: str) -> Dict[str, Any]:
+            if text not in references:
+                references[text] = self._reference(text, doc_ids)
+            return references[text]
+
+        for sentence_result in result.get("sentence_results", []):
+            details = sentence_result.get("citation_details")
+            if details is not None and "citation_texts" in details:
+                details["citation_refs"] = [
+                    reference(text) for text in details.pop("citation_texts")
+                ]
+        result["citation_documents"] = {
+            key: reference(text)
+            for key, text in result.get("citation_documents", {}).items()
+        }
+        result["output_format"] = COMPACT_FORMAT
+        return result
+
+    def documents(self) -> List[Dict[str, Any]]:
+        """Get the exported documents (sha256, doc_id and text), in first-seen order."""
+        with self._lock:
+            return list(self._documents.values())
+
+
+def compact_failure_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the report embedded in a failure record with a reference.
+
+    Args:
+        record: A failed or rejected report record with report_data
+
+    Returns:
+        A copy of the record whose report_data is replaced by report_ref
+        (request_id, run_id, number of sentences and the SHA-256 of the report)
+    """
+    record = dict(record)
+    report = record.pop("report_data", None)
+    if isinstance(report, dict):
+        record["report_ref"] = {
+            "request_id": report.get("request_id"),
+            "run_id": report.get("run_id"),
+            "num_sentences": len(report.get("sentences") or []),
+            "sha256": text_sha256(
+                json.dumps(report, sort_keys=True, ensure_ascii=False)
+            ),
+        }
+    return record
+
+
+def load_documents(path: str) -> Dict[str, str]:
+    """Load a sidecar documents file.
+
+    Args:
+        path: Path to the JSONL file written for a compact run
+
+    Returns:
+        Map of SHA-256 digests to document texts
+    """
+    documents = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                document = json.loads(line)
+                documents[document["sha256"]] = document["text"]
+    return documents
+
+
+def expand_report_result(
+    result: Dict[str, Any], documents: Dict[str, str]
+) -> Dict[str, Any]:
+    """Restore the document texts of a compact report result.
+
+    Args:
+        result: A compact report result
+        documents: Map of SHA-256 digests to texts, from load_documents
+
+    Returns:
+        A copy of the result in the full format
+
+    Raises:
+        KeyError: If a referenced document is missing from documents
+    """
+    if result.get("output_format") != COMPACT_FORMAT:
+        return result
+    result = copy.deepcopy(result)
+    for sentence_result in result.get("sentence_results", []):
+        details = sentence_result.get("citation_details")
+        if details is not None and "citation_refs" in details:
+            details["citation_texts"] = [
+                documents[ref["sha256"]] for ref in details.pop("citation_refs")
+            ]
+    result["citation_documents"] = {
+        key: documents[ref["sha256"]]
+        for key, ref in result.get("citation_documents", {}).items()
+    }
+    del result["output_format"]
+    return result
@@ -0,0 +1,308 @@
+"""Passage selection for long cited documents.
+
+The citation relevance prompt embeds the whole "Title: ...\\n\\nContent: ..."
+text of every cited document, and most NeuCLIR documents are long news
+articles, so relevance judgments dominate the prompt tokens of a run and
+can exceed the context of smaller models. With passage selection, documents
+longer than a token budget are shortened before they are judged:
+1. The content of a document is split into passages of about
+   passage_tokens tokens at paragraph and sentence boundaries
+2. The passages are indexed once per document as sparse hashed character
+   n-gram vectors weighted by TF-IDF over the document (as in prefilter);
+   indexes are kept in a bounded per-run cache, so a document cited by many
+   sentences is split and vectorized once
+3. For each sentence, the passages are scored with one sparse product and
+   the most similar are kept while they fit in the budget; the kept
+   passages are shown in document order under the document's title, with
+   "..." where passages were left out
+
+Passages that share no n-grams with the sentence (e.g. a document in
+another language) tie at zero and are kept in document order, so the lead
+of the article is sent. Token counts are estimated at four characters per
+token.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .options import EvaluationOptions
+from .prefilter import DEFAULT_DIMENSIONS, ngram_buckets
+
+# Default size of a passage, in estimated tokens
+DEFAULT_PASSAGE_TOKENS = 128
+
+# Default number of documents whose passage indexes are kept
+DEFAULT_MAX_DOCUMENTS = 4096
+
+# Separator between passages that were not adjacent in the document
+PASSAGE_GAP = "\n...\n"
+
+_TITLE_CONTENT = re.compile(r"^Title: (.*?)\n\nContent: (.*)$", re.S)
+_PARAGRAPHS = re.compile(r"\n\s*\n|\n")
+_SENTENCES = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])")
+
+
+def text_tokens(text: str) -> int:
+    """Estimate the number of prompt tokens of a text."""
+    return len(text) // 4 + 1
+
+
+def split_document(citation_text: str) -> Tuple[Optional[str], str]:
+    """Split a formatted citation text into its title and content.
+
+    Returns:
+        Tuple of (title, content); the title is None if the text is not in
+        the format of citations.format_citation_text
+    """
+    match = _TITLE_CONTENT.match(citation_text)
+    if match is None:
+        return None, citation_text
+    return match.group(1), match.group(2)
+
+
+def split_passages(content: str, passage_tokens: int = DEFAULT_PASSAGE_TOKENS) -> List[str]:
+    """Split the content of a document into passages.
+
+    Paragraphs and then sentences are packed into passages of at most
+    passage_tokens estimated tokens; a sentence longer than that is cut at
+    word boundaries where possible.
+
+    Args:
+        content: The document content
+        passage_tokens: Maximum estimated tokens of a passage
+
+    Returns:
+        The passages in document order
+    """
+    limit = passage_tokens * 4
+    units = []
+    for paragraph in _PARAGRAPHS.split(content):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= limit:
+            units.append(paragraph)
+            continue
+        for sentence in _SENTENCES.split(paragraph):
+            sentence = sentence.strip()
+            while len(sentence) > limit:
+                cut = sentence.rfind(" ", 0, limit)
+                cut = cut if cut > 0 else limit
+                units.append(sentence[:cut])
+                sentence = sentence[cut:].strip()
+            if sentence:
+                units.append(sentence)
+
+    passages, current = [], ""
+    for unit in units:
+        if current and len(current) + 1 + len(unit) > limit:
+            passages.append(current)
+            current = unit
+        else:
+            current = f"{current} {unit}" if current else unit
+    if current:
+        passages.append(current)
+    return passages
+
+
+class PassageIndex:
+    """The passages of one document and their sparse TF-IDF vectors.
+
+    Args:
+        title: The document title, or None
+        passages: The passages in document order
+        dimensions: Number of hashed features
+    """
+
+    def __init__(self, title: Optional[str], passages: List[str], dimensions: int = DEFAULT_DIMENSIONS):
+        self.title = title
+        self.passages = passages
+        self.dimensions = dimensions
+        self.lengths = np.array([text_tokens(passage) for passage in passages])
+        rows, buckets, counts = [], [], []
+        for row, passage in enumerate(passages):
+            unique, passage_counts = np.unique(
+                ngram_buckets(passage, dimensions), return_counts=True
+            )
+            rows.append(np.full(len(unique), row, dtype=np.int64))
+            buckets.append(unique)
+            counts.append(passage_counts)
+        if passages:
+            self.rows = np.concatenate(rows)
+            self.buckets = np.concatenate(buckets)
+            counts = np.concatenate(counts).astype(np.float64)
+        else:
+            self.rows = self.buckets = np.zeros(0, dtype=np.int64)
+            counts = np.zeros(0)
+        # Document frequencies over the passages, as in prefilter.tfidf_vectors
+        unique, frequencies = np.unique(self.buckets, return_counts=True)
+        idf = np.log((1 + len(passages)) / (1 + frequencies)) + 1
+        weights = np.log1p(counts) * idf[np.searchsorted(unique, self.buckets)]
+        norms = np.sqrt(np.bincount(self.rows, weights=weights**2, minlength=len(passages)))
+        self.weights = weights / np.maximum(norms, 1e-12)[self.rows]
+
+    @classmethod
+    def build(
+        cls,
+        citation_text: str,
+        passage_tokens: int = DEFAULT_PASSAGE_TOKENS,
+        dimensions: int = DEFAULT_DIMENSIONS,
+    ) -> "PassageIndex":
+        """Split and index a formatted citation text."""
+        title, content = split_document(citation_text)
+        return cls(title, split_passages(content, passage_tokens), dimensions)
+
+    def scores(self, sentence: str) -> np.ndarray:
+        """Get the cosine similarity of each passage to a sentence."""
+        buckets, counts = np.unique(
+            ngram_buckets(sentence, self.dimensions), return_counts=True
+        )
+        query = np.zeros(self.dimensions)
+        query[buckets] = np.log1p(counts)
+        query /= max(np.linalg.norm(query), 1e-12)
+        return np.bincount(
+            self.rows, weights=self.weights * query[self.buckets], minlength=len(self.passages)
+        )
+
+    def select(self, sentence: str, budget: int) -> List[int]:
+        """Choose the passages shown for a sentence.
+
+        The most similar passages are kept while their estimated tokens fit
+        in the budget; the most similar one is always kept.
+
+        Returns:
+            Positions of the kept passages, in document order
+        """
+        kept, used = [], 0
+        # Stable sort, so passages with equal scores keep document order
+        for position in np.argsort(-self.scores(sentence), kind="stable"):
+            if kept and used + self.lengths[position] > budget:
+                continue
+            kept.append(int(position))
+            used += self.lengths[position]
+        return sorted(kept)
+
+    def render(self, positions: List[int]) -> str:
+        """Format the kept passages the way a cited document is shown."""
+        parts = []
+        for previous, position in zip([None] + positions, positions):
+            if parts and position != previous + 1:
+                parts.append(PASSAGE_GAP)
+            elif parts:
+                parts.append("\n")
+            parts.append(self.passages[position])
+        content = "".join(parts)
+        if positions and positions[0] > 0:
+            content = f"...\n{content}"
+        if positions and positions[-1] < len(self.passages) - 1:
+            content = f"{content}\n..."
+        if self.title is None:
+            return content
+        return f"Title: {self.title}\n\nContent: {content}"
+
+
+class PassageSelector:
+    """Shortens long cited documents to the passages relevant to a sentence.
+
+    Safe to share between threads. Passage indexes are cached per document
+    text, evicting the least recently used beyond max_documents.
+
+    Args:
+        budget: Maximum estimated tokens of the passages shown of a long
+            document; documents shorter than that are shown whole
+        passage_tokens: Size of a passage, in estimated tokens
+        max_documents: Number of passage indexes kept
+    """
+
+    def __init__(
+        self,
+        budget: int,
+        passage_tokens: int = DEFAULT_PASSAGE_TOKENS,
+        max_documents: int = DEFAULT_MAX_DOCUMENTS,
+    ):
+        if budget <= 0:
+            raise ValueError("Passage budget must be positive")
+        if passage_tokens <= 0:
+            raise ValueError("Passage size must be positive")
+        self.budget = budget
+        self.passage_tokens = passage_tokens
+        self.max_documents = max_documents
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[str, PassageIndex]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def index(self, citation_text: str) -> PassageIndex:
+        """Get the passage index of a document, building it on first use."""
+        with self._lock:
+            index = self._indexes.get(citation_text)
+            if index is not None:
+                self._indexes.move_to_end(citation_text)
+                self._hits += 1
+                return index
+            self._misses += 1
+        # Built outside the lock; a concurrent duplicate build is harmless
+        index = PassageIndex.build(citation_text, self.passage_tokens)
+        with self._lock:
+            self._indexes[citation_text] = index
+            while len(self._indexes) > self.max_documents:
+                self._indexes.popitem(last=False)
+        return index
+
+    def select(self, sentence: str, citation_text: str) -> str:
+        """Get the text of a cited document shown with a sentence.
+
+        Returns:
+            The citation text itself if it fits in the budget, otherwise the
+            passages most similar to the sentence
+        """
+        if text_tokens(citation_text) <= self.budget:
+            return citation_text
+        index = self.index(citation_text)
+        if not index.passages:
+            return citation_text
+        return index.render(index.select(sentence, self.budget))
+
+    def describe(self) -> Dict[str, Any]:
+        """Describe the settings and the index cache, for the run metrics."""
+        with self._lock:
+            return {
+                "budget": self.budget,
+                "passage_tokens": self.passage_tokens,
+                "indexed_documents": len(self._indexes),
+                "index_hits": self._hits,
+                "index_misses": self._misses,
+            }
+
+
+def citation_passages(
+    sentence: str,
+    citation_texts: List[str],
+    options: Optional[EvaluationOptions] = None,
+) -> List[str]:
+    """Get the texts of the cited documents shown in relevance prompts.
+
+    Args:
+        sentence: The citing sentence
+        citation_texts: The formatted texts of the cited documents
+        options: Optional evaluation options of the run; documents are only
+            shortened with a passage selector, and the counters are updated
+
+    Returns:
+        One text per citation, in citation order
+    """
+    if options is None or options.passages is None:
+        return citation_texts
+    texts = [options.passages.select(sentence, text) for text in citation_texts]
+    options.count("passage_documents", len(texts))
+    options.count(
+        "passage_shortened",
+        sum(text is not original for text, original in zip(texts, citation_texts)),
+    )
+    options.count("passage_full_tokens", sum(text_tokens(text) for text in citation_texts))
+    options.count("passage_tokens", sum(text_tokens(text) for text in texts))
+    return texts
@@ -0,0 +1,386 @@
+"""Lexical prefilter of sentence and nugget answer pairs.
+
+check_nugget_matches judges every gold answer of a topic against every
+candidate sentence, although most pairs are obviously unrelated (a sentence
+about lumber prices against "How does Australia perceive itself?"). The
+prefilter scores all pairs of a report before any judgment is made:
+1. Sentences and nugget question+answer texts are turned into hashed
+   character n-gram vectors, weighted by TF-IDF over the report
+2. All pairs are scored with one matrix product of the normalized vectors
+3. Only the top-k answers of each sentence and the pairs above a similarity
+   threshold are kept; the nuggets passed to each sentence keep only those
+   answers, so the other pairs are never sent to the model
+
+Pruning can lose matches, so measure the recall lost against full judging
+before choosing the settings:
+    report-eval-prefilter data/dev_reports.jsonl data/dev_nuggets.jsonl
+or equivalently `python -m report_gen_eval.prefilter ...`.
+"""
+
+import argparse
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .nugget_batch import single_item_prompts
+from .nuggets import NuggetBank
+from .options import EvaluationOptions
+from .prompts import NUGGET_AGREEMENT_SYSTEM
+from .utils import ModelProvider, batch_model_responses, load_jsonl
+
+logger = logging.getLogger(__name__)
+
+# Number of hashed n-gram features
+DEFAULT_DIMENSIONS = 2**14
+
+# Character n-gram sizes
+NGRAM_SIZES = (3, 4, 5)
+
+# Settings compared by the calibration command by default
+DEFAULT_CALIBRATION_TOP_KS = [3, 5, 10, 20]
+DEFAULT_CALIBRATION_THRESHOLDS = [0.05, 0.1, 0.15, 0.2]
+
+_BASE = np.uint64(257)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase a text and collapse everything but letters and digits to spaces."""
+    words = "".join(c if c.isalnum() else " " for c in text.lower()).split()
+    return f" {' '.join(words)} "
+
+
+def ngram_buckets(text: str, dimensions: int = DEFAULT_DIMENSIONS) -> np.ndarray:
+    """Hash the character n-grams of a text into feature buckets.
+
+    The n-grams are hashed with a rolling polynomial hash over the UTF-8
+    bytes of the normalized text, computed for all positions at once.
+
+    Args:
+        text: The text to hash
+        dimensions: Number of hashed features
+
+    Returns:
+        The bucket of every n-gram occurrence
+    """
+    data = np.frombuffer(normalize_text(text).encode("utf-8"), dtype=np.uint8)
+    data = data.astype(np.uint64)
+    buckets = []
+    for size in NGRAM_SIZES:
+        if len(data) < size:
+            continue
+        windows = np.lib.stride_tricks.sliding_window_view(data, size)
+        powers = _BASE ** np.arange(size - 1, -1, -1, dtype=np.uint64)
+        hashes = (windows * powers).sum(axis=1) + np.uint64(size)
+        buckets.append(((hashes * _MIX) >> np.uint64(32)) % np.uint64(dimensions))
+    if not buckets:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(buckets).astype(np.int64)
+
+
+def hashed_ngrams(texts: Sequence[str], dimensions: int = DEFAULT_DIMENSIONS) -> np.ndarray:
+    """Count the hashed character n-grams of texts.
+
+    Args:
+        texts: The texts to vectorize
+        dimensions: Number of hashed features
+
+    Returns:
+        Array of shape (len(texts), dimensions) with n-gram counts
+    """
+    counts = np.zeros((len(texts), dimensions), dtype=np.float32)
+    for row, text in enumerate(texts):
+        counts[row] = np.bincount(ngram_buckets(text, dimensions), minlength=dimensions)
+    return counts
+
+
+def tfidf_vectors(counts: np.ndarray) -> np.ndarray:
+    """Weight n-gram counts by sublinear TF-IDF and normalize each row.
+
+    Args:
+        counts: N-gram counts, one row per text; document frequencies are
+            computed over these rows
+
+    Returns:
+        Array of the same shape with unit-length rows (all-zero rows stay zero)
+    """
+    frequencies = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(counts)) / (1 + frequencies)) + 1
+    weights = np.log1p(counts) * idf.astype(np.float32)
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return weights / np.maximum(norms, 1e-12)
+
+
+def answer_text(answer: Union[str, Dict[str, Any]]) -> str:
+    """Get the text of a gold answer.
+
+    Answers are dictionaries with the answer and its citations, except in
+    older nugget files (such as data/dev_nuggets.jsonl) where they are
+    plain strings.
+    """
+    return answer if isinstance(answer, str) else answer["answer"]
+
+
+def nugget_items(nuggets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """List the (nugget, gold answer) pairs of a topic in judging order.
+
+    Returns:
+        One dictionary per gold answer with the nugget and answer positions,
+        question_text and matched_answer
+    """
+    return [
+        {
+            "nugget": nugget_index,
+            "answer": answer_index,
+            "question_text": nugget["question_text"],
+            "matched_answer": answer_text(answer),
+        }
+        for nugget_index, nugget in enumerate(nuggets)
+        for answer_index, answer in enumerate(nugget["gold_answers"])
+    ]
+
+
+def score_pairs(sentences: List[str], items: List[Dict[str, Any]]) -> np.ndarray:
+    """Score every sentence against every nugget answer.
+
+    Args:
+        sentences: The sentences of a report
+        items: The nugget answers, from nugget_items
+
+    Returns:
+        Cosine similarities of shape (len(sentences), len(items))
+    """
+    texts = sentences + [
+        f"{item['question_text']} {item['matched_answer']}" for item in items
+    ]
+    vectors = tfidf_vectors(hashed_ngrams(texts))
+    return vectors[: len(sentences)] @ vectors[len(sentences) :].T
+
+
+def select_pairs(
+    scores: np.ndarray, top_k: int = 0, threshold: Optional[float] = None
+) -> np.ndarray:
+    """Choose the pairs sent to the model.
+
+    Args:
+        scores: Pair scores, one row per sentence
+        top_k: Keep the top_k best scoring answers of each sentence
+        threshold: Keep the pairs scoring at least this much
+
+    Returns:
+        Boolean mask of the kept pairs, of the same shape as scores
+    """
+    keep = np.zeros(scores.shape, dtype=bool)
+    if threshold is not None:
+        keep |= scores >= threshold
+    if top_k > 0 and scores.size:
+        k = min(top_k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        np.put_along_axis(keep, top, True, axis=1)
+    return keep
+
+
+def prune_nuggets(
+    nuggets: List[Dict[str, Any]], items: List[Dict[str, Any]], keep: np.ndarray
+) -> List[Dict[str, Any]]:
+    """Copy the nuggets, keeping only the gold answers of the kept pairs.
+
+    Nuggets without kept answers stay in the list with no gold answers, so a
+    sentence still goes through the nugget check (a negative sentence without
+    any match is penalized) without sending prompts for them.
+
+    Args:
+        nuggets: The nuggets of the report
+        items: The nugget answers, from nugget_items
+        keep: Mask of the kept answers for one sentence
+
+    Returns:
+        The pruned nuggets
+    """
+    kept = [[] for _ in nuggets]
+    for item, kept_item in zip(items, keep):
+        if kept_item:
+            kept[item["nugget"]].append(nuggets[item["nugget"]]["gold_answers"][item["answer"]])
+    return [dict(nugget, gold_answers=answers) for nugget, answers in zip(nuggets, kept)]
+
+
+def prefilter_report(
+    report: Dict[str, Any],
+    nuggets: Optional[List[Dict[str, Any]]],
+    options: Optional[EvaluationOptions] = None,
+) -> List[Optional[List[Dict[str, Any]]]]:
+    """Get the nuggets each sentence of a report is judged against.
+
+    Args:
+        report: The report, with its sentences
+        nuggets: The nuggets of the report
+        options: Optional evaluation options of the run; the prefilter is
+            applied when prefilter_top_k or prefilter_threshold is set
+
+    Returns:
+        One list of nuggets per sentence: the report's nuggets when the
+        prefilter is disabled, otherwise pruned copies
+    """
+    sentences = [sentence["text"] for sentence in report["sentences"]]
+    if not nuggets or options is None or not options.prefilter:
+        return [nuggets] * len(sentences)
+    items = nugget_items(nuggets)
+    keep = select_pairs(
+        score_pairs(sentences, items),
+        options.prefilter_top_k,
+        options.prefilter_threshold,
+    )
+    options.count("prefilter_pairs", int(keep.size))
+    options.count("prefilter_kept", int(keep.sum()))
+    return [prune_nuggets(nuggets, items, row) for row in keep]
+
+
+def calibrate(
+    reports: List[Dict[str, Any]],
+    nuggets_file: Union[str, NuggetBank],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    top_ks: Sequence[int] = DEFAULT_CALIBRATION_TOP_KS,
+    thresholds: Sequence[float] = DEFAULT_CALIBRATION_THRESHOLDS,
+) -> Dict[str, Any]:
+    """Measure the matches lost by prefilter settings against full judging.
+
+    Every sentence of every report is judged against every gold answer of
+    its topic, an upper bound of what the evaluator sends. Each setting is
+    then scored on the same judgments, without further model calls.
+
+    Args:
+        reports: The reports to calibrate on
+        nuggets_file: Path to the nuggets file, or a NuggetBank
+        provider: The model provider to use
+        model_name: Optional specific model name
+        top_ks: top_k settings to compare, each without a threshold
+        thresholds: threshold settings to compare, each without top_k
+
+    Returns:
+        Dictionary with the number of reports, pairs and matched pairs, and
+        for each setting the fraction of pairs kept, of matched pairs kept
+        (pair_recall), of matched answers still matched (answer_recall), and
+        the mean report recall with and without the prefilter
+    """
+    bank = nuggets_file if isinstance(nuggets_file, NuggetBank) else NuggetBank.from_file(nuggets_file)
+    judged = []
+    for report in reports:
+        nuggets = bank.for_report(report)
+        if not nuggets or not report.get("sentences"):
+            continue
+        sentences = [sentence["text"] for sentence in report["sentences"]]
+        items = nugget_items(nuggets)
+        if not items:
+            continue
+        prompts = [
+            prompt for sentence in sentences for prompt in single_item_prompts(sentence, items)
+        ]
+        responses = batch_model_responses(
+            NUGGET_AGREEMENT_SYSTEM, prompts, provider, model_name
+        )
+        matches = np.array([response == "YES" for response in responses]).reshape(
+            len(sentences), len(items)
+        )
+        judged.append((score_pairs(sentences, items), matches))
+        logger.info(
+            f"Judged report {report['request_id']}: {len(sentences)} sentences, "
+            f"{len(items)} answers, {int(matches.sum())} matches"
+        )
+
+    pairs = sum(matches.size for _, matches in judged)
+    matched_pairs = sum(int(matches.sum()) for _, matches in judged)
+    matched_answers = sum(int(matches.any(axis=0).sum()) for _, matches in judged)
+    full_recall = [matches.any(axis=0).mean() for _, matches in judged]
+
+    settings = []
+    for top_k, threshold in [(k, None) for k in top_ks] + [(0, t) for t in thresholds]:
+        kept = kept_matches = kept_answers = 0
+        recall = []
+        for scores, matches in judged:
+            keep = select_pairs(scores, top_k, threshold)
+            kept += int(keep.sum())
+            kept_matches += int((keep & matches).sum())
+            still_matched = (keep & matches).any(axis=0)
+            kept_answers += int(still_matched.sum())
+            recall.append(still_matched.mean())
+        settings.append(
+            {
+                "top_k": top_k,
+                "threshold": threshold,
+                "kept_fraction": kept / pairs if pairs else 0,
+                "pair_recall": kept_matches / matched_pairs if matched_pairs else 1.0,
+                "answer_recall": kept_answers / matched_answers if matched_answers else 1.0,
+                "mean_report_recall": float(np.mean(recall)) if recall else 0,
+            }
+        )
+
+    return {
+        "reports": len(judged),
+        "pairs": pairs,
+        "matched_pairs": matched_pairs,
+        "matched_answers": matched_answers,
+        "mean_report_recall": float(np.mean(full_recall)) if full_recall else 0,
+        "settings": settings,
+    }
+
+
+def main():
+    """Calibrate the prefilter against full judging."""
+    parser = argparse.ArgumentParser(
+        description="Measure the recall lost by nugget prefilter settings"
+    )
+    parser.add_argument("input_file", help="Path to input JSONL file with reports")
+    parser.add_argument("nuggets_file", help="Path to nuggets file")
+    parser.add_argument(
+        "-p",
+        "--model-provider",
+        choices=["openai", "anthropic", "together", "huggingface"],
+        default="together",
+        help="Model provider to use (default: together)",
+    )
+    parser.add_argument(
+        "-m",
+        "--model-name",
+        help="Specific model name to use (defaults to provider-specific default)",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        nargs="+",
+        default=DEFAULT_CALIBRATION_TOP_KS,
+        help="top_k settings to compare (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        nargs="+",
+        default=DEFAULT_CALIBRATION_THRESHOLDS,
+        help="Similarity thresholds to compare (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o", "--output", help="Write the calibration to this JSON file"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    calibration = calibrate(
+        load_jsonl(args.input_file),
+        args.nuggets_file,
+        args.model_provider,
+        args.model_name,
+        args.top_k,
+        args.threshold,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(calibration, f, indent=2)
+    print(json.dumps(calibration, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,17 @@ from .check_negative import SYSTEM_PROMPT as CHECK_NEGATIVE_SYSTEM, USER_PROMPT
 from .requires_citation import SYSTEM_PROMPT as REQUIRES_CITATION_SYSTEM, USER_PROMPT as REQUIRES_CITATION_USER
 from .first_instance import SYSTEM_PROMPT as FIRST_INSTANCE_SYSTEM, USER_PROMPT as FIRST_INSTANCE_USER
 from .nugget_agreement import SYSTEM_PROMPT as NUGGET_AGREEMENT_SYSTEM, USER_PROMPT as NUGGET_AGREEMENT_USER
+from .nugget_agreement_batch import SYSTEM_PROMPT as NUGGET_AGREEMENT_BATCH_SYSTEM, \
+    USER_PROMPT as NUGGET_AGREEMENT_BATCH_USER, ITEM_PROMPT as NUGGET_AGREEMENT_BATCH_ITEM
+from .nugget_support import SYSTEM_PROMPT as NUGGET_SUPPORT_SYSTEM, \
+    USER_PROMPT as NUGGET_SUPPORT_USER, ITEM_PROMPT as NUGGET_SUPPORT_ITEM
 
 __all__ = [
     "CHECK_RELEVANCE_SYSTEM", "CHECK_RELEVANCE_USER",
     "CHECK_NEGATIVE_SYSTEM", "CHECK_NEGATIVE_USER",
     "REQUIRES_CITATION_SYSTEM", "REQUIRES_CITATION_USER",
     "FIRST_INSTANCE_SYSTEM", "FIRST_INSTANCE_USER",
-    "NUGGET_AGREEMENT_SYSTEM", "NUGGET_AGREEMENT_USER"
+    "NUGGET_AGREEMENT_SYSTEM", "NUGGET_AGREEMENT_USER",
+    "NUGGET_AGREEMENT_BATCH_SYSTEM", "NUGGET_AGREEMENT_BATCH_USER", "NUGGET_AGREEMENT_BATCH_ITEM",
+    "NUGGET_SUPPORT_SYSTEM", "NUGGET_SUPPORT_USER", "NUGGET_SUPPORT_ITEM"
 ] 
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""Prompt for checking if a sentence agrees with several information nuggets at once."""
+
+SYSTEM_PROMPT = """You are an expert at determining if statements agree with given information.
+Your task is to determine, for each numbered information nugget, if a sentence's claims align with it.
+Consider:
+1. Core meaning and implications
+2. Factual consistency
+3. Semantic equivalence
+4. Logical entailment
+5. Scope of claims
+6. Contextual meaning
+7. Direct vs indirect agreement
+8. Quantitative precision
+
+Judge every nugget on its own. Respond with ONLY one line per nugget, in order,
+in the form '<number>: YES' or '<number>: NO'."""
+
+USER_PROMPT = """Does the sentence agree with each information nugget?
+
+Example:
+Sentence: The new method improved efficiency by 40% but failed to generalize to new datasets.
+Nuggets:
+1. Question: How much did the approach increase performance?
+   Answer: 40%
+2. Question: How did the method perform on unseen data?
+   Answer: It worked well
+3. Question: How did the method perform on unseen data?
+   Answer: It did not generalize
+Answers:
+1: YES
+2: NO
+3: YES
+
+Sentence: {sentence}
+Nuggets:
+{nuggets}
+Answers:"""
+
+# Format of one nugget in USER_PROMPT
+ITEM_PROMPT = """{index}. Question: {nugget_question}
+   Answer: {nugget_answer}"""
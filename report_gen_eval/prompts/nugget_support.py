@@ -0,0 +1,36 @@
+"""Prompt for finding which sentences of a report agree with an information nugget."""
+
+SYSTEM_PROMPT = """You are an expert at determining if statements agree with given information.
+Your task is to determine which of the numbered sentences of a report have claims that align with a provided information nugget.
+Consider:
+1. Core meaning and implications
+2. Factual consistency
+3. Semantic equivalence
+4. Logical entailment
+5. Scope of claims
+6. Contextual meaning
+7. Direct vs indirect agreement
+8. Quantitative precision
+
+Judge every sentence on its own. Respond with ONLY the numbers of the sentences
+that agree, separated by commas, or 'NONE' if no sentence agrees."""
+
+USER_PROMPT = """Which sentences agree with the information nugget?
+
+Example:
+Question: How did the method perform on unseen data?
+Answer: It did not generalize
+Sentences:
+1. The new method improved efficiency by 40%.
+2. The algorithm failed to generalize to new datasets.
+3. Results on held-out data were poor.
+Agreeing sentences: 2, 3
+
+Question: {nugget_question}
+Answer: {nugget_answer}
+Sentences:
+{sentences}
+Agreeing sentences:"""
+
+# Format of one sentence in USER_PROMPT
+ITEM_PROMPT = """{index}. {sentence}"""
@@ -0,0 +1,412 @@
+"""Rate limiting for model provider calls.
+
+This module paces requests to the model providers so that concurrent
+judgments stay under a provider's quota instead of relying on fixed sleeps.
+It provides:
+1. A thread-safe token bucket usable from threads and asyncio
+2. One shared limiter per (provider, model) for requests and tokens per minute
+3. Feedback from provider rate limit headers and Retry-After
+"""
+
+import asyncio
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Callers
+    reserve tokens up front and are told how long to wait, so waiting callers
+    are served in the order they arrived.
+
+    Args:
+        rate: Tokens added per second, or None for an unlimited bucket
+        capacity: Maximum burst size (defaults to one second of tokens)
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate or 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if self.rate is not None:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+        self._updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take tokens from the bucket.
+
+        Args:
+            amount: Number of tokens to take
+
+        Returns:
+            Number of seconds the caller must wait before proceeding
+        """
+        if self.rate is None:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self, amount: float):
+        """Return tokens to the bucket (or take more, if amount is negative).
+
+        Args:
+            amount: Number of tokens to return
+        """
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def cap(self, amount: float):
+        """Make sure the bucket holds no more than a number of tokens.
+
+        Args:
+            amount: Maximum number of tokens currently available
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, amount)
+
+    def set_rate(self, rate: Optional[float], capacity: Optional[float] = None):
+        """Change the refill rate of the bucket.
+
+        Args:
+            rate: Tokens added per second, or None for an unlimited bucket
+            capacity: Maximum burst size (defaults to one second of tokens)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = capacity if capacity is not None else max(1.0, rate or 1.0)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def acquire(self, amount: float = 1.0):
+        """Take tokens from the bucket, sleeping until they are available.
+
+        Args:
+            amount: Number of tokens to take
+        """
+        delay = self.reserve(amount)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, amount: float = 1.0):
+        """Take tokens from the bucket, awaiting until they are available.
+
+        Args:
+            amount: Number of tokens to take
+        """
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def parse_duration(value: Any) -> Optional[float]:
+    """Parse a rate limit reset or Retry-After header value into seconds.
+
+    Accepts plain seconds ("2", "0.5"), Go-style durations used by OpenAI
+    ("6m0s", "20ms", "1h2m3.5s") and HTTP or ISO 8601 dates.
+
+    Args:
+        value: The header value
+
+    Returns:
+        Number of seconds from now, or None if the value cannot be parsed
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Header names reporting the remaining quota and its reset time, per provider
+_REQUEST_HEADERS = (
+    ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),  # OpenAI
+    ("anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+    ("x-ratelimit-remaining", "x-ratelimit-reset"),  # Together
+)
+_TOKEN_HEADERS = (
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),  # OpenAI
+    ("anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-tokens-reset"),
+    ("x-tokenlimit-remaining", None),  # Together
+)
+# Header names advertising per-minute limits
+_REQUEST_LIMIT_HEADERS = (
+    "x-ratelimit-limit-requests",
+    "anthropic-ratelimit-requests-limit",
+)
+_TOKEN_LIMIT_HEADERS = (
+    "x-ratelimit-limit-tokens",
+    "anthropic-ratelimit-tokens-limit",
+)
+
+
+class ProviderRateLimiter:
+    """Rate limiter shared by every call to one provider and model.
+
+    Requests and tokens are paced by two token buckets. The buckets are also
+    fed by the rate limit headers returned by the provider: the remaining
+    quota caps what the buckets hand out, an exhausted quota or a Retry-After
+    blocks every caller until the reset time, and advertised limits are used
+    when no limit was configured.
+
+    Args:
+        requests_per_minute: Optional maximum number of requests per minute
+        tokens_per_minute: Optional maximum number of tokens per minute
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ):
+        self._lock = threading.Lock()
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = TokenBucket(
+            requests_per_minute / 60.0 if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(
+            tokens_per_minute / 60.0 if tokens_per_minute else None,
+            capacity=tokens_per_minute / 60.0 if tokens_per_minute else None,
+        )
+        self._blocked_until = 0.0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._rate_limited = 0
+
+    def reserve(self, tokens: float = 0) -> float:
+        """Reserve one request and an estimated number of tokens.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+
+        Returns:
+            Number of seconds the caller must wait before sending the request
+        """
+        delay = max(self.requests.reserve(1), self.tokens.reserve(tokens) if tokens else 0)
+        with self._lock:
+            delay = max(delay, self._blocked_until - time.monotonic())
+            if delay > 0:
+                self._waits += 1
+                self._wait_time += delay
+        return max(0.0, delay)
+
+    def acquire(self, tokens: float = 0):
+        """Block until a request may be sent.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 0):
+        """Wait until a request may be sent without blocking the event loop.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def refund(self, tokens: float = 0):
+        """Return the reservation of a request that was never sent.
+
+        Args:
+            tokens: Estimated number of tokens that were reserved
+        """
+        if self.requests.rate is not None:
+            self.requests.refund(1)
+        if tokens and self.tokens.rate is not None:
+            self.tokens.refund(tokens)
+
+    def block_for(self, seconds: float):
+        """Hold back every caller for a number of seconds.
+
+        Args:
+            seconds: How long no request may be sent
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def record_usage(self, estimated_tokens: float, actual_tokens: Optional[float]):
+        """Correct the token bucket once the real token usage of a request is known.
+
+        Args:
+            estimated_tokens: Number of tokens reserved for the request
+            actual_tokens: Number of tokens the provider reported, if any
+        """
+        if actual_tokens is not None and self.tokens.rate is not None:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+
+    def update_from_headers(self, headers: Optional[Mapping[str, Any]]):
+        """Feed the limiter with the rate limit headers of a provider response.
+
+        Args:
+            headers: Response headers (case-insensitive names)
+        """
+        if not headers:
+            return
+        headers = {str(name).lower(): value for name, value in headers.items()}
+
+        retry_after = parse_duration(headers.get("retry-after"))
+        if retry_after:
+            self.block_for(retry_after)
+
+        self._learn_limit(headers, _REQUEST_LIMIT_HEADERS, self.requests, "requests_per_minute")
+        self._learn_limit(headers, _TOKEN_LIMIT_HEADERS, self.tokens, "tokens_per_minute")
+        self._apply_remaining(headers, _REQUEST_HEADERS, self.requests)
+        self._apply_remaining(headers, _TOKEN_HEADERS, self.tokens)
+
+    def record_rate_limited(self, headers: Optional[Mapping[str, Any]] = None):
+        """Record a rate limit (429) error returned by the provider.
+
+        Args:
+            headers: Headers of the error response, if available
+        """
+        with self._lock:
+            self._rate_limited += 1
+        self.update_from_headers(headers)
+
+    def _learn_limit(self, headers, names, bucket: TokenBucket, attribute: str):
+        if getattr(self, attribute) is not None:
+            return
+        for name in names:
+            try:
+                limit = float(headers[name])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if limit > 0:
+                bucket.set_rate(limit / 60.0)
+                setattr(self, attribute, limit)
+            return
+
+    def _apply_remaining(self, headers, names, bucket: TokenBucket):
+        for remaining_name, reset_name in names:
+            try:
+                remaining = float(headers[remaining_name])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if remaining <= 0:
+                reset = parse_duration(headers.get(reset_name)) if reset_name else None
+                self.block_for(reset if reset is not None else 1.0)
+            bucket.cap(remaining)
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter statistics.
+
+        Returns:
+            Dictionary with the configured or learned limits, the number of
+            waits, the total time waited and the number of 429 responses
+        """
+        with self._lock:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "waits": self._waits,
+                "wait_time": self._wait_time,
+                "rate_limited": self._rate_limited,
+            }
+
+
+_limits: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+_limiters: Dict[Tuple[str, Optional[str]], ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def configure_rate_limits(
+    provider: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+):
+    """Set the rate limits for every model of a provider.
+
+    Args:
+        provider: The model provider
+        requests_per_minute: Maximum number of requests per minute, or None to
+            rely on the limits advertised by the provider
+        tokens_per_minute: Maximum number of tokens per minute, or None to
+            rely on the limits advertised by the provider
+    """
+    with _limiters_lock:
+        _limits[provider] = (requests_per_minute, tokens_per_minute)
+        for key in [key for key in _limiters if key[0] == provider]:
+            del _limiters[key]
+
+
+def get_rate_limiter(provider: str, model_name: Optional[str] = None) -> ProviderRateLimiter:
+    """Get the process-wide rate limiter for a provider and model.
+
+    Args:
+        provider: The model provider
+        model_name: The model name
+
+    Returns:
+        The limiter shared by every caller using this provider and model
+    """
+    key = (provider, model_name)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = ProviderRateLimiter(*_limits.get(provider, (None, None)))
+            _limiters[key] = limiter
+        return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Get the statistics of every shared rate limiter.
+
+    Returns:
+        Dictionary mapping "provider/model" to the limiter statistics
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {
+        f"{provider}/{model_name}": limiter.stats()
+        for (provider, model_name), limiter in limiters.items()
+    }
+
+
+def reset_rate_limiters():
+    """Drop every configured limit and shared limiter."""
+    with _limiters_lock:
+        _limits.clear()
+        _limiters.clear()
@@ -0,0 +1,314 @@
+"""Routing of cited document IDs to the collection that holds them.
+
+A report can list several collections, and a cited document used to be
+looked up in each of them in turn until one had it. With lazily loaded
+collections every miss is a real lookup and may load a collection that is
+never needed. This module keeps a Bloom filter of the document IDs of each
+collection, so a citation is only looked up where it can be:
+1. Filters are built once from the document stores (or the doc_mapping
+   pickles) and saved next to them
+2. Filters are loaded lazily, one per collection, and shared by all threads
+3. Collections without a filter are always kept as candidates
+
+Build the filters once with:
+    report-eval-routing neuclir-docs-lookup
+or equivalently `python -m report_gen_eval.routing neuclir-docs-lookup`.
+"""
+
+import argparse
+import hashlib
+import logging
+import math
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from .docstore import (
+    DOCS_LOOKUP_DIR,
+    INDEX_FILE,
+    mapping_path,
+    normalize_collection,
+    store_path,
+)
+
+logger = logging.getLogger(__name__)
+
+# Target false positive rate of the filters
+DEFAULT_ERROR_RATE = 0.001
+
+_HEADER = struct.Struct("<4sQII")
+_MAGIC = b"RGEB"
+
+
+def filter_path(collection: str, lookup_dir: str = DOCS_LOOKUP_DIR) -> str:
+    """Get the path of the Bloom filter of a collection."""
+    return os.path.join(lookup_dir, f"doc_bloom_{collection.replace('/', '_')}.bin")
+
+
+class BloomFilter:
+    """Bloom filter over document IDs.
+
+    Args:
+        num_bits: Size of the bit array
+        num_hashes: Number of bit positions per document ID
+        bits: Optional initial bit array
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None):
+        self.num_bits = max(num_bits, 8)
+        self.num_hashes = max(num_hashes, 1)
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    @classmethod
+    def for_capacity(
+        cls, capacity: int, error_rate: float = DEFAULT_ERROR_RATE
+    ) -> "BloomFilter":
+        """Create a filter sized for a number of document IDs.
+
+        Args:
+            capacity: Expected number of document IDs
+            error_rate: Target false positive rate
+
+        Returns:
+            An empty filter
+        """
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        num_hashes = round(num_bits / capacity * math.log(2))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, doc_id: str) -> Iterable[int]:
+        digest = hashlib.blake2b(str(doc_id).encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, doc_id: str):
+        """Add a document ID to the filter."""
+        for position in self._positions(doc_id):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, doc_id: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(doc_id)
+        )
+
+    def save(self, path: str):
+        """Write the filter to a file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.count))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """Read a filter written by save.
+
+        Raises:
+            ValueError: If the file is not a Bloom filter
+        """
+        with open(path, "rb") as f:
+            magic, num_bits, num_hashes, count = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"Not a document routing filter: {path}")
+            bloom = cls(num_bits, num_hashes, bytearray(f.read()))
+        bloom.count = count
+        return bloom
+
+
+class RoutingIndex:
+    """Thread-safe docid to collection routing over per-collection Bloom filters.
+
+    Args:
+        lookup_dir: Directory holding the filters
+    """
+
+    def __init__(self, lookup_dir: str = DOCS_LOOKUP_DIR):
+        self.lookup_dir = lookup_dir
+        self._lock = threading.Lock()
+        # None records that a collection has no filter
+        self._filters: Dict[str, Optional[BloomFilter]] = {}
+        self._routed = 0
+        self._candidates = 0
+        self._unfiltered = 0
+
+    def _filter(self, collection: str) -> Optional[BloomFilter]:
+        with self._lock:
+            if collection in self._filters:
+                return self._filters[collection]
+            path = filter_path(collection, self.lookup_dir)
+            bloom = None
+            if os.path.exists(path):
+                try:
+                    bloom = BloomFilter.load(path)
+                except (OSError, ValueError, struct.error) as e:
+                    logger.warning(f"Ignoring routing filter {path}: {e}")
+            self._filters[collection] = bloom
+            return bloom
+
+    def route(self, doc_id: str, collections: Iterable[str]) -> List[str]:
+        """Get the collections a document can be in.
+
+        Args:
+            doc_id: The document ID
+            collections: The collection IDs of the report, in lookup order
+
+        Returns:
+            The collections (in the given order) whose filter may contain the
+            document, plus those without a filter. Empty if the document is
+            in none of the collections.
+        """
+        candidates = []
+        unfiltered = 0
+        for collection in collections:
+            bloom = self._filter(normalize_collection(collection))
+            if bloom is None:
+                unfiltered += 1
+                candidates.append(collection)
+            elif doc_id in bloom:
+                candidates.append(collection)
+        with self._lock:
+            self._routed += 1
+            self._candidates += len(candidates)
+            self._unfiltered += unfiltered
+        return candidates
+
+    def stats(self) -> Dict[str, Any]:
+        """Get routing statistics.
+
+        Returns:
+            Dictionary with the number of routed documents, the average number
+            of candidate collections per document, lookups of collections
+            without a filter and the loaded filters
+        """
+        with self._lock:
+            return {
+                "routed": self._routed,
+                "candidates_per_document": (
+                    self._candidates / self._routed if self._routed else 0.0
+                ),
+                "unfiltered": self._unfiltered,
+                "filters": {
+                    collection: bloom.count
+                    for collection, bloom in self._filters.items()
+                    if bloom is not None
+                },
+            }
+
+    def clear(self):
+        """Drop the loaded filters and reset the statistics."""
+        with self._lock:
+            self._filters.clear()
+            self._routed = self._candidates = self._unfiltered = 0
+
+
+# Process-wide routing index used by the evaluator
+routing_index = RoutingIndex()
+
+
+def route_collections(doc_id: str, collections: Iterable[str]) -> List[str]:
+    """Get the collections a cited document can be in, using routing_index."""
+    return routing_index.route(doc_id, collections)
+
+
+def collection_doc_ids(collection: str, lookup_dir: str = DOCS_LOOKUP_DIR) -> List[str]:
+    """Read every document ID of a collection.
+
+    The document store index is used when the collection has been
+    converted; otherwise the doc_mapping pickle is loaded.
+
+    Raises:
+        FileNotFoundError: If the collection has neither a store nor a pickle
+    """
+    path = store_path(collection, lookup_dir)
+    if os.path.isdir(path):
+        conn = sqlite3.connect(os.path.join(path, INDEX_FILE))
+        try:
+            return [row[0] for row in conn.execute("SELECT docid FROM documents")]
+        finally:
+            conn.close()
+    with open(mapping_path(collection, lookup_dir), "rb") as f:
+        return list(pickle.load(f))
+
+
+def build_routing_filter(
+    collection: str,
+    lookup_dir: str = DOCS_LOOKUP_DIR,
+    error_rate: float = DEFAULT_ERROR_RATE,
+) -> BloomFilter:
+    """Build and save the routing filter of a collection.
+
+    Args:
+        collection: The collection ID (e.g., 'neuclir/1/zh')
+        lookup_dir: Directory holding the collection and its filter
+        error_rate: Target false positive rate
+
+    Returns:
+        The saved filter
+    """
+    collection = normalize_collection(collection)
+    doc_ids = collection_doc_ids(collection, lookup_dir)
+    bloom = BloomFilter.for_capacity(len(doc_ids), error_rate)
+    for doc_id in doc_ids:
+        bloom.add(doc_id)
+    path = filter_path(collection, lookup_dir)
+    bloom.save(path)
+    logger.info(
+        f"Wrote routing filter for {len(doc_ids)} documents of {collection} to {path}"
+    )
+    return bloom
+
+
+def main():
+    """Build the routing filters of the document collections."""
+    parser = argparse.ArgumentParser(
+        description="Build docid to collection routing filters"
+    )
+    parser.add_argument(
+        "lookup_dir",
+        nargs="?",
+        default=DOCS_LOOKUP_DIR,
+        help="Directory with the document stores or doc_mapping pickles",
+    )
+    parser.add_argument(
+        "--collections",
+        nargs="+",
+        help="Collections to build filters for (default: every collection found)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=DEFAULT_ERROR_RATE,
+        help="Target false positive rate (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    collections = args.collections
+    if not collections:
+        names = set()
+        for name in os.listdir(args.lookup_dir):
+            if name.endswith(".tmp"):
+                continue
+            for prefix, suffix in (("doc_store_", ""), ("doc_mapping_", ".pkl")):
+                if name.startswith(prefix) and name.endswith(suffix):
+                    names.add(name[len(prefix) : len(name) - len(suffix)])
+        collections = [name.replace("_", "/") for name in sorted(names)]
+    if not collections:
+        parser.error(f"No collections found in {args.lookup_dir}")
+
+    for collection in collections:
+        build_routing_filter(collection, args.lookup_dir, args.error_rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Sentence-level scheduling of report evaluation across a run.
+
+The thread engine evaluates one report per worker and walks its sentences in
+order, so a long report keeps its worker busy long after the others have
+finished and sets the tail of the run. The previous sentences used for first
+instance checking are just the earlier sentence texts, known up front, so
+every sentence can be evaluated on its own. This module:
+1. Breaks every report into independent sentence tasks
+2. Runs the tasks of all reports on one shared worker pool
+3. Reassembles each report in sentence order as soon as its last sentence
+   finishes, with the same results as evaluate_report
+"""
+
+import logging
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .citations import DocTable
+from .evaluator import (
+    assemble_report,
+    evaluate_sentence,
+    load_nuggets,
+    prepare_sentence,
+    resolve_deferred_nuggets,
+)
+from .history import report_history
+from .prefilter import prefilter_report
+from .nuggets import NuggetBank
+from .options import EvaluationOptions
+from .output import CompactOutput
+from .utils import ModelProvider
+
+logger = logging.getLogger(__name__)
+
+# Default number of sentence workers shared by all reports
+DEFAULT_SENTENCE_WORKERS = 32
+
+
+class SentenceScheduler:
+    """Evaluates the sentences of many reports on one shared thread pool.
+
+    Args:
+        nuggets_file: Path to the nuggets file, or the NuggetBank of the run
+        provider: The model provider to use
+        model_name: Optional specific model name
+        verbose: Whether to log debug information
+        doc_table: Optional citations resolved in bulk for the run
+        compact_output: Optional CompactOutput for reference-only results
+        max_workers: Number of sentences evaluated at once across all reports
+        options: Optional evaluation options of the run
+    """
+
+    def __init__(
+        self,
+        nuggets_file: Union[str, NuggetBank] = None,
+        provider: str = ModelProvider.TOGETHER,
+        model_name: str = None,
+        verbose: bool = False,
+        doc_table: Optional[DocTable] = None,
+        compact_output: Optional[CompactOutput] = None,
+        max_workers: int = DEFAULT_SENTENCE_WORKERS,
+        options: Optional[EvaluationOptions] = None,
+    ):
+        self.nuggets_file = nuggets_file
+        self.provider = provider
+        self.model_name = model_name
+        self.verbose = verbose
+        self.doc_table = doc_table
+        self.compact_output = compact_output
+        self.max_workers = max(1, max_workers)
+        self.options = options
+        self._lock = threading.Lock()
+        self._stats = {
+            "reports": 0,
+            "sentences": 0,
+            "sentence_errors": 0,
+            "max_workers": self.max_workers,
+            "report_seconds": [],
+            "seconds": 0.0,
+        }
+
+    def _evaluate_sentence(
+        self,
+        report: Dict[str, Any],
+        i: int,
+        nuggets: Optional[List[Dict[str, Any]]],
+        previous_sentences: Optional[List[str]],
+        doc_ids: Dict[str, str],
+    ) -> Tuple[Optional[Dict[str, Any]], List[str], Optional[Exception]]:
+        citation_texts = []
+        try:
+            kwargs, citation_texts = prepare_sentence(
+                report, i, nuggets, previous_sentences, self.doc_table, doc_ids
+            )
+            result = evaluate_sentence(
+                provider=self.provider,
+                model_name=self.model_name,
+                verbose=self.verbose,
+                options=self.options,
+                **kwargs,
+            )
+            return result, citation_texts, None
+        except Exception as e:
+            if self.verbose:
+                logger.error(
+                    f"Error processing sentence {i+1} of report "
+                    f"{report.get('request_id', 'unknown')}: {str(e)}"
+                )
+                logger.error(f"Traceback: {traceback.format_exc()}")
+            with self._lock:
+                self._stats["sentence_errors"] += 1
+            return None, citation_texts, e
+
+    def run(
+        self,
+        reports: List[Dict[str, Any]],
+        on_sentence: Optional[Callable[[], None]] = None,
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Evaluate reports sentence by sentence.
+
+        Args:
+            reports: The reports to evaluate
+            on_sentence: Optional callback run after each finished sentence
+                (e.g. to update a progress bar)
+
+        Returns:
+            One (result, error) tuple per report in input order. result is
+            None if the report could not be evaluated, in which case error
+            describes why.
+        """
+        start = time.monotonic()
+        outcomes: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = [
+            (None, None)
+        ] * len(reports)
+        states = []
+        for index, report in enumerate(reports):
+            try:
+                num_sentences = len(report["sentences"])
+                nuggets = load_nuggets(self.nuggets_file, report, self.verbose)
+                sentence_nuggets = prefilter_report(report, nuggets, self.options)
+                sentence_history = report_history(report, self.options)
+            except Exception as e:
+                outcomes[index] = (None, f"{type(e).__name__}: {e}")
+                states.append(None)
+                continue
+            states.append(
+                {
+                    "nuggets": nuggets,
+                    "sentence_nuggets": sentence_nuggets,
+                    "sentence_history": sentence_history,
+                    "doc_ids": {},
+                    "sentences": [None] * num_sentences,
+                    "remaining": num_sentences,
+                    "start": time.monotonic(),
+                }
+            )
+
+        def finish(index: int):
+            state = states[index]
+            try:
+                resolve_deferred_nuggets(
+                    [result for result, _, _ in state["sentences"]],
+                    state["nuggets"],
+                    self.provider,
+                    self.model_name,
+                    self.options,
+                )
+                result = assemble_report(
+                    reports[index],
+                    state["sentences"],
+                    state["nuggets"],
+                    state["doc_ids"],
+                    self.compact_output,
+                    self.verbose,
+                )
+                outcomes[index] = (result, None)
+            except Exception as e:
+                if self.verbose:
+                    logger.error(f"Error assembling report {index}: {str(e)}")
+                outcomes[index] = (None, f"{type(e).__name__}: {e}")
+            with self._lock:
+                self._stats["reports"] += 1
+                self._stats["report_seconds"].append(
+                    time.monotonic() - state["start"]
+                )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for index, report in enumerate(reports):
+                state = states[index]
+                if state is None:
+                    continue
+                if not state["remaining"]:
+                    finish(index)
+                    continue
+                for i in range(len(report["sentences"])):
+                    future = executor.submit(
+                        self._evaluate_sentence,
+                        report,
+                        i,
+                        state["sentence_nuggets"][i],
+                        state["sentence_history"][i],
+                        state["doc_ids"],
+                    )
+                    futures[future] = (index, i)
+
+            for future in as_completed(futures):
+                index, i = futures[future]
+                state = states[index]
+                state["sentences"][i] = future.result()
+                state["remaining"] -= 1
+                with self._lock:
+                    self._stats["sentences"] += 1
+                if on_sentence is not None:
+                    on_sentence()
+                if not state["remaining"]:
+                    finish(index)
+
+        with self._lock:
+            self._stats["seconds"] += time.monotonic() - start
+        return outcomes
+
+    def stats(self) -> Dict[str, Any]:
+        """Get scheduling statistics.
+
+        Returns:
+            Dictionary with the number of reports and sentences evaluated,
+            sentence errors, the number of workers, the slowest report's
+            time to completion and the total time in seconds
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            report_seconds = stats.pop("report_seconds")
+        stats["max_report_seconds"] = max(report_seconds, default=0.0)
+        return stats
+
+
+def evaluate_reports_by_sentence(
+    reports: List[Dict[str, Any]],
+    nuggets_file: Union[str, NuggetBank] = None,
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    verbose: bool = False,
+    doc_table: Optional[DocTable] = None,
+    compact_output: Optional[CompactOutput] = None,
+    max_workers: int = DEFAULT_SENTENCE_WORKERS,
+    options: Optional[EvaluationOptions] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """Evaluate reports on a shared sentence-level worker pool.
+
+    Args:
+        reports: The reports to evaluate
+        nuggets_file: Path to the nuggets file, or the NuggetBank of the run
+        provider: The model provider to use
+        model_name: Optional specific model name
+        verbose: Whether to log debug information
+        doc_table: Optional citations resolved in bulk for the run
+        compact_output: Optional CompactOutput for reference-only results
+        max_workers: Number of sentences evaluated at once across all reports
+        options: Optional evaluation options of the run
+
+    Returns:
+        The evaluation results in input order, with None for failed reports
+    """
+    scheduler = SentenceScheduler(
+        nuggets_file=nuggets_file,
+        provider=provider,
+        model_name=model_name,
+        verbose=verbose,
+        doc_table=doc_table,
+        compact_output=compact_output,
+        max_workers=max_workers,
+        options=options,
+    )
+    return [result for result, _ in scheduler.run(reports)]
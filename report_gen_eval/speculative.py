@@ -0,0 +1,236 @@
+"""Judgments of sentences without citations, optionally issued speculatively.
+
+A sentence without citations walks a chain of up to three judgments:
+check_negative, then requires_citation, then first_instance. Each depends
+only on the sentence (and the previous sentences), not on the earlier
+answers; the answers only decide which judgments are needed. In speculative
+mode all of them are issued at once and the ones the decision tree does not
+need are discarded, trading a known number of wasted calls for about one
+round trip of latency instead of three.
+
+The evaluator asks for each judgment by name when the decision tree reaches
+it; without speculation the call is only made then, as before. With a
+cascade (see cascade), the judgments it answers confidently are never sent
+to the model, speculatively or not.
+"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cascade import CASCADE_EVALUATOR
+from .options import EvaluationOptions
+from .prompts import (
+    CHECK_NEGATIVE_SYSTEM,
+    CHECK_NEGATIVE_USER,
+    FIRST_INSTANCE_SYSTEM,
+    FIRST_INSTANCE_USER,
+    REQUIRES_CITATION_SYSTEM,
+    REQUIRES_CITATION_USER,
+)
+from .utils import aget_model_response, get_model_response, modify_model_response
+
+# Judgments of a sentence without citations, in decision tree order
+UNCITED_JUDGMENTS = ["check_negative", "requires_citation", "first_instance"]
+
+
+def uncited_prompts(
+    sentence: str, previous_sentences: Optional[List[str]] = None
+) -> Dict[str, Tuple[str, str]]:
+    """Build the (system, user) prompts of the judgments of an uncited sentence.
+
+    Args:
+        sentence: The sentence to judge
+        previous_sentences: The sentences before it; first_instance is only
+            judged when there are any
+
+    Returns:
+        Map of judgment names to their prompts
+    """
+    prompts = {
+        "check_negative": (
+            CHECK_NEGATIVE_SYSTEM,
+            CHECK_NEGATIVE_USER.format(sentence=sentence),
+        ),
+        "requires_citation": (
+            REQUIRES_CITATION_SYSTEM,
+            REQUIRES_CITATION_USER.format(sentence=sentence),
+        ),
+    }
+    if previous_sentences:
+        prompts["first_instance"] = (
+            FIRST_INSTANCE_SYSTEM,
+            FIRST_INSTANCE_USER.format(
+                sentence=sentence, previous_sentences="\n".join(previous_sentences)
+            ),
+        )
+    return prompts
+
+
+def local_answers(
+    sentence: str, names: List[str], options: EvaluationOptions
+) -> Dict[str, str]:
+    """Get the judgments of a sentence the run's cascade answers locally."""
+    if options.cascade is None:
+        return {}
+    answers = {}
+    for name in names:
+        answer = options.cascade.answer(name, sentence)
+        if answer is not None:
+            answers[name] = answer
+    return answers
+
+
+def judgment_record(judgments: Any, name: str, response: str) -> Dict[str, Any]:
+    """Build the model response record of a judgment of an uncited sentence.
+
+    Args:
+        judgments: The UncitedJudgments or AsyncUncitedJudgments of the sentence
+        name: The judgment name
+        response: The YES/NO answer
+
+    Returns:
+        The record, marked with the cascade evaluator if answered locally
+    """
+    record = {"type": name, "response": response}
+    if name in judgments.local:
+        record["evaluator"] = CASCADE_EVALUATOR
+    return record
+
+
+class UncitedJudgments:
+    """The judgments of one uncited sentence, fetched on demand or speculatively.
+
+    Args:
+        sentence: The sentence to judge
+        previous_sentences: The sentences before it
+        provider: The model provider to use
+        model_name: Optional specific model name
+        options: The run's evaluation options
+    """
+
+    def __init__(
+        self,
+        sentence: str,
+        previous_sentences: Optional[List[str]],
+        provider: str,
+        model_name: Optional[str],
+        options: EvaluationOptions,
+    ):
+        self.prompts = uncited_prompts(sentence, previous_sentences)
+        self.provider = provider
+        self.model_name = model_name
+        self.options = options
+        self.used = set()
+        self.local = local_answers(sentence, list(self.prompts), options)
+        remote = [name for name in self.prompts if name not in self.local]
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        if options.speculative and remote:
+            self._executor = ThreadPoolExecutor(max_workers=len(remote))
+            self._futures = {
+                name: self._executor.submit(self._respond, name) for name in remote
+            }
+
+    def _respond(self, name: str) -> str:
+        system_prompt, user_prompt = self.prompts[name]
+        return get_model_response(
+            system_prompt,
+            user_prompt,
+            provider=self.provider,
+            model_name=self.model_name,
+        )
+
+    def get(self, name: str) -> str:
+        """Get the YES/NO answer of a judgment the decision tree needs."""
+        self.used.add(name)
+        if name in self.local:
+            self.options.count("cascade_local")
+            return self.local[name]
+        if self.options.cascade is not None and name in self.options.cascade.models:
+            self.options.count("cascade_escalated")
+        if name in self._futures:
+            return modify_model_response(self._futures[name].result())
+        return modify_model_response(self._respond(name))
+
+    def finish(self):
+        """Discard the unneeded speculative judgments and count them."""
+        if self._executor is None:
+            return
+        wasted = [name for name in self._futures if name not in self.used]
+        for name in wasted:
+            self._futures[name].cancel()
+        # Do not wait for discarded calls; their threads finish on their own
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        self.options.count("speculative_calls", len(self._futures))
+        self.options.count("speculative_wasted", len(wasted))
+
+
+class AsyncUncitedJudgments:
+    """Async counterpart of UncitedJudgments.
+
+    Discarded speculative judgments are cancelled, so those still waiting
+    for the async semaphore never reach the provider.
+    """
+
+    def __init__(
+        self,
+        sentence: str,
+        previous_sentences: Optional[List[str]],
+        provider: str,
+        model_name: Optional[str],
+        options: EvaluationOptions,
+    ):
+        self.prompts = uncited_prompts(sentence, previous_sentences)
+        self.provider = provider
+        self.model_name = model_name
+        self.options = options
+        self.used = set()
+        self.local = local_answers(sentence, list(self.prompts), options)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        if options.speculative:
+            self._tasks = {
+                name: asyncio.ensure_future(self._respond(name))
+                for name in self.prompts
+                if name not in self.local
+            }
+
+    async def _respond(self, name: str) -> str:
+        system_prompt, user_prompt = self.prompts[name]
+        return await aget_model_response(
+            system_prompt,
+            user_prompt,
+            provider=self.provider,
+            model_name=self.model_name,
+        )
+
+    async def get(self, name: str) -> str:
+        """Get the YES/NO answer of a judgment the decision tree needs."""
+        self.used.add(name)
+        if name in self.local:
+            self.options.count("cascade_local")
+            return self.local[name]
+        if self.options.cascade is not None and name in self.options.cascade.models:
+            self.options.count("cascade_escalated")
+        if name in self._tasks:
+            return modify_model_response(await self._tasks[name])
+        return modify_model_response(await self._respond(name))
+
+    def finish(self):
+        """Cancel the unneeded speculative judgments and count them."""
+        if not self._tasks:
+            return
+        wasted = [name for name in self._tasks if name not in self.used]
+        for name in wasted:
+            task = self._tasks[name]
+            if task.cancelled():
+                continue
+            if task.done():
+                # Retrieve the outcome so a failed discarded call is not logged
+                task.exception()
+            else:
+                task.cancel()
+        self.options.count("speculative_calls", len(self._tasks))
+        self.options.count("speculative_wasted", len(wasted))
+        self._tasks = {}
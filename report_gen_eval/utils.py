@@ -5,23 +5,35 @@ This module provides general utility functions used across the codebase, includi
 2. File I/O operations
 3. Document lookup functionality
 4. Error handling and retry logic
+5. Persistent caching of model judgments
+6. Pooling of model clients and HTTP connections
+7. Asynchronous model calls for the asyncio evaluation engine
 """
 
+import asyncio
 import logging
 import os
+import threading
 import time
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from random import uniform
-import pickle
 import json
-from typing import Any, List, Optional, Dict, Tuple
+from typing import Any, Callable, List, Optional, Dict, Tuple
 from pathlib import Path
+from weakref import WeakKeyDictionary
+
+import httpx
 from langchain.schema import SystemMessage, HumanMessage
 from langchain_together import ChatTogether
 from langchain_community.chat_models import ChatAnthropic
 from langchain_openai import ChatOpenAI
 from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
 
+from .cache import JudgmentCache, get_judgment_cache
+from .concurrency import get_concurrency_limiter
+from .docstore import document_cache
+from .rate_limit import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -44,22 +56,49 @@ class ModelProvider:
     NO = "no"
 
 
+# Default model for each provider when no model name is given
+DEFAULT_MODEL_NAMES = {
+    ModelProvider.OPENAI: "gpt-4o-2024-11-20",
+    ModelProvider.ANTHROPIC: "claude-3-5-sonnet-20241022",
+    ModelProvider.TOGETHER: "meta-llama/Llama-3.3-70B-Instruct-Turbo",
+    ModelProvider.HUGGINGFACE: "mistralai/Mistral-7B-Instruct-v0.2",
+}
+
+# Decoding parameters used for every judgment
+DEFAULT_MODEL_PARAMS = {"temperature": 0, "max_tokens": 10}
+
+
 class YesProvider:
     def invoke(self, messages):
         return SystemMessage(content="YES")
 
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
 
 class NoProvider:
     def invoke(self, messages):
         return SystemMessage(content="NO")
 
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
 
-def get_model(provider: str = ModelProvider.TOGETHER, model_name: str = None) -> Any:
-    """Get the appropriate model based on provider.
+
+def build_model(
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    params: Optional[Dict[str, Any]] = None,
+    http_client: Optional[httpx.Client] = None,
+) -> Any:
+    """Construct a new model client for a provider.
+
+    Most callers should use get_model, which reuses clients from the shared pool.
 
     Args:
         provider: The model provider to use (openai, anthropic, or together)
         model_name: Optional specific model name to use
+        params: Optional decoding parameters overriding DEFAULT_MODEL_PARAMS
+        http_client: Optional shared HTTP client for OpenAI-compatible providers
 
     Returns:
         A configured LangChain chat model instance
@@ -67,39 +106,417 @@ def get_model(provider: str = ModelProvider.TOGETHER, model_name: str = None) ->
     Raises:
         ValueError: If an unsupported provider is specified
     """
+    model_name = resolve_model_name(provider, model_name)
+    params = {**DEFAULT_MODEL_PARAMS, **(params or {})}
     if provider == ModelProvider.OPENAI:
         return ChatOpenAI(
-            model_name=model_name or "gpt-4o-2024-11-20", temperature=0, max_tokens=10
+            model_name=model_name,
+            temperature=params["temperature"],
+            max_tokens=params["max_tokens"],
+            http_client=http_client,
+            include_response_headers=True,
         )
     elif provider == ModelProvider.ANTHROPIC:
         return ChatAnthropic(
-            model_name=model_name or "claude-3-5-sonnet-20241022",
-            temperature=0,
-            max_tokens=10,
+            model_name=model_name,
+            temperature=params["temperature"],
+            max_tokens=params["max_tokens"],
         )
     elif provider == ModelProvider.TOGETHER:
         return ChatTogether(
-            model=model_name or "meta-llama/Llama-3.3-70B-Instruct-Turbo",
-            temperature=0,
-            max_tokens=10,
+            model=model_name,
+            temperature=params["temperature"],
+            max_tokens=params["max_tokens"],
+            http_client=http_client,
+            include_response_headers=True,
         )
     elif provider == ModelProvider.YES:
         return YesProvider()
     elif provider == ModelProvider.NO:
         return NoProvider()
     elif provider == ModelProvider.HUGGINGFACE:
-        model_name = model_name or "mistralai/Mistral-7B-Instruct-v0.2"
         llm = HuggingFaceEndpoint(
             repo_id=model_name,
             task="text-generation",
-            max_new_tokens=10,
-            temperature=0,
+            max_new_tokens=params["max_tokens"],
+            temperature=params["temperature"],
         )
         return ChatHuggingFace(llm=llm)
     else:
         raise ValueError(f"Unsupported model provider: {provider}")
 
 
+class ModelClientPool:
+    """Thread-safe registry of reusable model clients.
+
+    Clients are keyed by (provider, model_name, params) and built once. The
+    OpenAI-compatible providers (OpenAI and Together) also share a single
+    keep-alive HTTP connection pool, so concurrent judgments reuse connections
+    instead of opening a new session per call.
+
+    Args:
+        max_connections: Maximum number of open HTTP connections
+        max_keepalive_connections: Maximum number of idle connections kept alive
+        keepalive_expiry: Seconds an idle connection is kept alive
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+    ):
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple, Any] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._created = 0
+        self._reused = 0
+
+    def get(
+        self,
+        provider: str,
+        model_name: str = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Get a pooled client, building it on first use.
+
+        Args:
+            provider: The model provider to use
+            model_name: Optional specific model name to use
+            params: Optional decoding parameters overriding DEFAULT_MODEL_PARAMS
+
+        Returns:
+            A configured LangChain chat model instance
+
+        Raises:
+            ValueError: If an unsupported provider is specified
+        """
+        params = {**DEFAULT_MODEL_PARAMS, **(params or {})}
+        key = (
+            provider,
+            resolve_model_name(provider, model_name),
+            tuple(sorted(params.items())),
+        )
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._reused += 1
+                return client
+
+            http_client = None
+            if provider in (ModelProvider.OPENAI, ModelProvider.TOGETHER):
+                if self._http_client is None:
+                    self._http_client = httpx.Client(limits=self._limits)
+                http_client = self._http_client
+            client = build_model(provider, model_name, params, http_client=http_client)
+            self._clients[key] = client
+            self._created += 1
+            return client
+
+    def stats(self) -> Dict[str, int]:
+        """Get client creation statistics.
+
+        Returns:
+            Dictionary with the number of clients created, reused and pooled
+        """
+        with self._lock:
+            return {
+                "created": self._created,
+                "reused": self._reused,
+                "pooled": len(self._clients),
+            }
+
+    def clear(self):
+        """Drop every pooled client and close the shared HTTP connections."""
+        with self._lock:
+            self._clients.clear()
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            self._created = 0
+            self._reused = 0
+
+
+# Process-wide pool shared by every call site in this module
+model_client_pool = ModelClientPool()
+
+
+def get_model(
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """Get the appropriate model based on provider.
+
+    Clients are reused from the process-wide pool, so repeated calls with the
+    same provider, model and parameters return the same instance.
+
+    Args:
+        provider: The model provider to use (openai, anthropic, or together)
+        model_name: Optional specific model name to use
+        params: Optional decoding parameters overriding DEFAULT_MODEL_PARAMS
+
+    Returns:
+        A configured LangChain chat model instance
+
+    Raises:
+        ValueError: If an unsupported provider is specified
+    """
+    return model_client_pool.get(provider, model_name, params)
+
+
+def get_client_pool_stats() -> Dict[str, int]:
+    """Get statistics of the process-wide model client pool.
+
+    Returns:
+        Dictionary with the number of clients created, reused and pooled
+    """
+    return model_client_pool.stats()
+
+
+def resolve_model_name(provider: str, model_name: Optional[str] = None) -> Optional[str]:
+    """Get the model name that will actually be used for a provider.
+
+    Args:
+        provider: The model provider
+        model_name: Optional specific model name
+
+    Returns:
+        The given model name, or the provider's default model name
+    """
+    return model_name or DEFAULT_MODEL_NAMES.get(provider)
+
+
+def judgment_cache_key(
+    provider: str,
+    model_name: Optional[str],
+    system_prompt: str,
+    user_prompt: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Build the judgment cache key for a single model request.
+
+    Args:
+        provider: The model provider
+        model_name: Optional specific model name
+        system_prompt: The system prompt
+        user_prompt: The user prompt
+        params: Optional decoding parameters overriding DEFAULT_MODEL_PARAMS
+
+    Returns:
+        The cache key for the request
+    """
+    return JudgmentCache.make_key(
+        provider,
+        resolve_model_name(provider, model_name),
+        system_prompt,
+        user_prompt,
+        {**DEFAULT_MODEL_PARAMS, **(params or {})},
+    )
+
+
+def cache_model_response(
+    key: str,
+    response_text: str,
+    system_prompt: str,
+    user_prompt: str,
+    provider: str,
+    model_name: Optional[str] = None,
+):
+    """Store a model response in the judgment cache, if caching is enabled.
+
+    Args:
+        key: Cache key from judgment_cache_key
+        response_text: The normalized model response
+        system_prompt: The system prompt
+        user_prompt: The user prompt
+        provider: The model provider
+        model_name: Optional specific model name
+    """
+    cache = get_judgment_cache()
+    if cache is not None:
+        cache.put(
+            key,
+            response_text,
+            provider=provider,
+            model_name=resolve_model_name(provider, model_name),
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+        )
+
+
+def estimate_tokens(
+    system_prompt: str, user_prompt: str, params: Optional[Dict[str, Any]] = None
+) -> int:
+    """Estimate the number of tokens a judgment request will use.
+
+    Uses the rough rule of four characters per prompt token, plus the
+    maximum number of completion tokens.
+
+    Args:
+        system_prompt: The system prompt
+        user_prompt: The user prompt
+        params: Optional decoding parameters overriding DEFAULT_MODEL_PARAMS
+
+    Returns:
+        Estimated total number of tokens
+    """
+    max_tokens = {**DEFAULT_MODEL_PARAMS, **(params or {})}["max_tokens"]
+    return (len(system_prompt) + len(user_prompt)) // 4 + max_tokens
+
+
+def _response_headers(response: Any) -> Optional[Dict[str, Any]]:
+    metadata = getattr(response, "response_metadata", None) or {}
+    return metadata.get("headers")
+
+
+def _response_total_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage_metadata", None) or {}
+    return usage.get("total_tokens")
+
+
+def _error_headers(error: Exception) -> Optional[Any]:
+    return getattr(getattr(error, "response", None), "headers", None)
+
+
+def invoke_model(
+    model: Any,
+    system_prompt: str,
+    user_prompt: str,
+    provider: str,
+    model_name: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Send one request to a model through the shared rate limiter.
+
+    Waits for a slot from the adaptive concurrency limiter (if enabled) and on
+    the (provider, model) rate limiter, then feeds them the outcome: latency,
+    rate limit headers and token usage of the response, or the 429 error.
+
+    Args:
+        model: The model client to use
+        system_prompt: The system prompt
+        user_prompt: The user prompt
+        provider: The model provider
+        model_name: Optional specific model name
+        params: Optional decoding parameters the model was built with, used
+            to estimate the request's tokens
+
+    Returns:
+        The normalized (stripped, upper-cased) response text
+    """
+    rate_limiter = get_rate_limiter(provider, resolve_model_name(provider, model_name))
+    tokens = estimate_tokens(system_prompt, user_prompt, params)
+    messages = [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_prompt),
+    ]
+    concurrency_limiter = get_concurrency_limiter(
+        provider, resolve_model_name(provider, model_name)
+    )
+    slot = concurrency_limiter.acquire() if concurrency_limiter is not None else None
+    start = time.monotonic()
+    error = None
+    completed = False
+    try:
+        rate_limiter.acquire(tokens)
+        start = time.monotonic()
+        response = model.invoke(messages)
+        completed = True
+    except Exception as e:
+        error = e
+        completed = True
+        if "429" in str(e):
+            rate_limiter.record_rate_limited(_error_headers(e))
+        raise
+    finally:
+        # An interrupted call (e.g. KeyboardInterrupt) frees its slot without
+        # counting as a success or an error
+        if concurrency_limiter is not None:
+            concurrency_limiter.release(
+                slot, time.monotonic() - start, error, cancelled=not completed
+            )
+    rate_limiter.update_from_headers(_response_headers(response))
+    rate_limiter.record_usage(tokens, _response_total_tokens(response))
+    return response.content.strip().upper()
+
+
+async def ainvoke_model(
+    model: Any,
+    system_prompt: str,
+    user_prompt: str,
+    provider: str,
+    model_name: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Asynchronously send one request to a model through the shared rate limiter.
+
+    Async counterpart of invoke_model; the request also holds the global
+    async semaphore while it is in flight.
+
+    Args:
+        model: The model client to use
+        system_prompt: The system prompt
+        user_prompt: The user prompt
+        provider: The model provider
+        model_name: Optional specific model name
+        params: Optional decoding parameters the model was built with, used
+            to estimate the request's tokens
+
+    Returns:
+        The normalized (stripped, upper-cased) response text
+    """
+    rate_limiter = get_rate_limiter(provider, resolve_model_name(provider, model_name))
+    tokens = estimate_tokens(system_prompt, user_prompt, params)
+    messages = [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_prompt),
+    ]
+    concurrency_limiter = get_concurrency_limiter(
+        provider, resolve_model_name(provider, model_name)
+    )
+    async with get_async_semaphore():
+        slot = (
+            await concurrency_limiter.acquire_async()
+            if concurrency_limiter is not None
+            else None
+        )
+        start = time.monotonic()
+        error = None
+        completed = False
+        try:
+            try:
+                await rate_limiter.acquire_async(tokens)
+            except asyncio.CancelledError:
+                # Cancelled before it was sent: give the reservation back
+                rate_limiter.refund(tokens)
+                raise
+            start = time.monotonic()
+            response = await model.ainvoke(messages)
+            completed = True
+        except Exception as e:
+            error = e
+            completed = True
+            if "429" in str(e):
+                rate_limiter.record_rate_limited(_error_headers(e))
+            raise
+        finally:
+            # A cancelled call (e.g. a judgment discarded after the first NO)
+            # frees its slot without counting as a success or an error
+            if concurrency_limiter is not None:
+                concurrency_limiter.release(
+                    slot, time.monotonic() - start, error, cancelled=not completed
+                )
+    rate_limiter.update_from_headers(_response_headers(response))
+    rate_limiter.record_usage(tokens, _response_total_tokens(response))
+    return response.content.strip().upper()
+
+
 def get_model_response(
     system_prompt: str,
     user_prompt: str,
@@ -107,6 +524,8 @@ def get_model_response(
     model_name: str = None,
     max_retries: int = 3,
     base_delay: float = 2.0,
+    params: Optional[Dict[str, Any]] = None,
+    structured: bool = False,
 ) -> str:
     """Get a response from the specified model with retry logic.
 
@@ -117,36 +536,48 @@ def get_model_response(
         model_name: Optional specific model name
         max_retries: Maximum number of retries on failure
         base_delay: Base delay between retries (uses exponential backoff)
+        params: Optional decoding parameters overriding DEFAULT_MODEL_PARAMS
+            (e.g. a larger max_tokens for structured responses)
+        structured: Whether the caller parses a structured response itself;
+            otherwise only valid YES/NO responses are cached and served
+            from the cache
 
     Returns:
         The model's response
 
     Raises:
         RuntimeError: If max retries exceeded or invalid response received
+
+    Note:
+        If the judgment cache is enabled, a cached response is returned
+        without calling the model.
     """
+    cache = get_judgment_cache()
+    cache_key = judgment_cache_key(
+        provider, model_name, system_prompt, user_prompt, params
+    )
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None and (structured or is_yes_no_response(cached)):
+            return cached
+
     for attempt in range(max_retries):
         try:
-            model = get_model(provider, model_name)
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt),
-            ]
-            response = model.invoke(messages)
-            response_text = response.content.strip().upper()
+            model = get_model(provider, model_name, params)
+            response_text = invoke_model(
+                model, system_prompt, user_prompt, provider, model_name, params
+            )
 
+            if structured or is_yes_no_response(response_text):
+                cache_model_response(
+                    cache_key, response_text, system_prompt, user_prompt, provider, model_name
+                )
             return response_text
         except ValueError:
             raise ValueError(f"Unsupported model provider: {provider}")
         except Exception as e:
-            if "429" in str(e) and attempt < max_retries - 1:
-                delay = base_delay * (2**attempt) + uniform(0, 0.1)
-                logger.warning(f"Rate limit hit. Retrying in {delay:.2f} seconds...")
-                time.sleep(delay)
-                continue
-            elif attempt < max_retries - 1:
-                delay = base_delay + uniform(0, 0.1)
-                logger.warning(f"Error: {str(e)}. Retrying in {delay:.2f} seconds...")
-                time.sleep(delay)
+            if attempt < max_retries - 1:
+                time.sleep(retry_delay(e, attempt, base_delay))
                 continue
             raise RuntimeError(
                 f"Model response error after {max_retries} attempts: {str(e)}"
@@ -179,6 +610,15 @@ def modify_model_response(response_text: str) -> str:
     return response_text
 
 
+def is_yes_no_response(response_text: str) -> bool:
+    """Check whether a response is accepted by modify_model_response."""
+    try:
+        modify_model_response(response_text)
+    except ValueError:
+        return False
+    return True
+
+
 def get_text_from_id_fast(
     docid: str, collection: str
 ) -> Tuple[Optional[str], Optional[str]]:
@@ -192,28 +632,60 @@ def get_text_from_id_fast(
         A tuple of (title, text) if found, (None, None) if not found
 
     Note:
-        Uses an in-memory cache to avoid repeated disk reads.
-        The cache is shared across all instances using the function.
+        Uses the process-wide document_cache, which loads each collection
+        once (from its converted document store when one exists, see
+        report_gen_eval.docstore) even when many threads need it at once.
     """
-    collection = (
-        collection.replace("zho", "zh").replace("fas", "fa").replace("rus", "ru")
-    )
-    mapping_file = f"neuclir-docs-lookup/doc_mapping_{collection.replace('/', '_')}.pkl"
-
-    # Load mapping if not already loaded
-    if not hasattr(get_text_from_id_fast, "cache"):
-        get_text_from_id_fast.cache = {}
-
-    if collection not in get_text_from_id_fast.cache:
-        with open(mapping_file, "rb") as f:
-            get_text_from_id_fast.cache[collection] = pickle.load(f)
-
-    doc = get_text_from_id_fast.cache[collection].get(docid)
+    doc = document_cache.get(docid, collection)
     if doc:
         return doc["title"], doc["text"]
     return None, None
 
 
+def get_document_cache_stats() -> Dict[str, Any]:
+    """Get the statistics of the process-wide document cache.
+
+    Returns:
+        Dictionary with lookup counts and the loaded collections
+    """
+    return document_cache.stats()
+
+
+# Maximum number of prompts of one batch sent to the model at once
+DEFAULT_BATCH_CONCURRENCY = 10
+
+_batch_concurrency = DEFAULT_BATCH_CONCURRENCY
+
+# Maximum number of prompts in flight at once in a batch with stop_on; the
+# others are only sent while no prompt has got the stop response, so few
+# calls are already paid for when it comes back
+STOP_ON_CONCURRENCY = 2
+
+# Response of a prompt of a stopped batch that was sent but whose answer was
+# not waited for (prompts never sent are None)
+DROPPED_RESPONSE = "DROPPED"
+
+
+def set_batch_concurrency(limit: int):
+    """Set the default number of prompts of one batch sent to the model at once.
+
+    Args:
+        limit: Maximum number of prompts in flight per batch_model_responses call
+
+    Raises:
+        ValueError: If the limit is smaller than 1
+    """
+    global _batch_concurrency
+    if limit < 1:
+        raise ValueError("Batch concurrency must be at least 1")
+    _batch_concurrency = limit
+
+
+def get_batch_concurrency() -> int:
+    """Get the default number of prompts of one batch sent to the model at once."""
+    return _batch_concurrency
+
+
 def batch_model_responses(
     system_prompt: str,
     user_prompts: List[str],
@@ -221,10 +693,14 @@ def batch_model_responses(
     model_name: str = None,
     max_retries: int = 3,
     base_delay: float = 2.0,
-) -> List[str]:
-    """Get multiple YES/NO responses from the model in batches.
+    max_concurrency: Optional[int] = None,
+    stop_on: Optional[str] = None,
+) -> List[Optional[str]]:
+    """Get multiple YES/NO responses from the model concurrently.
 
-    Processes prompts in batches to avoid rate limits while maintaining efficiency.
+    Prompts are dispatched on a thread pool of up to max_concurrency workers.
+    Requests are paced by the shared rate limiter of the provider and model
+    (see rate_limit.configure_rate_limits).
 
     Args:
         system_prompt: The system prompt to use for all queries
@@ -233,57 +709,406 @@ def batch_model_responses(
         model_name: Optional specific model name
         max_retries: Maximum number of retries on failure
         base_delay: Base delay between retries (uses exponential backoff)
+        max_concurrency: Maximum number of prompts in flight at once
+            (defaults to the value set with set_batch_concurrency)
+        stop_on: Optional response that settles the batch. Prompts are then
+            sent at most STOP_ON_CONCURRENCY at a time, and once one is
+            answered with it no more are sent and the calls in flight are no
+            longer waited for.
 
     Returns:
-        List of "YES"/"NO" responses matching the input prompts order
+        List of "YES"/"NO" responses matching the input prompts order. When
+        the batch was stopped, prompts whose call was in flight are
+        DROPPED_RESPONSE and prompts never sent are None.
+
+    Raises:
+        BatchResponseError: If any prompt still fails after max_retries attempts
+            (and the batch was not stopped). Every other prompt is still
+            answered and the error carries the partial responses and a
+            per-prompt failure report.
 
     Note:
-        Uses batching to reduce API calls and includes rate limit handling.
-        A small delay is added between batches to avoid overwhelming the API.
+        Each prompt is retried on its own, and prompts with a cached judgment
+        are answered from the cache without calling the model or waiting on
+        the rate limiter.
+    """
+    cache = get_judgment_cache()
+    if max_concurrency is None:
+        max_concurrency = _batch_concurrency
+
+    def respond(user_prompt: str) -> str:
+        cache_key = judgment_cache_key(provider, model_name, system_prompt, user_prompt)
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None and is_yes_no_response(cached):
+            return modify_model_response(cached)
+
+        # Clients are pooled, so this is a lookup after the first prompt; a
+        # construction failure is retried and reported like any other
+        model = get_model(provider, model_name)
+        response_text = invoke_model(
+            model, system_prompt, user_prompt, provider, model_name
+        )
+        response_text = modify_model_response(response_text)
+
+        cache_model_response(
+            cache_key, response_text, system_prompt, user_prompt, provider, model_name
+        )
+        return response_text
+
+    def respond_with_retry(index: int) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        # Each prompt has its own attempt budget, so one bad completion never
+        # throws away the responses already collected for the other prompts
+        for attempt in range(max_retries):
+            try:
+                return respond(user_prompts[index]), None
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay(e, attempt, base_delay))
+                    continue
+                return None, {"index": index, "attempts": max_retries, "error": str(e)}
+
+    if stop_on is not None:
+        outcomes = respond_until(
+            respond_with_retry,
+            len(user_prompts),
+            stop_on,
+            min(max_concurrency, STOP_ON_CONCURRENCY),
+        )
+        if any(response == stop_on for response, _ in outcomes):
+            return [response for response, _ in outcomes]
+    elif len(user_prompts) <= 1 or max_concurrency <= 1:
+        outcomes = [respond_with_retry(i) for i in range(len(user_prompts))]
+    else:
+        workers = min(max_concurrency, len(user_prompts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map preserves the input order of the prompts
+            outcomes = list(executor.map(respond_with_retry, range(len(user_prompts))))
+
+    return collect_batch_responses(outcomes)
+
+
+def respond_until(
+    respond: Callable[[int], Tuple[Optional[str], Optional[Dict[str, Any]]]],
+    count: int,
+    stop_on: str,
+    max_concurrency: int,
+) -> List[Tuple[Optional[str], Optional[Dict[str, Any]]]]:
+    """Answer prompts until one of them gets the stop response.
+
+    Prompts are sent in input order with at most max_concurrency in flight;
+    the next one is only sent once a call in flight has come back without
+    the stop response.
+
+    Args:
+        respond: Function answering the prompt at an index with a
+            (response, failure) pair
+        count: Number of prompts
+        stop_on: The response that stops the batch
+        max_concurrency: Maximum number of prompts in flight at once
+
+    Returns:
+        (response, failure) pairs in input order; (DROPPED_RESPONSE, None)
+        for the prompts in flight when the batch stopped and (None, None)
+        for the prompts never sent
+    """
+    outcomes = [(None, None)] * count
+    if count <= 1 or max_concurrency <= 1:
+        for i in range(count):
+            outcomes[i] = respond(i)
+            if outcomes[i][0] == stop_on:
+                break
+        return outcomes
+
+    executor = ThreadPoolExecutor(max_workers=min(max_concurrency, count))
+    futures = {}
+    pending = set()
+    sent = 0
+    stopped = False
+    try:
+        while not stopped and (pending or sent < count):
+            while sent < count and len(pending) < max_concurrency:
+                future = executor.submit(respond, sent)
+                futures[future] = sent
+                pending.add(future)
+                sent += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                outcomes[futures[future]] = future.result()
+                stopped = stopped or outcomes[futures[future]][0] == stop_on
+    finally:
+        # Every submitted prompt has a worker, so the pending ones are in
+        # flight; they finish on their own and their answers are dropped
+        for future in pending:
+            outcomes[futures[future]] = (DROPPED_RESPONSE, None)
+        executor.shutdown(wait=False)
+    return outcomes
+
+    executor = ThreadPoolExecutor(max_workers=min(max_concurrency, count))
+    futures = {executor.submit(respond, i): i for i in range(count)}
+    try:
+        for future in as_completed(futures):
+            outcomes[futures[future]] = future.result()
+            if outcomes[futures[future]][0] == stop_on:
+                break
+    finally:
+        # Prompts not sent yet are cancelled; calls in flight finish on their own
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+    return outcomes
+
+
+def retry_delay(error: Exception, attempt: int, base_delay: float) -> float:
+    """Get the delay before retrying a failed model call.
+
+    Rate limit errors back off exponentially, other errors wait base_delay.
+
+    Args:
+        error: The exception raised by the failed attempt
+        attempt: Zero-based number of the failed attempt
+        base_delay: Base delay between retries
+
+    Returns:
+        Number of seconds to wait before the next attempt
     """
+    if "429" in str(error):
+        delay = base_delay * (2**attempt) + uniform(0, 0.1)
+        logger.warning(f"Rate limit hit. Retrying in {delay:.2f} seconds...")
+    else:
+        delay = base_delay + uniform(0, 0.1)
+        logger.warning(f"Error: {str(error)}. Retrying in {delay:.2f} seconds...")
+    return delay
+
+
+class BatchResponseError(RuntimeError):
+    """Raised when some prompts of a batch failed after all of their retries.
+
+    Attributes:
+        responses: Responses in input order, with None for every failed prompt
+        failures: One dictionary per failed prompt with its index, the number
+            of attempts made and the last error
+    """
+
+    def __init__(self, responses: List[Optional[str]], failures: List[Dict[str, Any]]):
+        self.responses = responses
+        self.failures = failures
+        super().__init__(
+            f"Model response error for {len(failures)} of {len(responses)} prompts: "
+            + "; ".join(f"prompt {f['index']}: {f['error']}" for f in failures)
+        )
+
+
+def collect_batch_responses(
+    outcomes: List[Tuple[Optional[str], Optional[Dict[str, Any]]]]
+) -> List[str]:
+    """Combine per-prompt outcomes into the responses of a batch.
+
+    Args:
+        outcomes: (response, failure) pairs in input order
+
+    Returns:
+        List of responses matching the input prompts order
+
+    Raises:
+        BatchResponseError: If any prompt failed
+    """
+    responses = [response for response, _ in outcomes]
+    failures = [failure for _, failure in outcomes if failure is not None]
+    if failures:
+        raise BatchResponseError(responses, failures)
+    return responses
+
+
+# Maximum number of model calls in flight at once on the async engine
+DEFAULT_ASYNC_CONCURRENCY = 64
+
+_async_concurrency = DEFAULT_ASYNC_CONCURRENCY
+_async_semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    WeakKeyDictionary()
+)
+
+
+def set_async_concurrency(limit: int):
+    """Set the global limit on concurrent model calls for the async engine.
+
+    Args:
+        limit: Maximum number of model calls in flight at once
+
+    Raises:
+        ValueError: If the limit is smaller than 1
+    """
+    global _async_concurrency
+    if limit < 1:
+        raise ValueError("Async concurrency must be at least 1")
+    _async_concurrency = limit
+    _async_semaphores.clear()
+
+
+def get_async_semaphore() -> asyncio.Semaphore:
+    """Get the global semaphore bounding model calls on the running event loop.
+
+    Returns:
+        The semaphore shared by every async model call on this event loop
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_async_concurrency)
+        _async_semaphores[loop] = semaphore
+    return semaphore
+
+
+async def aget_model_response(
+    system_prompt: str,
+    user_prompt: str,
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    max_retries: int = 3,
+    base_delay: float = 2.0,
+    params: Optional[Dict[str, Any]] = None,
+    structured: bool = False,
+) -> str:
+    """Asynchronously get a response from the specified model with retry logic.
+
+    This is the ainvoke-based counterpart of get_model_response. Every call
+    holds the global async semaphore while the request is in flight.
+
+    Args:
+        system_prompt: The system prompt to use
+        user_prompt: The user prompt to use
+        provider: The model provider to use
+        model_name: Optional specific model name
+        max_retries: Maximum number of retries on failure
+        base_delay: Base delay between retries (uses exponential backoff)
+        params: Optional decoding parameters overriding DEFAULT_MODEL_PARAMS
+            (e.g. a larger max_tokens for structured responses)
+        structured: Whether the caller parses a structured response itself;
+            otherwise only valid YES/NO responses are cached and served
+            from the cache
+
+    Returns:
+        The model's response
+
+    Raises:
+        RuntimeError: If max retries exceeded or invalid response received
+    """
+    cache = get_judgment_cache()
+    cache_key = judgment_cache_key(
+        provider, model_name, system_prompt, user_prompt, params
+    )
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None and (structured or is_yes_no_response(cached)):
+            return cached
+
     for attempt in range(max_retries):
         try:
-            model = get_model(provider, model_name)
-            responses = []
-
-            # Process in batches of 10 to avoid rate limits
-            batch_size = 10
-            for i in range(0, len(user_prompts), batch_size):
-                batch = user_prompts[i : i + batch_size]
-                batch_responses = []
-
-                for user_prompt in batch:
-                    messages = [
-                        SystemMessage(content=system_prompt),
-                        HumanMessage(content=user_prompt),
-                    ]
-                    response = model.invoke(messages)
-                    response_text = response.content.strip().upper()
-                    response_text = modify_model_response(response_text)
-
-                    batch_responses.append(response_text)
-
-                responses.extend(batch_responses)
-                if i + batch_size < len(user_prompts):  # If not the last batch
-                    time.sleep(0.5)  # Small delay between batches
-
-            return responses
+            model = get_model(provider, model_name, params)
+            response_text = await ainvoke_model(
+                model, system_prompt, user_prompt, provider, model_name, params
+            )
+
+            if structured or is_yes_no_response(response_text):
+                cache_model_response(
+                    cache_key, response_text, system_prompt, user_prompt, provider, model_name
+                )
+            return response_text
+        except ValueError:
+            raise ValueError(f"Unsupported model provider: {provider}")
         except Exception as e:
-            if "429" in str(e) and attempt < max_retries - 1:
-                delay = base_delay * (2**attempt) + uniform(0, 0.1)
-                logger.warning(f"Rate limit hit. Retrying in {delay:.2f} seconds...")
-                time.sleep(delay)
-                continue
-            elif attempt < max_retries - 1:
-                delay = base_delay + uniform(0, 0.1)
-                logger.warning(f"Error: {str(e)}. Retrying in {delay:.2f} seconds...")
-                time.sleep(delay)
+            if attempt < max_retries - 1:
+                await asyncio.sleep(retry_delay(e, attempt, base_delay))
                 continue
             raise RuntimeError(
                 f"Model response error after {max_retries} attempts: {str(e)}"
             )
 
 
+async def abatch_model_responses(
+    system_prompt: str,
+    user_prompts: List[str],
+    provider: str = ModelProvider.TOGETHER,
+    model_name: str = None,
+    max_retries: int = 3,
+    base_delay: float = 2.0,
+    stop_on: Optional[str] = None,
+) -> List[Optional[str]]:
+    """Asynchronously get multiple YES/NO responses from the model.
+
+    Without stop_on, all prompts are issued at once and bounded only by the
+    global async semaphore. Like batch_model_responses, each prompt is retried on its own.
+
+    Args:
+        system_prompt: The system prompt to use for all queries
+        user_prompts: List of user prompts to process
+        provider: The model provider to use
+        model_name: Optional specific model name
+        max_retries: Maximum number of retries on failure
+        base_delay: Base delay between retries (uses exponential backoff)
+        stop_on: Optional response that settles the batch. Prompts are then
+            started at most STOP_ON_CONCURRENCY at a time, and once one is
+            answered with it no more are started and the started ones are
+            cancelled.
+
+    Returns:
+        List of "YES"/"NO" responses matching the input prompts order. When
+        the batch was stopped, prompts that were started are
+        DROPPED_RESPONSE and prompts never started are None.
+
+    Raises:
+        BatchResponseError: If any prompt still fails after max_retries attempts
+            (and the batch was not stopped)
+    """
+
+    async def respond_with_retry(
+        index: int,
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        for attempt in range(max_retries):
+            try:
+                response_text = await aget_model_response(
+                    system_prompt, user_prompts[index], provider, model_name, 1
+                )
+                return modify_model_response(response_text), None
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(retry_delay(e, attempt, base_delay))
+                    continue
+                return None, {"index": index, "attempts": max_retries, "error": str(e)}
+
+    if stop_on is None:
+        outcomes = await asyncio.gather(
+            *(respond_with_retry(i) for i in range(len(user_prompts)))
+        )
+        return collect_batch_responses(list(outcomes))
+
+    count = len(user_prompts)
+    tasks = {}
+    outcomes = [(None, None)] * count
+    pending = set()
+    started = 0
+    stopped = False
+    try:
+        while not stopped and (pending or started < count):
+            while started < count and len(pending) < STOP_ON_CONCURRENCY:
+                task = asyncio.ensure_future(respond_with_retry(started))
+                tasks[task] = started
+                pending.add(task)
+                started += 1
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                outcomes[tasks[task]] = task.result()
+                stopped = stopped or outcomes[tasks[task]][0] == stop_on
+    finally:
+        for task in pending:
+            outcomes[tasks[task]] = (DROPPED_RESPONSE, None)
+            task.cancel()
+    if stopped:
+        return [response for response, _ in outcomes]
+    return collect_batch_responses(outcomes)
+
+
 def load_jsonl(file_path: str) -> List[Dict]:
     """Load data from a JSONL file.
 
@@ -0,0 +1,151 @@
+"""Up-front validation of the reports of a run.
+
+A report that cannot be evaluated (a missing field, a citation that cannot
+be resolved, no nuggets for its request) used to fail only once the
+evaluator reached the offending sentence, after the earlier sentences had
+already spent model calls. This module checks every report before any
+model calls are made:
+1. Report schema (required fields and sentence structure)
+2. Every citation resolves to a document in one of the report's collections
+3. A nugget entry exists for the report's request
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .citations import DocTable, resolve_citations
+from .nuggets import NuggetBank
+from .routing import route_collections
+
+logger = logging.getLogger(__name__)
+
+# Fields every report needs for evaluation
+REQUIRED_FIELDS = ["request_id", "run_id", "collection_ids", "sentences"]
+
+
+def check_report_schema(report: Dict[str, Any]) -> List[str]:
+    """Check the structure of a report.
+
+    Args:
+        report: The report to check
+
+    Returns:
+        A description of every problem found (empty if the report is valid)
+    """
+    if not isinstance(report, dict):
+        return ["Report is not a JSON object"]
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in report]
+    if missing_fields:
+        return [f"Missing required fields in report: {', '.join(missing_fields)}"]
+
+    errors = []
+    if not isinstance(report["collection_ids"], list):
+        errors.append("collection_ids must be a list")
+    if not isinstance(report["sentences"], list):
+        errors.append("sentences must be a list")
+        return errors
+    for i, sentence in enumerate(report["sentences"]):
+        if not isinstance(sentence, dict) or not isinstance(sentence.get("text"), str):
+            errors.append(f"Sentence {i + 1} has no text")
+    return errors
+
+
+def check_report_citations(report: Dict[str, Any], doc_table: DocTable) -> List[str]:
+    """Check that every citation of a report can be resolved.
+
+    Args:
+        report: The report to check (with a valid schema)
+        doc_table: The citations resolved in bulk for the run
+
+    Returns:
+        A description of every unresolvable citation
+    """
+    errors = []
+    collections = report["collection_ids"]
+    for i, sentence in enumerate(report["sentences"]):
+        citations = sentence.get("citations")
+        if not isinstance(citations, list):
+            continue
+        for doc_id in citations:
+            candidates = route_collections(doc_id, collections)
+            if any(doc_table.get(doc_id, c) is not None for c in candidates):
+                continue
+            unchecked = [c for c in candidates if not doc_table.has(doc_id, c)]
+            if unchecked:
+                reason = f"could not be looked up in {', '.join(unchecked)}"
+            else:
+                reason = "was not found in any collection"
+            errors.append(f"Sentence {i + 1}: citation {doc_id} {reason}")
+    return errors
+
+
+def validate_report(
+    report: Dict[str, Any],
+    doc_table: DocTable,
+    nuggets: Optional[NuggetBank] = None,
+) -> List[str]:
+    """Check that a report can be evaluated to completion.
+
+    Args:
+        report: The report to check
+        doc_table: The citations resolved in bulk for the run
+        nuggets: Optional nugget bank; if given, the report must have nuggets
+
+    Returns:
+        A description of every problem found (empty if the report is valid)
+    """
+    errors = check_report_schema(report)
+    if errors:
+        return errors
+    errors = check_report_citations(report, doc_table)
+    if nuggets is not None and nuggets.for_report(report) is None:
+        errors.append(f"No nuggets found for request {report['request_id']}")
+    return errors
+
+
+def validate_reports(
+    reports: Iterable[Dict[str, Any]],
+    nuggets: Optional[NuggetBank] = None,
+    doc_table: Optional[DocTable] = None,
+    verbose: bool = False,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Split the reports of a run into those that can be evaluated and rejections.
+
+    Args:
+        reports: The reports of the run
+        nuggets: Optional nugget bank; if given, reports without nuggets are rejected
+        doc_table: The citations resolved in bulk for the run; resolved here
+            if not given
+        verbose: Whether to log the rejected reports
+
+    Returns:
+        Tuple of (accepted reports, rejection records). Each rejection record
+        has the report_id, the joined error, the list of errors and the
+        report data.
+    """
+    reports = list(reports)
+    if doc_table is None:
+        doc_table = resolve_citations(
+            [report for report in reports if not check_report_schema(report)]
+        )
+
+    accepted, rejected = [], []
+    for report in reports:
+        errors = validate_report(report, doc_table, nuggets)
+        if not errors:
+            accepted.append(report)
+            continue
+        report_id = (
+            report.get("request_id", "unknown") if isinstance(report, dict) else "unknown"
+        )
+        if verbose:
+            logger.warning(f"Rejected report {report_id}: {'; '.join(errors)}")
+        rejected.append(
+            {
+                "report_id": report_id,
+                "error": "; ".join(errors),
+                "errors": errors,
+                "report_data": report,
+            }
+        )
+    return accepted, rejected
@@ -4,12 +4,16 @@ import logging
 import os
 import traceback
 import sys
+from pathlib import Path
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from report_gen_eval import evaluate_report, ModelProvider
-from report_gen_eval.utils import load_jsonl
+from report_gen_eval import evaluate_report, ModelProvider, NuggetBank
+from report_gen_eval.cache import configure_judgment_cache, get_judgment_cache
+from report_gen_eval.citations import DocTable, resolve_citations
+from report_gen_eval.validation import check_report_schema, validate_reports
+from report_gen_eval.utils import load_jsonl, save_jsonl
 from tqdm import tqdm
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
 
 # Configure logging
 logging.basicConfig(
@@ -36,19 +40,21 @@ def run_report_gen_eval(input_file):
 
 def process_report(
     report: Dict[str, Any],
-    nuggets_file: str = None,
+    nuggets_file: Union[str, NuggetBank] = None,
     provider: str = ModelProvider.TOGETHER,
     model_name: str = None,
     verbose: bool = False,
+    doc_table: Optional[DocTable] = None,
 ) -> Dict[str, Any]:
     """Process a single report with error handling.
 
     Args:
         report: The report to process
-        nuggets_file: Path to the nuggets file
+        nuggets_file: Path to the nuggets file, or the NuggetBank of the run
         provider: The model provider to use
         model_name: Optional specific model name
         verbose: Whether to enable verbose logging
+        doc_table: Optional citations resolved in bulk for the run
 
     Returns:
         The evaluation results or None if processing failed
@@ -79,6 +85,7 @@ def process_report(
             provider=provider,
             model_name=model_name,
             verbose=verbose,
+            doc_table=doc_table,
         )
 
         if result is None:
@@ -136,6 +143,26 @@ def main():
         type=str,
         help="Specific model name to use (defaults to provider-specific default)",
     )
+    parser.add_argument(
+        "--cache-path",
+        type=str,
+        help="Path to a persistent judgment cache shared across runs (default: disabled)",
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        help="Maximum number of cached judgments to keep (default: unlimited)",
+    )
+    parser.add_argument(
+        "--cache-max-age-days",
+        type=float,
+        help="Maximum age in days of a cached judgment (default: unlimited)",
+    )
+    parser.add_argument(
+        "--allow-missing-nuggets",
+        action="store_true",
+        help="Evaluate reports that have no nuggets instead of rejecting them",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging"
     )
@@ -160,6 +187,18 @@ def main():
         if not os.path.exists(args.nuggets_file):
             raise FileNotFoundError(f"Nuggets file not found: {args.nuggets_file}")
 
+        # Set up the judgment cache
+        if args.cache_path:
+            configure_judgment_cache(
+                args.cache_path,
+                max_entries=args.cache_max_entries,
+                max_age=(
+                    args.cache_max_age_days * 24 * 3600
+                    if args.cache_max_age_days is not None
+                    else None
+                ),
+            )
+
         # Load input data
         if args.verbose:
             logger.info(f"Loading data from {args.input_file}")
@@ -172,6 +211,37 @@ def main():
         except json.JSONDecodeError as e:
             raise ValueError(f"Failed to parse input file {args.input_file}: {str(e)}")
 
+        # Load and index the nuggets once for every worker
+        nuggets = NuggetBank.from_file(args.nuggets_file)
+
+        # Resolve every citation in one sweep per collection before any model calls
+        doc_table = resolve_citations(
+            [report for report in reports if not check_report_schema(report)],
+            verbose=args.verbose,
+        )
+
+        # Only schedule reports that can be evaluated to completion
+        reports, rejected_reports = validate_reports(
+            reports,
+            nuggets=None if args.allow_missing_nuggets else nuggets,
+            doc_table=doc_table,
+            verbose=args.verbose,
+        )
+        if rejected_reports:
+            # Results are written to the output_dir file, so the rejected
+            # reports go next to it
+            rejected_file = (
+                Path(args.output_dir).resolve().parent
+                / f"rejected_reports_{Path(args.input_file).stem}.jsonl"
+            )
+            logger.warning(
+                f"Rejected {len(rejected_reports)} reports that cannot be evaluated, "
+                f"see {rejected_file}"
+            )
+            save_jsonl(rejected_reports, str(rejected_file))
+        if not reports:
+            raise ValueError("No reports passed validation")
+
         # Validate batch size
         if args.batch_size < 1:
             raise ValueError("Batch size must be at least 1")
@@ -195,10 +265,11 @@ def main():
                 executor.submit(
                     process_report,
                     report,
-                    nuggets_file=args.nuggets_file,
+                    nuggets_file=nuggets,
                     provider=args.model_provider,
                     model_name=args.model_name,
                     verbose=args.verbose,
+                    doc_table=doc_table,
                 ): report
                 for report in reports
             }
@@ -242,6 +313,13 @@ def main():
         if args.verbose:
             logger.info("\nProcessing complete:")
             logger.info(f"- Successfully processed: {len(results)} reports")
+        cache = get_judgment_cache()
+        if cache is not None:
+            cache_stats = cache.stats()
+            logger.info(
+                f"- Judgment cache: {cache_stats['hits']} hits, "
+                f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.1%} hit rate)"
+            )
         if failed_reports:
             if args.verbose:
                 logger.warning(f"- Failed to process: {len(failed_reports)} reports")
@@ -263,8 +341,8 @@ def main():
         elif args.verbose:
             logger.warning("No successful results to save")
 
-        # Exit with error if any reports failed
-        if failed_reports:
+        # Exit with error if any reports failed or were rejected
+        if failed_reports or rejected_reports:
             sys.exit(1)
 
     except Exception as e:
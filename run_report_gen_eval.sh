@@ -45,6 +45,7 @@ for provider in "${PROVIDERS[@]}"; do
             "$DATA_DIR/$NUGGETS_FILE" \
             "$RESULTS_FILE" \
             --batch-size "$BATCH_SIZE" \
-            -p "$provider"
+            -p "$provider" \
+            --allow-missing-nuggets
     done
 done
\ No newline at end of file
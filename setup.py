@@ -29,10 +29,16 @@ setup(
         "together>=0.1.0",
         "tqdm>=4.65.0",
         "python-dotenv>=0.19.0",
+        "numpy>=1.20.0",
     ],
     entry_points={
         "console_scripts": [
             "report-eval=report_gen_eval.cli:main",
+            "report-eval-docstore=report_gen_eval.docstore:main",
+            "report-eval-routing=report_gen_eval.routing:main",
+            "report-eval-prefilter=report_gen_eval.prefilter:main",
+            "report-eval-history=report_gen_eval.history:main",
+            "report-eval-cascade=report_gen_eval.cascade:main",
         ],
     },
 ) 
\ No newline at end of file
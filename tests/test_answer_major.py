@@ -0,0 +1,125 @@
+import asyncio
+import re
+
+import pytest
+from langchain.schema import SystemMessage
+
+from report_gen_eval import ModelProvider, utils
+from report_gen_eval.answer_major import parse_support_response
+from report_gen_eval.evaluator import evaluate_report, evaluate_report_async
+from report_gen_eval.options import EvaluationOptions
+from report_gen_eval.prompts import NUGGET_AGREEMENT_SYSTEM, NUGGET_SUPPORT_SYSTEM
+from report_gen_eval.scheduler import evaluate_reports_by_sentence
+
+NUGGETS = 'assets/example_nuggets_fix.jsonl'
+
+REPORT = {
+    "request_id": "300",
+    "run_id": "test",
+    "collection_ids": ["test"],
+    "sentences": [
+        {"text": "Suicides in Japan did not fall in 2020.", "citations": []},
+        {"text": "Suicides rose by 3.7% in 2020.", "citations": []},
+        {"text": "It was not a good year.", "citations": []},
+    ],
+}
+
+
+class SupportProvider:
+    """Says YES to every judgment; a nugget answer agrees with the sentences containing it."""
+
+    def __init__(self):
+        self.system_prompts = []
+
+    def invoke(self, messages):
+        system, prompt = messages[0].content, messages[1].content
+        self.system_prompts.append(system)
+        if system not in (NUGGET_SUPPORT_SYSTEM, NUGGET_AGREEMENT_SYSTEM):
+            return SystemMessage(content="YES")
+        answer = re.findall(r"^Answer: (.*)$", prompt, re.M)[-1]
+        if system == NUGGET_SUPPORT_SYSTEM:
+            listed = re.findall(r"^(\d+)\. (.*)$", prompt.split("Agreeing sentences: 2, 3")[1], re.M)
+            agreeing = [index for index, sentence in listed if answer in sentence]
+            return SystemMessage(content=", ".join(agreeing) or "NONE")
+        sentence = re.findall(r"^Sentence: (.*)$", prompt, re.M)[-1]
+        return SystemMessage(content="YES" if answer in sentence else "NO")
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+@pytest.fixture
+def support_provider():
+    provider = SupportProvider()
+    original = utils.build_model
+    utils.build_model = lambda *args, **kwargs: provider
+    utils.model_client_pool.clear()
+    yield provider
+    utils.build_model = original
+    utils.model_client_pool.clear()
+
+
+def test_parse_support_response():
+    assert parse_support_response("1, 3", 3) == ["YES", "NO", "YES"]
+    assert parse_support_response(" NONE.", 2) == ["NO", "NO"]
+    assert parse_support_response("2,2", 2) == ["NO", "YES"]
+    assert parse_support_response("4", 3) is None
+    assert parse_support_response("YES", 3) is None
+
+
+def test_answer_major_matches_sentence_major(support_provider):
+    expected = evaluate_report(REPORT, NUGGETS, ModelProvider.TOGETHER)
+    single_calls = support_provider.system_prompts.count(NUGGET_AGREEMENT_SYSTEM)
+    support_provider.system_prompts.clear()
+
+    options = EvaluationOptions(answer_major=True)
+    assert evaluate_report(REPORT, NUGGETS, ModelProvider.TOGETHER, options=options) == expected
+    assert asyncio.run(evaluate_report_async(REPORT, NUGGETS, ModelProvider.TOGETHER, options=options)) == expected
+    assert evaluate_reports_by_sentence([REPORT], NUGGETS, ModelProvider.TOGETHER, options=options) == [expected]
+    assert expected["metrics"]["unique_nuggets_matched"] > 0
+
+    counts = options.stats()["counts"]
+    answers = counts["answer_major_prompts"] // 3
+    assert single_calls == 3 * answers
+    assert counts["answer_major_pairs"] == 3 * single_calls
+    assert support_provider.system_prompts.count(NUGGET_SUPPORT_SYSTEM) == 3 * answers
+    assert NUGGET_AGREEMENT_SYSTEM not in support_provider.system_prompts
+
+
+def test_answer_major_falls_back_on_parse_failure():
+    # The YES provider answers the sentence lists with YES, which is not a list
+    options = EvaluationOptions(answer_major=True)
+    assert evaluate_report(REPORT, NUGGETS, ModelProvider.YES, options=options) == \
+        evaluate_report(REPORT, NUGGETS, ModelProvider.YES)
+    counts = options.stats()["counts"]
+    assert counts["answer_major_fallbacks"] == counts["answer_major_prompts"] > 0
+
+
+def test_answer_major_failed_fallback_is_a_sentence_error(support_provider, monkeypatch):
+    failing = "Suicides rose by 3.7% in 2020."
+    original_invoke = support_provider.invoke
+
+    def invoke(messages):
+        system, prompt = messages[0].content, messages[1].content
+        if system == NUGGET_SUPPORT_SYSTEM:
+            return SystemMessage(content="not a list")
+        if system == NUGGET_AGREEMENT_SYSTEM and f"Sentence: {failing}" in prompt:
+            raise RuntimeError("model unavailable")
+        return original_invoke(messages)
+
+    monkeypatch.setattr(support_provider, 'invoke', invoke)
+    monkeypatch.setattr(utils, 'retry_delay', lambda *args: 0)
+    expected = evaluate_report(REPORT, NUGGETS, ModelProvider.TOGETHER)
+    options = EvaluationOptions(answer_major=True)
+    for evaluation in [
+        evaluate_report(REPORT, NUGGETS, ModelProvider.TOGETHER, options=options),
+        asyncio.run(evaluate_report_async(REPORT, NUGGETS, ModelProvider.TOGETHER, options=options)),
+        evaluate_reports_by_sentence([REPORT], NUGGETS, ModelProvider.TOGETHER, options=options)[0],
+    ]:
+        results = evaluation["sentence_results"]
+        assert results[1]["score"] == 0 and "model unavailable" in results[1]["error"]
+        assert "pending_nugget_check" not in results[1]
+        for result, sentence_major in zip(results, expected["sentence_results"]):
+            if result is not results[1]:
+                assert result == sentence_major
+    assert options.stats()["counts"]["answer_major_errors"] == 3
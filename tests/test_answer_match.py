@@ -0,0 +1,99 @@
+import asyncio
+
+from langchain.schema import SystemMessage
+
+from report_gen_eval import ModelProvider, utils
+from report_gen_eval.answer_match import ANSWER_MATCH_EVALUATOR, answer_tokens, contains_tokens, literal_tokens
+from report_gen_eval.citations import DocTable
+from report_gen_eval.evaluator import check_nugget_matches, check_nugget_matches_async, evaluate_report
+from report_gen_eval.options import EvaluationOptions
+from report_gen_eval.prompts import NUGGET_AGREEMENT_SYSTEM
+
+NUGGETS = [
+    {"question_text": "How much did suicides rise by in 2020?", "info": {"importance": "vital"},
+     "gold_answers": [{"answer": "3.7%"}, {"answer": "by 750"}]},
+    {"question_text": "When did suicides peak?", "info": {"importance": "okay"},
+     "gold_answers": [{"answer": "October 2020"}]},
+]
+
+
+def matches(sentence, answer):
+    span = answer_tokens(answer)
+    return span is not None and contains_tokens(literal_tokens(sentence), span)
+
+
+def test_literal_matching():
+    assert matches("A total of 20919 people died.", "20,919")
+    assert matches("Suicides rose 3.7 percent.", "3.7%")
+    assert matches("Suicides rose 3.70 per cent.", "3.7%")
+    assert matches("They peaked in Oct. 2020.", "October 2020")
+    assert matches("83% of respondents agreed.", "Approximately 83%")
+    assert matches("It happened on the 1st of May.", "1 of may")
+    assert matches("The UNITED Nations said so.", "United Nations")
+    assert not matches("Suicides rose 13.7%.", "3.7%")
+    assert not matches("Suicides rose 3.7 times.", "3.7%")
+    assert not matches("China invested heavily.", "China")
+    assert answer_tokens("A long answer that goes on for far too many words") is None
+
+
+def test_literal_matches_skip_the_model():
+    sentence = "Suicides rose by 3.7% and peaked in Oct 2020."
+    options = EvaluationOptions(answer_match=True)
+    # The NO provider rejects every pair it is asked about
+    assert check_nugget_matches(sentence, NUGGETS, ModelProvider.NO) == []
+    matched = check_nugget_matches(sentence, NUGGETS, ModelProvider.NO, options=options)
+    assert [(m["matched_answer"], m["evaluator"]) for m in matched] == [
+        ("3.7%", ANSWER_MATCH_EVALUATOR), ("October 2020", ANSWER_MATCH_EVALUATOR)]
+    assert asyncio.run(check_nugget_matches_async(sentence, NUGGETS, ModelProvider.NO, options=options)) == matched
+    assert options.stats()["counts"] == {"answer_match_pairs": 6, "answer_match_hits": 4}
+
+    # Model matches keep the usual record
+    yes = check_nugget_matches(sentence, NUGGETS, ModelProvider.YES, options=EvaluationOptions(answer_match=True))
+    assert [m.get("evaluator") for m in yes] == [ANSWER_MATCH_EVALUATOR, None, ANSWER_MATCH_EVALUATOR]
+
+
+def test_literal_matches_with_answer_major():
+    table = DocTable()
+    table.add('D1', 'test', 'Title: one\n\nContent: first document')
+    report = {
+        "request_id": "300", "run_id": "test", "collection_ids": ["test"],
+        "sentences": [{"text": "Suicides rose by 3.7% in 2020.", "citations": ["D1"]},
+                      {"text": "It was not a good year.", "citations": []}],
+    }
+    nuggets = 'assets/example_nuggets_fix.jsonl'
+    options = EvaluationOptions(answer_major=True, answer_match=True)
+    full = evaluate_report(report, nuggets, ModelProvider.YES, options=EvaluationOptions(answer_match=True),
+                           doc_table=table)
+    assert evaluate_report(report, nuggets, ModelProvider.YES, options=options, doc_table=table) == full
+    counts = options.stats()["counts"]
+    assert counts["answer_match_hits"] == 1
+    # The negative sentence is judged against every answer
+    assert counts["answer_major_pairs"] == 2 * counts["answer_match_pairs"] - 1
+    assert full["sentence_results"][0]["matched_nuggets"][0]["evaluator"] == ANSWER_MATCH_EVALUATOR
+
+
+def test_negated_sentences_are_not_matched_literally(monkeypatch):
+    sentence = "There is no evidence the rate was 3.7%."
+    options = EvaluationOptions(answer_match=True)
+    assert check_nugget_matches(sentence, NUGGETS, ModelProvider.NO, options=options)
+    assert check_nugget_matches(sentence, NUGGETS, ModelProvider.NO, options=options, kind="negative") == []
+    assert asyncio.run(
+        check_nugget_matches_async(sentence, NUGGETS, ModelProvider.NO, options=options, kind="negative")
+    ) == []
+
+    # The sentence is negative, and the model finds no nugget confirming it
+    original = utils.YesProvider.invoke
+
+    def invoke(self, messages):
+        if messages[0].content == NUGGET_AGREEMENT_SYSTEM:
+            return SystemMessage(content="NO")
+        return original(self, messages)
+
+    monkeypatch.setattr(utils.YesProvider, 'invoke', invoke)
+    report = {"request_id": "300", "run_id": "test", "collection_ids": ["test"],
+              "sentences": [{"text": sentence, "citations": []}]}
+    nuggets = 'assets/example_nuggets_fix.jsonl'
+    for options in [EvaluationOptions(answer_match=True), EvaluationOptions(answer_match=True, answer_major=True)]:
+        result, = evaluate_report(report, nuggets, ModelProvider.YES, options=options)["sentence_results"]
+        assert result["evaluation_details"]["is_negative"]
+        assert result["matched_nuggets"] == [] and result["score"] == -1
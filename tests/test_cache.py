@@ -0,0 +1,71 @@
+from langchain.schema import SystemMessage
+
+from report_gen_eval import utils
+from report_gen_eval.cache import JudgmentCache, configure_judgment_cache, disable_judgment_cache
+from report_gen_eval.utils import get_model_response, batch_model_responses, ModelProvider
+
+
+def test_make_key_depends_on_every_field():
+    key = JudgmentCache.make_key('together', 'm', 'sys', 'user', {'temperature': 0})
+    assert key == JudgmentCache.make_key('together', 'm', 'sys', 'user', {'temperature': 0})
+    assert key != JudgmentCache.make_key('openai', 'm', 'sys', 'user', {'temperature': 0})
+    assert key != JudgmentCache.make_key('together', 'm', 'sys', 'other', {'temperature': 0})
+    assert key != JudgmentCache.make_key('together', 'm', 'sys', 'user', {'temperature': 1})
+
+
+def test_cache_hit_and_miss(tmp_path):
+    cache = JudgmentCache(str(tmp_path / 'cache.sqlite'))
+    assert cache.get('k') is None
+    cache.put('k', 'YES')
+    assert cache.get('k') == 'YES'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['writes'], stats['entries']) == (1, 1, 1, 1)
+
+
+def test_cache_persists_across_instances(tmp_path):
+    JudgmentCache(str(tmp_path / 'cache.sqlite')).put('k', 'NO')
+    assert JudgmentCache(str(tmp_path / 'cache.sqlite')).get('k') == 'NO'
+
+
+def test_cache_evicts_to_max_entries(tmp_path):
+    cache = JudgmentCache(str(tmp_path / 'cache.sqlite'), max_entries=2)
+    for key in ['a', 'b', 'c']:
+        cache.put(key, 'YES')
+    assert cache.evict() == 1
+    assert len(cache) == 2
+    assert cache.get('a') is None
+
+
+def test_cache_expires_old_entries(tmp_path):
+    cache = JudgmentCache(str(tmp_path / 'cache.sqlite'), max_age=-1)
+    cache.put('k', 'YES')
+    assert cache.get('k') is None
+    assert cache.evict() == 1
+
+
+def test_model_responses_use_cache(tmp_path):
+    cache = configure_judgment_cache(str(tmp_path / 'cache.sqlite'))
+    try:
+        assert get_model_response('sys', 'user', ModelProvider.YES) == 'YES'
+        assert batch_model_responses('sys', ['user', 'other'], ModelProvider.YES) == ['YES', 'YES']
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 2)
+    finally:
+        disable_judgment_cache()
+
+
+def test_malformed_responses_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils.YesProvider, 'invoke', lambda self, messages: SystemMessage(content='I think yes'))
+    cache = configure_judgment_cache(str(tmp_path / 'cache.sqlite'))
+    try:
+        assert get_model_response('sys', 'user', ModelProvider.YES) == 'I THINK YES'
+        assert cache.stats()['entries'] == 0
+        # Structured prompts parse their own responses, so they are cached raw
+        get_model_response('sys', 'user', ModelProvider.YES, structured=True)
+        assert cache.stats()['entries'] == 1
+        # A malformed answer already in the cache is not served to YES/NO callers
+        monkeypatch.setattr(utils.YesProvider, 'invoke', lambda self, messages: SystemMessage(content='YES'))
+        assert get_model_response('sys', 'user', ModelProvider.YES) == 'YES'
+        assert batch_model_responses('sys', ['user'], ModelProvider.YES) == ['YES']
+    finally:
+        disable_judgment_cache()
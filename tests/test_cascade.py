@@ -0,0 +1,110 @@
+import asyncio
+
+import numpy as np
+
+from report_gen_eval import ModelProvider
+from report_gen_eval.cache import JudgmentCache
+from report_gen_eval.cascade import (
+    CASCADE_EVALUATOR,
+    CASCADE_JUDGMENTS,
+    Cascade,
+    LogisticModel,
+    cascade_agreement,
+    is_held_out,
+    prompt_sentence,
+    train_cascade,
+)
+from report_gen_eval.evaluator import evaluate_sentence, evaluate_sentence_async
+from report_gen_eval.options import EvaluationOptions
+
+SUBJECTS = ["The study", "The ministry", "The survey", "The company", "The court", "The agency",
+            "The report", "The union", "The council", "The team", "The hospital", "The bank"]
+NEGATIVE = ["did not find any change in {}", "found no evidence of {}", "never reported {}"]
+POSITIVE = ["found a large increase in {}", "reported strong growth in {}", "documented {}"]
+TOPICS = ["suicides", "exports", "rainfall", "prices", "enrolment"]
+
+
+def fill_cache(path):
+    cache = JudgmentCache(str(path))
+    system, template = CASCADE_JUDGMENTS["check_negative"]
+    for subject in SUBJECTS:
+        for topic in TOPICS:
+            for patterns, response in ((NEGATIVE, "YES"), (POSITIVE, "NO")):
+                for pattern in patterns:
+                    sentence = f"{subject} {pattern.format(topic)}."
+                    prompt = template.format(sentence=sentence)
+                    cache.put(JudgmentCache.make_key("together", "m", system, prompt), response,
+                              "together", "m", system, prompt)
+    # Prompts from an older template are skipped
+    cache.put("old", "YES", "together", "m", system, "Is this negative? The study found nothing.")
+    return cache
+
+
+def test_prompt_sentence():
+    for system, template in CASCADE_JUDGMENTS.values():
+        assert prompt_sentence(template, template.format(sentence="It rained.")) == "It rained."
+        assert prompt_sentence(template, "Sentence: It rained.") is None
+
+
+def test_train_cascade(tmp_path):
+    cascade, report = train_cascade(fill_cache(tmp_path / 'cache.sqlite'), threshold=0.8)
+    assert list(cascade.models) == ["check_negative"]
+    examples = cascade.metadata["examples"]["check_negative"]
+    assert examples["train"] + examples["held_out"] == len(SUBJECTS) * len(TOPICS) * 6
+    held_out = report["judgments"]["check_negative"]
+    assert held_out["examples"] == examples["held_out"] > 0
+    assert held_out["coverage"] > 0.5
+    assert held_out["agreement"] >= 0.9
+
+    cascade.save(str(tmp_path / 'cascade.npz'))
+    loaded = Cascade.load(str(tmp_path / 'cascade.npz'), threshold=0.8)
+    sentences = ["The panel found no evidence of fraud.", "The panel reported strong growth in sales."]
+    assert np.allclose(loaded.models["check_negative"].predict(sentences),
+                       cascade.models["check_negative"].predict(sentences))
+    assert [loaded.answer("check_negative", s) for s in sentences] == ["YES", "NO"]
+    assert loaded.describe()["examples"] == cascade.metadata["examples"]
+    assert loaded.describe()["holdout"] == 0.2
+
+
+def test_agreement_skips_training_sentences(tmp_path):
+    cache = fill_cache(tmp_path / 'cache.sqlite')
+    cascade, report = train_cascade(cache, threshold=0.8)
+    assert cascade.metadata["training_cache"] == str(tmp_path / 'cache.sqlite')
+    held_out = cascade_agreement(cascade, cache)
+    assert held_out["judgments"] == report["judgments"]
+    assert held_out["holdout"] == 0.2 and not held_out["include_training"]
+
+    everything = cascade_agreement(cascade, cache, include_training=True)
+    assert everything["judgments"]["check_negative"]["examples"] == len(SUBJECTS) * len(TOPICS) * 6
+    # Other caches are also restricted to the held-out sentences
+    other = JudgmentCache(str(tmp_path / 'other.sqlite'))
+    system, template = CASCADE_JUDGMENTS["check_negative"]
+    sentences = [f"The panel found no evidence of {topic}." for topic in TOPICS + ["fraud", "floods", "losses"]]
+    for sentence in sentences:
+        prompt = template.format(sentence=sentence)
+        other.put(JudgmentCache.make_key("together", "m", system, prompt), "YES", "together", "m", system, prompt)
+    checked = cascade_agreement(cascade, other)["judgments"]
+    held = sum(is_held_out(sentence, 0.2) for sentence in sentences)
+    assert checked.get("check_negative", {"examples": 0})["examples"] == held < len(sentences)
+
+
+def test_cascade_answers_locally():
+    # A model that is always sure the sentence is negative
+    always_yes = LogisticModel(np.zeros(16), bias=10.0)
+    kwargs = dict(sentence="Suicides did not fall.", provider=ModelProvider.NO)
+    assert evaluate_sentence(**kwargs)["evaluation_details"]["is_negative"] is False
+    for speculative in (False, True):
+        options = EvaluationOptions(speculative=speculative, cascade=Cascade({"check_negative": always_yes}))
+        for result in (evaluate_sentence(options=options, **kwargs),
+                       asyncio.run(evaluate_sentence_async(options=options, **kwargs))):
+            assert result["evaluation_details"]["is_negative"] is True
+            assert result["evaluation_details"]["model_responses"] == [
+                {"type": "check_negative", "response": "YES", "evaluator": CASCADE_EVALUATOR}]
+        # Only requires_citation is still issued speculatively (and wasted)
+        expected = {"speculative_calls": 2, "speculative_wasted": 2} if speculative else {}
+        assert options.stats()["counts"] == {"cascade_local": 2, **expected}
+
+    # Unsure answers go to the provider
+    unsure = EvaluationOptions(cascade=Cascade({"check_negative": LogisticModel(np.zeros(16))}))
+    assert evaluate_sentence(options=unsure, **kwargs) == evaluate_sentence(**kwargs)
+    assert unsure.stats()["counts"] == {"cascade_escalated": 1}
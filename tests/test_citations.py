@@ -0,0 +1,86 @@
+import os
+import pickle
+
+import pytest
+
+from report_gen_eval import evaluator, utils
+from report_gen_eval.citations import DocTable, cited_doc_ids, format_citation_text, resolve_citations
+from report_gen_eval.routing import routing_index
+from report_gen_eval.docstore import DocumentStore, mapping_path, store_path, write_store
+
+
+def doc(i):
+    return {'title': f'Title {i}', 'text': f'Text {i}'}
+
+
+@pytest.fixture
+def lookup_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    utils.document_cache.clear()
+    routing_index.clear()
+    os.makedirs('neuclir-docs-lookup')
+    # zh is a converted store, ru is a pickle, fa does not exist
+    write_store({'Z1': doc('Z1'), 'Z2': doc('Z2')}.items(), store_path('neuclir/1/zh'))
+    with open(mapping_path('neuclir/1/ru'), 'wb') as f:
+        pickle.dump({'R1': doc('R1')}, f)
+    yield tmp_path
+    utils.document_cache.clear()
+    routing_index.clear()
+
+
+def report(collections, *citations):
+    return {'request_id': '1', 'run_id': 'r', 'collection_ids': collections,
+            'sentences': [{'text': f's{i}', 'citations': list(c)} for i, c in enumerate(citations)]}
+
+
+def test_cited_doc_ids():
+    assert cited_doc_ids(report(['x'], ['A', 'B'], [], ['B', 'C'])) == ['A', 'B', 'C']
+    assert cited_doc_ids({'sentences': [{'text': 's', 'citations': 'A'}]}) == []
+
+
+def test_resolve_citations_across_collections(lookup_dir):
+    reports = [report(['neuclir/1/zho', 'neuclir/1/rus'], ['Z1', 'R1'], ['Z2']),
+               report(['neuclir/1/ru'], ['R1', 'MISSING'])]
+    table = resolve_citations(reports)
+    assert table.get('Z1', 'neuclir/1/zh') == format_citation_text('Title Z1', 'Text Z1')
+    assert table.get('R1', 'neuclir/1/rus') == format_citation_text('Title R1', 'Text R1')
+    # R1 was looked up in zh first and recorded as missing there
+    assert table.has('R1', 'neuclir/1/zh') and table.get('R1', 'neuclir/1/zh') is None
+    # Z1 was found in zh, so ru was never consulted
+    assert not table.has('Z1', 'neuclir/1/ru')
+    assert len(table) == 3
+    assert table.stats['cited_documents'] == 4
+    assert table.stats['resolved'] == 3
+    assert table.stats['unresolved'] == 1
+    assert table.stats['collections']['neuclir/1/zh']['requested'] == 3
+    assert table.stats['collections']['neuclir/1/zh']['found'] == 2
+    assert table.stats['collections']['neuclir/1/ru']['requested'] == 2
+
+
+def test_resolve_citations_missing_collection(lookup_dir):
+    table = resolve_citations([report(['neuclir/1/fa', 'neuclir/1/zh'], ['Z1'])])
+    assert 'neuclir/1/fa' in table.stats['failed_collections']
+    assert not table.has('Z1', 'neuclir/1/fa')
+    assert table.get('Z1', 'neuclir/1/zh') is not None
+
+
+def test_extract_citation_texts_uses_doc_table(monkeypatch):
+    table = DocTable()
+    table.add('D1', 'neuclir/1/zh', None)
+    table.add('D1', 'neuclir/1/ru', 'resolved text')
+
+    def lookup(doc_id, collection):
+        raise AssertionError('unexpected lookup')
+
+    monkeypatch.setattr(evaluator, 'get_text_from_id_fast', lookup)
+    r = report(['neuclir/1/zh', 'neuclir/1/ru'], ['D1'])
+    assert evaluator.extract_citation_texts(0, r, r['sentences'][0], table) == \
+        [{'doc_id': 'D1', 'text': 'resolved text'}]
+
+
+def test_store_get_many_reads_each_block_once(tmp_path):
+    write_store(((f'd{i}', doc(i)) for i in range(50)), tmp_path / 'store', block_size=10)
+    store = DocumentStore(tmp_path / 'store')
+    found = store.get_many(['d49', 'd0', 'd1', 'missing', 'd25'])
+    assert found == {'d0': doc(0), 'd1': doc(1), 'd25': doc(25), 'd49': doc(49)}
+    assert store.stats()['block_reads'] == 3
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+from report_gen_eval.concurrency import AdaptiveConcurrencyLimiter, is_overload_error, \
+    configure_adaptive_concurrency, disable_adaptive_concurrency, get_concurrency_limiter, get_concurrency_stats
+
+
+def test_is_overload_error():
+    assert is_overload_error(RuntimeError('Error code: 429 - too many requests'))
+    assert is_overload_error(TimeoutError())
+    assert is_overload_error(RuntimeError('Request timed out.'))
+    assert not is_overload_error(ValueError('Invalid model response'))
+
+
+def test_limit_increases_after_a_window_of_healthy_calls():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=4)
+    for _ in range(2):
+        limiter.release(limiter.acquire(), latency=0.1)
+    assert limiter.limit == 3
+    for _ in range(3):
+        limiter.release(limiter.acquire(), latency=0.1)
+    assert limiter.limit == 4
+    assert [entry[1:] for entry in limiter.stats()['history']] == [[2, 'initial'], [3, 'increase'], [4, 'increase']]
+
+
+def test_slow_calls_do_not_increase_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, latency_target=1.0)
+    for _ in range(4):
+        limiter.release(limiter.acquire(), latency=5.0)
+    assert limiter.limit == 2
+
+
+def test_overload_burst_decreases_limit_once():
+    limiter = AdaptiveConcurrencyLimiter(initial=8)
+    tokens = [limiter.acquire() for _ in range(4)]
+    for token in tokens:
+        limiter.release(token, latency=0.1, error=RuntimeError('429'))
+    assert limiter.limit == 4
+    limiter.release(limiter.acquire(), latency=0.1, error=RuntimeError('429'))
+    assert limiter.limit == 2
+    assert limiter.stats()['overloads'] == 5
+
+
+def test_acquire_blocks_at_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial=1)
+    token = limiter.acquire()
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+    limiter.release(token, latency=0.1)
+    thread.join(1)
+    assert acquired.is_set()
+
+
+def test_acquire_async_waits_for_a_slot():
+    limiter = AdaptiveConcurrencyLimiter(initial=1)
+
+    async def run():
+        token = await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0.02)
+        assert not waiter.done()
+        limiter.release(token, latency=0.1)
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(run())
+
+
+def test_limiters_are_disabled_by_default():
+    disable_adaptive_concurrency()
+    assert get_concurrency_limiter('together', 'm') is None
+    configure_adaptive_concurrency(initial=3)
+    try:
+        assert get_concurrency_limiter('together', 'm') is get_concurrency_limiter('together', 'm')
+        assert get_concurrency_stats()['together/m']['limit'] == 3
+    finally:
+        disable_adaptive_concurrency()
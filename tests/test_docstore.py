@@ -0,0 +1,137 @@
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from report_gen_eval import utils, docstore
+from report_gen_eval.docstore import DocumentCache, DocumentStore, SingleFlight, convert_pickle, write_store, \
+    store_path, mapping_path
+
+
+def documents(count):
+    return {f'doc-{i}': {'title': f'Title {i}', 'text': f'Text of document {i} 文本'} for i in range(count)}
+
+
+@pytest.mark.parametrize('block_size,compress', [(1, True), (4, True), (4, False), (100, True)])
+def test_store_round_trip(tmp_path, block_size, compress):
+    docs = documents(10)
+    assert write_store(docs.items(), tmp_path / 'store', block_size=block_size, compress=compress) == 10
+    store = DocumentStore(tmp_path / 'store')
+    assert len(store) == 10
+    for docid, doc in docs.items():
+        assert store.get(docid) == doc
+    assert store.get('missing') is None
+    assert 'doc-3' in store and 'missing' not in store
+    store.close()
+
+
+def test_store_reads_blocks_lazily(tmp_path):
+    write_store(documents(100).items(), tmp_path / 'store', block_size=10)
+    store = DocumentStore(tmp_path / 'store', block_cache_size=2)
+    store.get('doc-0')
+    store.get('doc-1')
+    store.get('doc-55')
+    stats = store.stats()
+    assert stats['block_reads'] == 2
+    assert stats['block_hits'] == 1
+    store.get('doc-95')
+    assert store.stats()['cached_blocks'] == 2
+
+
+def test_empty_store(tmp_path):
+    write_store([], tmp_path / 'store')
+    store = DocumentStore(tmp_path / 'store')
+    assert len(store) == 0
+    assert store.get('doc-0') is None
+
+
+def test_convert_pickle_next_to_pickle(tmp_path):
+    pickle_file = tmp_path / 'doc_mapping_neuclir_1_zh.pkl'
+    with open(pickle_file, 'wb') as f:
+        pickle.dump(documents(5), f)
+    assert convert_pickle(str(pickle_file)) == 5
+    store = DocumentStore(tmp_path / 'doc_store_neuclir_1_zh')
+    assert store.get('doc-4')['title'] == 'Title 4'
+
+
+def test_get_text_from_id_fast_prefers_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    utils.document_cache.clear()
+    os.makedirs('neuclir-docs-lookup')
+    # No pickle exists, so the lookup can only succeed through the store
+    write_store(documents(3).items(), store_path('neuclir/1/zh'))
+    assert utils.get_text_from_id_fast('doc-2', 'neuclir/1/zho') == ('Title 2', 'Text of document 2 文本')
+    assert utils.get_text_from_id_fast('missing', 'neuclir/1/zh') == (None, None)
+    stats = utils.get_document_cache_stats()
+    assert stats['lookups'] == 2 and stats['misses'] == 1
+    assert stats['collections']['neuclir/1/zh']['backend'] == 'store'
+    utils.document_cache.clear()
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return 'value'
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        first = executor.submit(flight.do, 'key', loader)
+        started.wait()
+        others = [executor.submit(flight.do, 'key', loader) for _ in range(7)]
+        assert first.result() == 'value'
+        assert [f.result() for f in others] == ['value'] * 7
+    assert len(calls) == 1
+    assert flight.shared == 7
+
+
+def test_single_flight_shares_errors_and_retries():
+    flight = SingleFlight()
+
+    def fail():
+        raise OSError('boom')
+
+    with pytest.raises(OSError):
+        flight.do('key', fail)
+    # A failed call is not remembered
+    assert flight.do('key', lambda: 1) == 1
+
+
+def test_document_cache_loads_pickle_once(tmp_path, monkeypatch):
+    with open(mapping_path('neuclir/1/fa', str(tmp_path)), 'wb') as f:
+        pickle.dump(documents(3), f)
+    loads = []
+    real_load = pickle.load
+
+    def slow_load(f):
+        loads.append(1)
+        time.sleep(0.2)
+        return real_load(f)
+
+    monkeypatch.setattr(docstore.pickle, 'load', slow_load)
+    cache = DocumentCache(str(tmp_path))
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        docs = list(executor.map(lambda i: cache.get(f'doc-{i % 3}', 'neuclir/1/fas'), range(10)))
+    assert len(loads) == 1
+    assert docs[4] == documents(3)['doc-1']
+    stats = cache.stats()
+    assert stats['lookups'] == 10
+    assert stats['collections']['neuclir/1/fa']['backend'] == 'pickle'
+
+    cache.clear('neuclir/1/fa')
+    assert cache.stats()['collections'] == {}
+    cache.get('doc-0', 'neuclir/1/fa')
+    assert len(loads) == 2
+
+
+def test_document_cache_missing_collection(tmp_path):
+    cache = DocumentCache(str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        cache.get('doc-0', 'neuclir/1/ru')
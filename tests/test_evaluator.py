@@ -1,7 +1,12 @@
+import asyncio
+
 from report_gen_eval import ModelProvider
 from report_gen_eval.evaluator import empty_response, check_citations_relevance_detail, process_w_citations, \
-    process_citation_relevancy, load_nuggets, filter_nuggets, check_nugget_matches, process_nuggets
-from report_gen_eval.utils import load_jsonl
+    process_citation_relevancy, load_nuggets, filter_nuggets, check_nugget_matches, process_nuggets, \
+    evaluate_report, evaluate_report_async, evaluate_sentence, evaluate_sentence_async, finalize_sentence_result, \
+    collect_matched_nuggets, citation_relevance_context
+from report_gen_eval.options import EvaluationOptions
+from report_gen_eval.utils import DROPPED_RESPONSE, load_jsonl
 
 
 def test_empty_response():
@@ -380,3 +385,89 @@ def test_process_nuggets():
             },
         ],
     }
+
+
+UNCITED_REPORT = {
+    "request_id": "300",
+    "run_id": "test",
+    "collection_ids": ["test"],
+    "sentences": [
+        {"text": "Suicides in Japan did not fall in 2020.", "citations": []},
+        {"text": "Suicides rose by 3.7% in 2020.", "citations": []},
+    ],
+}
+
+
+def test_evaluate_sentence_async_matches_sync():
+    for provider in [ModelProvider.YES, ModelProvider.NO]:
+        kwargs = dict(sentence='this is a test sentence',
+                      citation_content=['this is a test citation'],
+                      nuggets=load_nuggets('assets/example_nuggets_fix.jsonl',
+                                           load_jsonl('assets/example_input_one_only.jsonl')[0],
+                                           False),
+                      provider=provider)
+        assert asyncio.run(evaluate_sentence_async(**kwargs)) == evaluate_sentence(**kwargs)
+
+
+def test_evaluate_report_async_matches_sync():
+    for provider in [ModelProvider.YES, ModelProvider.NO]:
+        expected = evaluate_report(UNCITED_REPORT, 'assets/example_nuggets_fix.jsonl', provider)
+        assert asyncio.run(
+            evaluate_report_async(UNCITED_REPORT, 'assets/example_nuggets_fix.jsonl', provider)
+        ) == expected
+
+
+def test_evaluate_report_metrics():
+    result = evaluate_report(UNCITED_REPORT, 'assets/example_nuggets_fix.jsonl', ModelProvider.YES)
+    assert [r["score"] for r in result["sentence_results"]] == [1, 1]
+    assert result["metrics"]["recall"] == 1.0
+    assert result["metrics"]["precision"] == 1.0
+
+
+def cited_result(*texts):
+    return {"citation_details": {"citation_texts": list(texts)}}
+
+
+def test_finalize_sentence_result_dedups_citations():
+    citation_documents, citation_keys = {}, {}
+    first = finalize_sentence_result(cited_result('doc a', 'doc b'), 0, citation_documents, citation_keys)
+    second = finalize_sentence_result(cited_result('doc b', 'doc c', 'doc a'), 1, citation_documents, citation_keys)
+    assert first["citation_indices"] == ['citation_0', 'citation_1']
+    assert second["citation_indices"] == ['citation_1', 'citation_2', 'citation_0']
+    assert citation_documents == {'citation_0': 'doc a', 'citation_1': 'doc b', 'citation_2': 'doc c'}
+
+
+def test_finalize_sentence_result_without_reverse_index():
+    citation_documents = {'citation_0': 'doc a'}
+    result = finalize_sentence_result(cited_result('doc b', 'doc a'), 3, citation_documents)
+    assert result["citation_indices"] == ['citation_1', 'citation_0']
+    assert result["sentence_index"] == 3
+
+
+def test_collect_matched_nuggets_dedups():
+    nugget_map = [{"question_text": "q1", "matched_answer": "a"},
+                  {"question_text": "q1", "matched_answer": "a"},
+                  {"question_text": "q1", "matched_answer": "b"},
+                  {"question_text": "q2", "matched_answer": "a"}]
+    assert collect_matched_nuggets(['YES', 'YES', 'NO', 'YES'], nugget_map) == [nugget_map[0], nugget_map[3]]
+
+
+def test_citation_relevance_stops_on_first_no():
+    options = EvaluationOptions()
+    result = evaluate_sentence('this is a test sentence', citation_content=['doc a', 'doc b', 'doc c'],
+                               provider=ModelProvider.NO, options=options)
+    assert result["score"] == -1
+    context = result["evaluation_details"]["model_responses"][0]["context"]
+    assert context["num_citations"] == 3
+    assert context["judged_citations"]
+    assert sorted(context["judged_citations"] + context["dropped_citations"]
+                  + context["skipped_citations"]) == [0, 1, 2]
+    counts = options.stats()["counts"]
+    assert counts["relevance_judged"] + counts["relevance_dropped"] + counts["relevance_skipped"] == 3
+
+
+def test_citation_relevance_context():
+    options = EvaluationOptions()
+    assert citation_relevance_context(['YES', None, 'NO', DROPPED_RESPONSE], options) == \
+        {"num_citations": 4, "judged_citations": [0, 2], "dropped_citations": [3], "skipped_citations": [1]}
+    assert options.stats()["counts"] == {"relevance_judged": 2, "relevance_dropped": 1, "relevance_skipped": 1}
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from langchain.schema import SystemMessage
+
+from report_gen_eval import ModelProvider, utils
+from report_gen_eval.evaluator import evaluate_report
+from report_gen_eval.history import agreement, history_windows, report_history, select_history
+from report_gen_eval.options import EvaluationOptions
+from report_gen_eval.prompts import CHECK_NEGATIVE_SYSTEM, FIRST_INSTANCE_SYSTEM
+
+NUGGETS = 'assets/example_nuggets_fix.jsonl'
+
+SENTENCES = [
+    "Suicides in Japan rose by 3.7% in 2020.",
+    "Lumber prices doubled last spring.",
+    "The pandemic closed schools across Europe.",
+    "In 2020, suicides in Japan rose by 3.7 percent.",
+]
+
+REPORT = {
+    "request_id": "300",
+    "run_id": "test",
+    "collection_ids": ["test"],
+    "sentences": [{"text": text, "citations": []} for text in SENTENCES],
+}
+
+
+class FirstInstanceProvider:
+    """Judges every sentence a positive claim requiring a citation, and records first instance prompts."""
+
+    def __init__(self):
+        self.first_instance_prompts = []
+
+    def invoke(self, messages):
+        system, prompt = messages[0].content, messages[1].content
+        if system == FIRST_INSTANCE_SYSTEM:
+            self.first_instance_prompts.append(prompt)
+        return SystemMessage(content="NO" if system == CHECK_NEGATIVE_SYSTEM else "YES")
+
+
+@pytest.fixture
+def first_instance_provider():
+    provider = FirstInstanceProvider()
+    original = utils.build_model
+    utils.build_model = lambda *args, **kwargs: provider
+    utils.model_client_pool.clear()
+    yield provider
+    utils.build_model = original
+    utils.model_client_pool.clear()
+
+
+def test_select_history():
+    scores = np.array([[1.0, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0.9, 0.1, 0.5, 1]])
+    lengths = [10, 10, 30, 10]
+    assert select_history(scores, lengths, 0, top_k=2) == []
+    assert select_history(scores, lengths, 3) == [0, 1, 2]
+    assert select_history(scores, lengths, 3, top_k=2) == [0, 2]
+    # The cap skips the second most similar sentence but not the third
+    assert select_history(scores, lengths, 3, max_tokens=25) == [0, 1]
+    # The most similar sentence is kept even if it does not fit
+    assert select_history(scores, lengths, 3, max_tokens=5) == [0]
+
+
+def test_history_windows_keep_similar_sentences():
+    windows = history_windows(SENTENCES, top_k=1)
+    assert windows[0] is None
+    assert windows[3] == [SENTENCES[0]]
+    assert history_windows(SENTENCES)[3] == SENTENCES[:3]
+    assert report_history(REPORT) == [None] + [SENTENCES[:i] for i in range(1, 4)]
+
+
+def test_bounded_history_in_evaluation(first_instance_provider):
+    options = EvaluationOptions(first_instance_top_k=1)
+    result = evaluate_report(REPORT, NUGGETS, ModelProvider.TOGETHER, options=options)
+    responses = result["sentence_results"][3]["evaluation_details"]["model_responses"]
+    assert responses[-1]["type"] == "first_instance"
+    assert responses[-1]["context"]["num_previous_sentences"] == 1
+    assert len(first_instance_provider.first_instance_prompts) == 3
+    last_prompt = first_instance_provider.first_instance_prompts[-1]
+    assert SENTENCES[0] in last_prompt and SENTENCES[1] not in last_prompt
+    counts = options.stats()["counts"]
+    assert counts["history_tokens"] < counts["history_full_tokens"]
+    with pytest.raises(ValueError):
+        EvaluationOptions(first_instance_max_tokens=-1)
+
+
+def test_agreement():
+    comparison = agreement([REPORT], ModelProvider.YES, top_ks=[1, 10], max_tokens=[0])
+    assert comparison["judgments"] == 3
+    assert comparison["first_instances"] == 3
+    top_1, top_10 = comparison["settings"]
+    assert top_1["agreement"] == top_10["agreement"] == 1.0
+    assert top_1["token_fraction"] < 1 and top_10["token_fraction"] == 1
@@ -0,0 +1,99 @@
+import asyncio
+import re
+
+import pytest
+from langchain.schema import SystemMessage
+
+from report_gen_eval import utils
+from report_gen_eval.evaluator import check_nugget_matches, check_nugget_matches_async
+from report_gen_eval.nugget_batch import build_batch_prompt, parse_batch_response
+from report_gen_eval.options import EvaluationOptions
+
+NUGGETS = [
+    {"question_text": "How much did suicides rise by in 2020?", "info": {"importance": "vital"},
+     "gold_answers": [{"answer": "3.7%"}, {"answer": "by 750"}]},
+    {"question_text": "Which group saw the largest increase?", "info": {"importance": "okay"},
+     "gold_answers": [{"answer": "women"}]},
+]
+SENTENCE = "Suicides rose by 3.7% in 2020, mostly among women."
+
+
+class NuggetProvider:
+    """Agrees with the answers that appear in the sentence, in either prompt format."""
+
+    def __init__(self, garble=False):
+        self.garble = garble
+        self.prompts = []
+
+    def invoke(self, messages):
+        prompt = messages[1].content
+        self.prompts.append(prompt)
+        answers = re.findall(r"^(?:\d+\. Question: .*\n)?\s*Answer: (.*)$", prompt.split("Sentence: ")[-1], re.M)
+        if "Nuggets:" in prompt:
+            if self.garble:
+                return SystemMessage(content="1: YES")
+            return SystemMessage(content="\n".join(
+                f"{i}: {'YES' if a in SENTENCE else 'NO'}" for i, a in enumerate(answers, 1)))
+        return SystemMessage(content='YES' if answers[0] in SENTENCE else 'NO')
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+@pytest.fixture
+def provider():
+    def install(**kwargs):
+        provider = NuggetProvider(**kwargs)
+        utils.build_model = lambda *args, **kw: provider
+        utils.model_client_pool.clear()
+        return provider
+
+    original = utils.build_model
+    yield install
+    utils.build_model = original
+    utils.model_client_pool.clear()
+
+
+def test_parse_batch_response():
+    assert parse_batch_response("1: YES\n2: NO\n3. yes", 3) == ["YES", "NO", "YES"]
+    assert parse_batch_response("1: YES\n3: NO", 3) is None
+    assert parse_batch_response("1: YES\n1: NO", 1) is None
+    assert parse_batch_response("1: YES\n4: NO", 1) is None
+    assert parse_batch_response("YES", 1) is None
+
+
+def test_batched_matches_single_item(provider):
+    provider()
+    expected = check_nugget_matches(SENTENCE, NUGGETS, 'nuggets')
+    recording = provider()
+    options = EvaluationOptions(nugget_batch_size=2, nugget_batch_audit=1.0)
+    assert check_nugget_matches(SENTENCE, NUGGETS, 'nuggets', options=options) == expected
+    assert [m["matched_answer"] for m in expected] == ["3.7%", "women"]
+    counts = options.stats()["counts"]
+    assert counts["nugget_batch_prompts"] == 2
+    assert counts["nugget_batch_items"] == 3
+    assert counts["nugget_batch_audited_items"] == counts["nugget_batch_agreements"] == 3
+    # two structured prompts plus three audit prompts
+    assert len(recording.prompts) == 5
+
+
+def test_batched_async(provider):
+    provider()
+    expected = check_nugget_matches(SENTENCE, NUGGETS, 'nuggets')
+    recording = provider()
+    options = EvaluationOptions(nugget_batch_size=10)
+    assert asyncio.run(check_nugget_matches_async(SENTENCE, NUGGETS, 'nuggets', options=options)) == expected
+    assert len(recording.prompts) == 1
+    assert recording.prompts[0] == build_batch_prompt(SENTENCE, [
+        {"question_text": n["question_text"], "matched_answer": a["answer"]}
+        for n in NUGGETS for a in n["gold_answers"]])
+
+
+def test_batched_falls_back_on_parse_failure(provider):
+    provider()
+    expected = check_nugget_matches(SENTENCE, NUGGETS, 'nuggets')
+    recording = provider(garble=True)
+    options = EvaluationOptions(nugget_batch_size=10)
+    assert check_nugget_matches(SENTENCE, NUGGETS, 'nuggets', options=options) == expected
+    assert options.stats()["counts"]["nugget_batch_fallbacks"] == 1
+    assert len(recording.prompts) == 4
@@ -0,0 +1,61 @@
+from report_gen_eval.evaluator import load_nuggets, evaluate_report
+from report_gen_eval.nuggets import NuggetBank, report_src_lang
+from report_gen_eval.utils import load_jsonl, ModelProvider
+
+
+def entry(query_id, question_id, src_lang=None):
+    info = {'importance': 'vital'}
+    if src_lang is not None:
+        info['src_lang'] = src_lang
+    return {'query_id': query_id, 'info': info,
+            'items': [{'query_id': query_id, 'question_id': question_id, 'gold_answers': []}]}
+
+
+def test_bank_lookup_by_query_id():
+    bank = NuggetBank([entry('300', 'a'), entry(301, 'b')])
+    assert len(bank) == 2
+    assert '301' in bank and 301 in bank
+    assert bank.get(300)[0]['question_id'] == 'a'
+    assert bank.get('301')[0]['question_id'] == 'b'
+    assert bank.get('999') is None
+
+
+def test_bank_first_entry_wins():
+    bank = NuggetBank([entry('300', 'first'), entry('300', 'second')])
+    assert bank.get('300')[0]['question_id'] == 'first'
+
+
+def test_bank_lookup_by_src_lang():
+    bank = NuggetBank([entry('300', 'fas', 'fas'), entry('300', 'rus', 'rus')])
+    assert bank.get('300', 'rus')[0]['question_id'] == 'rus'
+    assert bank.get('300', 'fas')[0]['question_id'] == 'fas'
+    # Languages without an entry fall back to the first entry of the query
+    assert bank.get('300', 'zho')[0]['question_id'] == 'fas'
+    assert bank.get('300')[0]['question_id'] == 'fas'
+
+
+def test_report_src_lang():
+    assert report_src_lang({'collection_ids': ['neuclir/1/zh']}) == 'zho'
+    assert report_src_lang({'collection_ids': ['neuclir/1/rus']}) == 'rus'
+    assert report_src_lang({'collection_ids': ['neuclir/1/fa', 'neuclir/1/ru']}) is None
+    assert report_src_lang({}) is None
+
+
+def test_for_report_uses_collection_language():
+    bank = NuggetBank([entry('300', 'fas', 'fas'), entry('300', 'zho', 'zho')])
+    report = {'request_id': '300', 'collection_ids': ['neuclir/1/zh']}
+    assert bank.for_report(report)[0]['question_id'] == 'zho'
+
+
+def test_load_nuggets_bank_matches_file():
+    report = load_jsonl('assets/avengers_report.jsonl')[0]
+    bank = NuggetBank.from_file('assets/avengers_nuggets_fix.jsonl')
+    assert load_nuggets(bank, report, False) == \
+        load_nuggets('assets/avengers_nuggets_fix.jsonl', report, False)
+
+
+def test_evaluate_report_with_bank():
+    report = load_jsonl('assets/example_input_one_only.jsonl')[0]
+    bank = NuggetBank.from_file('assets/example_nuggets_fix.jsonl')
+    assert evaluate_report(report, bank, ModelProvider.YES) == \
+        evaluate_report(report, 'assets/example_nuggets_fix.jsonl', ModelProvider.YES)
@@ -0,0 +1,75 @@
+import asyncio
+import copy
+import json
+
+from report_gen_eval import ModelProvider
+from report_gen_eval.citations import DocTable
+from report_gen_eval.evaluator import evaluate_report, evaluate_report_async
+from report_gen_eval.output import CompactOutput, compact_failure_record, expand_report_result, load_documents, \
+    text_sha256
+from report_gen_eval.utils import save_jsonl
+
+CITED_REPORT = {
+    "request_id": "300",
+    "run_id": "test",
+    "collection_ids": ["test"],
+    "sentences": [
+        {"text": "Suicides in Japan did not fall in 2020.", "citations": ["D1", "D2"]},
+        {"text": "Suicides rose by 3.7% in 2020.", "citations": ["D2"]},
+        {"text": "Nothing cited here.", "citations": []},
+    ],
+}
+
+
+def doc_table():
+    table = DocTable()
+    table.add('D1', 'test', 'Title: one\n\nContent: first document')
+    table.add('D2', 'test', 'Title: two\n\nContent: second document')
+    return table
+
+
+def test_compact_round_trip(tmp_path):
+    expected = evaluate_report(CITED_REPORT, 'assets/example_nuggets_fix.jsonl', ModelProvider.YES,
+                               doc_table=doc_table())
+    compact_output = CompactOutput(export_texts=True)
+    result = evaluate_report(CITED_REPORT, 'assets/example_nuggets_fix.jsonl', ModelProvider.YES,
+                             doc_table=doc_table(), compact_output=compact_output)
+
+    assert result["output_format"] == "compact"
+    refs = result["sentence_results"][0]["citation_details"]["citation_refs"]
+    assert [ref["doc_id"] for ref in refs] == ['D1', 'D2']
+    assert refs[1]["sha256"] == text_sha256('Title: two\n\nContent: second document')
+    assert "citation_texts" not in result["sentence_results"][1]["citation_details"]
+    assert result["citation_documents"]["citation_1"] == refs[1]
+    assert "second document" not in json.dumps(result)
+
+    documents = compact_output.documents()
+    assert [d["doc_id"] for d in documents] == ['D1', 'D2']
+    save_jsonl(documents, str(tmp_path / 'documents.jsonl'))
+    assert expand_report_result(result, load_documents(str(tmp_path / 'documents.jsonl'))) == expected
+
+
+def test_compact_async_matches_sync():
+    expected = evaluate_report(CITED_REPORT, 'assets/example_nuggets_fix.jsonl', ModelProvider.YES,
+                               doc_table=doc_table(), compact_output=CompactOutput())
+    assert asyncio.run(
+        evaluate_report_async(CITED_REPORT, 'assets/example_nuggets_fix.jsonl', ModelProvider.YES,
+                              doc_table=doc_table(), compact_output=CompactOutput())
+    ) == expected
+
+
+def test_compact_output_without_export_keeps_no_texts():
+    compact_output = CompactOutput()
+    compact_output.compact({"sentence_results": [], "citation_documents": {"citation_0": "text"}})
+    assert compact_output.documents() == []
+
+
+def test_compact_failure_record():
+    record = {"report_id": "300", "error": "boom", "report_data": copy.deepcopy(CITED_REPORT)}
+    compact = compact_failure_record(record)
+    assert "report_data" not in compact
+    assert compact["error"] == "boom"
+    assert compact["report_ref"]["num_sentences"] == 3
+    assert compact["report_ref"]["run_id"] == "test"
+    assert compact["report_ref"]["sha256"] == compact_failure_record(record)["report_ref"]["sha256"]
+    assert record["report_data"] == CITED_REPORT
@@ -0,0 +1,91 @@
+import pytest
+from langchain.schema import SystemMessage
+
+from report_gen_eval import ModelProvider, utils
+from report_gen_eval.citations import format_citation_text
+from report_gen_eval.evaluator import evaluate_sentence
+from report_gen_eval.options import EvaluationOptions
+from report_gen_eval.passages import PassageIndex, PassageSelector, split_passages, text_tokens
+from report_gen_eval.prompts import CHECK_RELEVANCE_SYSTEM
+
+SENTENCE = "Suicides in Japan rose by 3.7% in 2020."
+
+PARAGRAPHS = [
+    "Lumber prices doubled last spring as builders rushed to finish houses.",
+    "The central bank kept interest rates unchanged for another quarter.",
+    "Suicides in Japan rose by 3.7% in 2020, the first increase in eleven years.",
+    "Heavy snow closed several mountain roads in the north of the country.",
+]
+
+DOCUMENT = format_citation_text("News of the year", "\n\n".join(PARAGRAPHS * 5))
+
+
+class RelevanceProvider:
+    """Says YES to every judgment and records the relevance prompts."""
+
+    def __init__(self):
+        self.relevance_prompts = []
+
+    def invoke(self, messages):
+        if messages[0].content == CHECK_RELEVANCE_SYSTEM:
+            self.relevance_prompts.append(messages[1].content)
+        return SystemMessage(content="YES")
+
+
+@pytest.fixture
+def relevance_provider():
+    provider = RelevanceProvider()
+    original = utils.build_model
+    utils.build_model = lambda *args, **kwargs: provider
+    utils.model_client_pool.clear()
+    yield provider
+    utils.build_model = original
+    utils.model_client_pool.clear()
+
+
+def test_split_passages():
+    passages = split_passages("\n\n".join(PARAGRAPHS), passage_tokens=40)
+    assert passages == [f"{PARAGRAPHS[0]} {PARAGRAPHS[1]}", f"{PARAGRAPHS[2]} {PARAGRAPHS[3]}"]
+    long_sentence = " ".join(["word"] * 100)
+    assert all(len(p) <= 40 for p in split_passages(long_sentence, passage_tokens=10))
+    assert split_passages("") == []
+
+
+def test_select_most_similar_passage():
+    index = PassageIndex.build(DOCUMENT, passage_tokens=20)
+    assert index.title == "News of the year"
+    assert len(index.passages) == 20
+    kept = index.select(SENTENCE, budget=20)
+    assert len(kept) == 1 and SENTENCE[:-1] in index.passages[kept[0]]
+    shown = index.render(kept)
+    assert shown.startswith("Title: News of the year\n\nContent: ...\n")
+    assert shown.endswith("\n...")
+    # Unrelated passages tie at zero and keep document order
+    assert index.select("漢字", budget=40) == [0, 1]
+
+
+def test_selector_caches_indexes():
+    selector = PassageSelector(budget=40, passage_tokens=20)
+    short = format_citation_text("Short", PARAGRAPHS[2])
+    assert selector.select(SENTENCE, short) is short
+    first = selector.select(SENTENCE, DOCUMENT)
+    assert text_tokens(first) < text_tokens(DOCUMENT) and PARAGRAPHS[2] in first
+    selector.select("Lumber prices doubled.", DOCUMENT)
+    stats = selector.describe()
+    assert stats["indexed_documents"] == 1
+    assert stats["index_misses"] == 1 and stats["index_hits"] == 1
+    with pytest.raises(ValueError):
+        PassageSelector(budget=0)
+
+
+def test_passages_in_relevance_prompts(relevance_provider):
+    options = EvaluationOptions(passages=PassageSelector(budget=40, passage_tokens=20))
+    result = evaluate_sentence(
+        SENTENCE, citation_content=[DOCUMENT], provider=ModelProvider.TOGETHER, options=options
+    )
+    assert result["citation_details"]["citation_texts"] == [DOCUMENT]
+    prompt, = relevance_provider.relevance_prompts
+    assert PARAGRAPHS[2] in prompt and PARAGRAPHS[3] not in prompt
+    counts = options.stats()["counts"]
+    assert counts["passage_shortened"] == counts["passage_documents"] == 1
+    assert counts["passage_tokens"] < counts["passage_full_tokens"]
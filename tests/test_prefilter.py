@@ -0,0 +1,76 @@
+import numpy as np
+
+from report_gen_eval import ModelProvider
+from report_gen_eval.evaluator import evaluate_report, load_nuggets
+from report_gen_eval.options import EvaluationOptions
+from report_gen_eval.prefilter import (
+    calibrate,
+    nugget_items,
+    prune_nuggets,
+    score_pairs,
+    select_pairs,
+)
+
+NUGGETS = 'assets/example_nuggets_fix.jsonl'
+
+REPORT = {
+    "request_id": "300",
+    "run_id": "test",
+    "collection_ids": ["test"],
+    "sentences": [
+        {"text": "Suicides in Japan rose by 3.7% in 2020.", "citations": []},
+        {"text": "Lumber prices doubled last spring.", "citations": []},
+    ],
+}
+
+
+def test_select_pairs():
+    scores = np.array([[0.1, 0.5, 0.3], [0.0, 0.05, 0.2]])
+    assert select_pairs(scores, top_k=1).tolist() == [[False, True, False], [False, False, True]]
+    assert select_pairs(scores, threshold=0.25).tolist() == [[False, True, True], [False, False, False]]
+    assert select_pairs(scores, top_k=1, threshold=0.25).tolist() == [[False, True, True], [False, False, True]]
+    assert select_pairs(scores, top_k=5).all()
+
+
+def test_score_pairs_ranks_related_answers_first():
+    items = [
+        {"question_text": "How does Australia perceive itself?", "matched_answer": "as a middle power"},
+        {"question_text": "How much did suicides in Japan rise by in 2020?", "matched_answer": "3.7%"},
+    ]
+    scores = score_pairs(["Suicides in Japan rose by 3.7% in 2020."], items)
+    assert scores.shape == (1, 2)
+    assert scores[0, 1] > scores[0, 0]
+    assert np.allclose(score_pairs(["same text"], [{"question_text": "same", "matched_answer": "text"}]), 1)
+
+
+def test_prune_nuggets_keeps_every_nugget():
+    nuggets = load_nuggets(NUGGETS, REPORT, False)
+    items = nugget_items(nuggets)
+    pruned = prune_nuggets(nuggets, items, np.zeros(len(items), dtype=bool))
+    assert [n["question_text"] for n in pruned] == [n["question_text"] for n in nuggets]
+    assert all(n["gold_answers"] == [] for n in pruned)
+    assert prune_nuggets(nuggets, items, np.ones(len(items), dtype=bool)) == nuggets
+
+
+def test_prefilter_report():
+    full = evaluate_report(REPORT, NUGGETS, ModelProvider.YES)
+    options = EvaluationOptions(prefilter_top_k=1)
+    filtered = evaluate_report(REPORT, NUGGETS, ModelProvider.YES, options=options)
+    assert [len(s["matched_nuggets"]) for s in filtered["sentence_results"]] == [1, 1]
+    assert filtered["metrics"]["total_nuggets"] == full["metrics"]["total_nuggets"]
+    assert [s["score"] for s in filtered["sentence_results"]] == [s["score"] for s in full["sentence_results"]]
+    counts = options.stats()["counts"]
+    assert counts["prefilter_kept"] == 2
+    assert counts["prefilter_pairs"] == 2 * full["metrics"]["total_nuggets"]
+
+
+def test_calibrate():
+    # Every pair matches with the YES provider, so recall follows the pairs kept
+    calibration = calibrate([REPORT], NUGGETS, ModelProvider.YES, top_ks=[1], thresholds=[2.0])
+    answers = len(nugget_items(load_nuggets(NUGGETS, REPORT, False)))
+    assert calibration["pairs"] == calibration["matched_pairs"] == 2 * answers
+    assert calibration["mean_report_recall"] == 1
+    top_k, threshold = calibration["settings"]
+    assert top_k["pair_recall"] == top_k["kept_fraction"] == 1 / answers
+    assert top_k["answer_recall"] == top_k["mean_report_recall"] <= 2 / answers
+    assert threshold["kept_fraction"] == threshold["answer_recall"] == 0
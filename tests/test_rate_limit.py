@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from report_gen_eval.rate_limit import TokenBucket, ProviderRateLimiter, configure_rate_limits, get_rate_limiter, \
+    reset_rate_limiters, parse_duration
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket()
+    assert all(bucket.reserve() == 0 for _ in range(100))
+
+
+def test_bucket_paces_after_burst():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.09 < bucket.reserve() <= 0.1
+    assert 0.19 < bucket.reserve() <= 0.2
+
+
+def test_bucket_acquire_sleeps():
+    bucket = TokenBucket(rate=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_bucket_acquire_async_sleeps():
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    async def run():
+        for _ in range(3):
+            await bucket.acquire_async()
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_limiter_is_shared_per_provider_and_model():
+    reset_rate_limiters()
+    try:
+        configure_rate_limits('together', requests_per_minute=60)
+        limiter = get_rate_limiter('together', 'm')
+        assert get_rate_limiter('together', 'm') is limiter
+        assert get_rate_limiter('together', 'other') is not limiter
+        assert limiter.requests.rate == 1.0
+        assert get_rate_limiter('openai', 'm').requests.rate is None
+    finally:
+        reset_rate_limiters()
+
+
+def test_parse_duration():
+    assert parse_duration('2') == 2.0
+    assert parse_duration('6m0s') == 360.0
+    assert parse_duration('20ms') == 0.02
+    assert parse_duration('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_duration('soon') is None
+
+
+def test_retry_after_blocks_every_caller():
+    limiter = ProviderRateLimiter()
+    assert limiter.reserve() == 0
+    limiter.record_rate_limited({'Retry-After': '5'})
+    assert 4.9 < limiter.reserve() <= 5
+    assert limiter.stats()['rate_limited'] == 1
+
+
+def test_exhausted_quota_blocks_until_reset():
+    limiter = ProviderRateLimiter()
+    limiter.update_from_headers({'x-ratelimit-remaining-requests': '0',
+                                 'x-ratelimit-reset-requests': '2s'})
+    assert 1.9 < limiter.reserve() <= 2
+
+
+def test_limits_are_learned_from_headers():
+    limiter = ProviderRateLimiter(tokens_per_minute=600)
+    limiter.update_from_headers({'x-ratelimit-limit-requests': '120',
+                                 'x-ratelimit-limit-tokens': '1000000'})
+    assert limiter.requests_per_minute == 120
+    assert limiter.requests.rate == 2.0
+    # configured limits win over advertised ones
+    assert limiter.tokens_per_minute == 600
+
+
+def test_tokens_per_minute_paces_large_requests():
+    limiter = ProviderRateLimiter(tokens_per_minute=600)
+    assert limiter.reserve(tokens=10) == 0
+    assert 0.9 < limiter.reserve(tokens=10) <= 1.0
+    limiter.record_usage(10, 0)
+    assert limiter.reserve(tokens=0) == 0
@@ -0,0 +1,86 @@
+import os
+import pickle
+
+import pytest
+
+from report_gen_eval import evaluator, utils
+from report_gen_eval.citations import resolve_citations
+from report_gen_eval.docstore import mapping_path, store_path, write_store
+from report_gen_eval.routing import BloomFilter, RoutingIndex, build_routing_filter, filter_path, routing_index
+
+
+def doc(i):
+    return {'title': f'Title {i}', 'text': f'Text {i}'}
+
+
+@pytest.fixture
+def lookup_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    utils.document_cache.clear()
+    routing_index.clear()
+    os.makedirs('neuclir-docs-lookup')
+    write_store(((f'Z{i}', doc(i)) for i in range(100)), store_path('neuclir/1/zh'))
+    with open(mapping_path('neuclir/1/ru'), 'wb') as f:
+        pickle.dump({f'R{i}': doc(i) for i in range(100)}, f)
+    build_routing_filter('neuclir/1/zho')
+    build_routing_filter('neuclir/1/ru')
+    yield tmp_path
+    utils.document_cache.clear()
+    routing_index.clear()
+
+
+def test_bloom_filter_membership_and_error_rate(tmp_path):
+    bloom = BloomFilter.for_capacity(1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f'doc-{i}')
+    assert all(f'doc-{i}' in bloom for i in range(1000))
+    false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+    assert false_positives < 300
+
+    bloom.save(str(tmp_path / 'bloom.bin'))
+    loaded = BloomFilter.load(str(tmp_path / 'bloom.bin'))
+    assert loaded.count == 1000
+    assert all(f'doc-{i}' in loaded for i in range(1000))
+
+
+def test_bloom_filter_rejects_other_files(tmp_path):
+    (tmp_path / 'bad.bin').write_bytes(b'x' * 64)
+    with pytest.raises(ValueError):
+        BloomFilter.load(str(tmp_path / 'bad.bin'))
+
+
+def test_route(lookup_dir):
+    index = RoutingIndex()
+    collections = ['neuclir/1/zh', 'neuclir/1/rus', 'neuclir/1/fa']
+    # fa has no filter, so it stays a candidate
+    assert index.route('R5', collections) == ['neuclir/1/rus', 'neuclir/1/fa']
+    assert index.route('Z5', collections[:2]) == ['neuclir/1/zh']
+    assert index.route('missing', collections[:2]) == []
+    stats = index.stats()
+    assert stats['routed'] == 3
+    assert stats['unfiltered'] == 1
+    assert stats['filters'] == {'neuclir/1/zh': 100, 'neuclir/1/ru': 100}
+
+
+def test_extract_citation_texts_does_one_lookup(lookup_dir, monkeypatch):
+    lookups = []
+
+    def lookup(doc_id, collection):
+        lookups.append(collection)
+        return utils.get_text_from_id_fast(doc_id, collection)
+
+    monkeypatch.setattr(evaluator, 'get_text_from_id_fast', lookup)
+    report = {'collection_ids': ['neuclir/1/zh', 'neuclir/1/ru'], 'sentences': []}
+    citations = evaluator.extract_citation_texts(0, report, {'text': 's', 'citations': ['R1', 'Z2']})
+    assert [c['doc_id'] for c in citations] == ['R1', 'Z2']
+    assert lookups == ['neuclir/1/ru', 'neuclir/1/zh']
+
+
+def test_resolve_citations_only_loads_needed_collections(lookup_dir):
+    report = {'collection_ids': ['neuclir/1/zh', 'neuclir/1/ru'],
+              'sentences': [{'text': 's', 'citations': ['R1', 'R2']}]}
+    table = resolve_citations([report])
+    assert table.stats['resolved'] == 2
+    assert list(table.stats['collections']) == ['neuclir/1/ru']
+    assert list(utils.get_document_cache_stats()['collections']) == ['neuclir/1/ru']
+    assert os.path.exists(filter_path('neuclir/1/zh'))
@@ -0,0 +1,50 @@
+import threading
+import time
+
+from report_gen_eval import ModelProvider, utils
+from report_gen_eval.evaluator import evaluate_report
+from report_gen_eval.scheduler import SentenceScheduler, evaluate_reports_by_sentence
+
+NUGGETS = 'assets/example_nuggets_fix.jsonl'
+
+
+def report(request_id, n):
+    return {"request_id": request_id, "run_id": "test", "collection_ids": ["test"],
+            "sentences": [{"text": f"Suicides rose by 3.7% in 2020 ({i}).", "citations": []} for i in range(n)]}
+
+
+def test_matches_evaluate_report():
+    reports = [report("300", 5), report("300", 1), report("999", 2)]
+    for provider in [ModelProvider.YES, ModelProvider.NO]:
+        expected = [evaluate_report(r, NUGGETS, provider) for r in reports]
+        assert evaluate_reports_by_sentence(reports, NUGGETS, provider, max_workers=4) == expected
+
+
+def test_report_errors_are_isolated():
+    reports = [report("300", 2), {"request_id": "bad", "run_id": "test", "collection_ids": ["test"]}]
+    scheduler = SentenceScheduler(NUGGETS, ModelProvider.YES, max_workers=2)
+    (good, good_error), (bad, bad_error) = scheduler.run(reports)
+    assert good is not None and good_error is None
+    assert bad is None and "sentences" in bad_error
+    assert scheduler.stats()["sentences"] == 2
+
+
+def test_sentences_of_one_report_run_in_parallel(monkeypatch):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+    original = utils.YesProvider.invoke
+
+    def slow_invoke(self, messages):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return original(self, messages)
+
+    monkeypatch.setattr(utils.YesProvider, 'invoke', slow_invoke)
+    scheduler = SentenceScheduler(NUGGETS, ModelProvider.YES, max_workers=8)
+    scheduler.run([report("300", 8)])
+    assert peak[0] > 1
+    assert scheduler.stats()["reports"] == 1
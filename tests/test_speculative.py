@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+from report_gen_eval import ModelProvider, utils
+from report_gen_eval.concurrency import configure_adaptive_concurrency, disable_adaptive_concurrency, \
+    get_concurrency_stats
+from report_gen_eval.evaluator import evaluate_report, evaluate_sentence, evaluate_sentence_async, load_nuggets
+from report_gen_eval.options import EvaluationOptions
+from report_gen_eval.prompts import CHECK_NEGATIVE_SYSTEM
+from report_gen_eval.utils import load_jsonl
+
+NUGGETS = 'assets/example_nuggets_fix.jsonl'
+
+REPORT = {
+    "request_id": "300",
+    "run_id": "test",
+    "collection_ids": ["test"],
+    "sentences": [
+        {"text": "Suicides in Japan did not fall in 2020.", "citations": []},
+        {"text": "Suicides rose by 3.7% in 2020.", "citations": []},
+        {"text": "It was a hard year.", "citations": []},
+    ],
+}
+
+
+def sentence_kwargs(provider):
+    return dict(sentence='Suicides rose by 3.7% in 2020.',
+                previous_sentences=['Suicides in Japan did not fall in 2020.'],
+                nuggets=load_nuggets(NUGGETS, load_jsonl('assets/example_input_one_only.jsonl')[0], False),
+                provider=provider)
+
+
+def test_speculative_matches_sequential():
+    for provider, wasted in [(ModelProvider.YES, 2), (ModelProvider.NO, 1)]:
+        options = EvaluationOptions(speculative=True)
+        kwargs = sentence_kwargs(provider)
+        assert evaluate_sentence(options=options, **kwargs) == evaluate_sentence(**kwargs)
+        assert asyncio.run(evaluate_sentence_async(options=options, **kwargs)) == evaluate_sentence(**kwargs)
+        assert options.stats()["counts"] == {"speculative_calls": 6, "speculative_wasted": 2 * wasted}
+
+
+def test_speculative_report_matches_sequential():
+    options = EvaluationOptions(speculative=True)
+    assert evaluate_report(REPORT, NUGGETS, ModelProvider.NO, options=options) == \
+        evaluate_report(REPORT, NUGGETS, ModelProvider.NO)
+    # The first sentence has no previous sentences, so no first_instance call
+    assert options.stats()["counts"] == {"speculative_calls": 8, "speculative_wasted": 2}
+
+
+def test_speculative_overlaps_judgments(monkeypatch):
+    original = utils.NoProvider.invoke
+    lock = threading.Lock()
+    in_flight = [0]
+    overlap = [0]
+
+    def slow_invoke(self, messages):
+        with lock:
+            in_flight[0] += 1
+            overlap[0] = max(overlap[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return original(self, messages)
+
+    monkeypatch.setattr(utils.NoProvider, 'invoke', slow_invoke)
+    kwargs = sentence_kwargs(ModelProvider.NO)
+    evaluate_sentence(**kwargs)
+    assert overlap[0] == 1
+    evaluate_sentence(options=EvaluationOptions(speculative=True), **kwargs)
+    assert overlap[0] > 1
+
+
+def test_async_speculative_frees_concurrency_slots(monkeypatch):
+    async def slow_ainvoke(self, messages):
+        # check_negative answers first, so the other judgments are discarded
+        # while they are still in flight
+        await asyncio.sleep(0.01 if messages[0].content == CHECK_NEGATIVE_SYSTEM else 0.2)
+        return self.invoke(messages)
+
+    monkeypatch.setattr(utils.YesProvider, 'ainvoke', slow_ainvoke)
+    configure_adaptive_concurrency(initial=4, maximum=4)
+    try:
+        options = EvaluationOptions(speculative=True)
+        for _ in range(3):
+            asyncio.run(evaluate_sentence_async(options=options, **sentence_kwargs(ModelProvider.YES)))
+        assert options.stats()["counts"]["speculative_wasted"] == 6
+        stats = get_concurrency_stats()
+        assert stats and all(limiter["in_flight"] == 0 for limiter in stats.values())
+    finally:
+        disable_adaptive_concurrency()
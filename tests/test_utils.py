@@ -1,4 +1,18 @@
-from report_gen_eval.utils import load_jsonl, get_model_response, ModelProvider
+import time
+
+from langchain.schema import AIMessage, SystemMessage
+
+from report_gen_eval import utils
+import asyncio
+
+import pytest
+
+from report_gen_eval.utils import load_jsonl, get_model_response, batch_model_responses, abatch_model_responses, \
+    ModelProvider, ModelClientPool, BatchResponseError, invoke_model, judgment_cache_key, DROPPED_RESPONSE
+from report_gen_eval.rate_limit import get_rate_limiter, reset_rate_limiters
+from report_gen_eval.cache import configure_judgment_cache, disable_judgment_cache
+from report_gen_eval.concurrency import configure_adaptive_concurrency, disable_adaptive_concurrency, \
+    get_concurrency_stats
 
 
 def test_get_model_response_yes():
@@ -7,3 +21,220 @@ def test_get_model_response_yes():
 
 def test_get_model_response_no():
     assert get_model_response('', '', ModelProvider.NO) == 'NO'
+
+
+def test_model_client_pool_reuses_clients():
+    pool = ModelClientPool()
+    first = pool.get(ModelProvider.YES)
+    assert pool.get(ModelProvider.YES) is first
+    assert pool.get(ModelProvider.YES, params={'max_tokens': 100}) is not first
+    assert pool.stats() == {'created': 2, 'reused': 1, 'pooled': 2}
+
+
+def test_model_client_pool_shares_http_client(monkeypatch):
+    monkeypatch.setenv('TOGETHER_API_KEY', 'test')
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+    pool = ModelClientPool()
+    together = pool.get(ModelProvider.TOGETHER)
+    openai = pool.get(ModelProvider.OPENAI)
+    assert together.root_client._client is openai.root_client._client
+    pool.clear()
+    assert pool.stats() == {'created': 0, 'reused': 0, 'pooled': 0}
+
+
+def test_batch_model_responses_keeps_order():
+    class EchoProvider:
+        def invoke(self, messages):
+            time.sleep(0.01 * (len(messages[1].content) % 3))
+            return SystemMessage(content='YES' if messages[1].content.startswith('y') else 'NO')
+
+    pool = utils.model_client_pool
+    prompts = ['y1', 'n22', 'y333', 'n4', 'y55', 'n666', 'y7']
+    original = utils.build_model
+    utils.build_model = lambda *args, **kwargs: EchoProvider()
+    try:
+        pool.clear()
+        assert batch_model_responses('', prompts, 'echo', max_concurrency=4) == \
+               ['YES', 'NO', 'YES', 'NO', 'YES', 'NO', 'YES']
+    finally:
+        utils.build_model = original
+        pool.clear()
+
+
+class FlakyProvider:
+    """Answers YES, except that prompts starting with 'bad' never get a valid answer
+    and prompts starting with 'flaky' fail on their first attempt."""
+
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages):
+        prompt = messages[1].content
+        self.calls.append(prompt)
+        if prompt.startswith('bad'):
+            return SystemMessage(content='MAYBE')
+        if prompt.startswith('flaky') and self.calls.count(prompt) == 1:
+            raise RuntimeError('temporary failure')
+        return SystemMessage(content='YES')
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+@pytest.fixture
+def flaky_provider():
+    provider = FlakyProvider()
+    original = utils.build_model
+    utils.build_model = lambda *args, **kwargs: provider
+    utils.model_client_pool.clear()
+    yield provider
+    utils.build_model = original
+    utils.model_client_pool.clear()
+
+
+def test_batch_model_responses_retries_each_prompt(flaky_provider):
+    prompts = ['ok1', 'flaky', 'ok2']
+    assert batch_model_responses('', prompts, 'flaky', base_delay=0) == ['YES', 'YES', 'YES']
+    # only the failing prompt is sent again
+    assert sorted(flaky_provider.calls) == ['flaky', 'flaky', 'ok1', 'ok2']
+
+
+def test_batch_model_responses_reports_failures(flaky_provider):
+    with pytest.raises(BatchResponseError) as error:
+        batch_model_responses('', ['ok1', 'bad', 'ok2'], 'flaky', max_retries=2, base_delay=0)
+    assert error.value.responses == ['YES', None, 'YES']
+    assert error.value.failures == [
+        {'index': 1, 'attempts': 2,
+         'error': 'Invalid model response: MAYBE. Expected YES or NO.'}
+    ]
+    assert flaky_provider.calls.count('ok1') == 1
+
+
+def test_batch_model_responses_retries_client_construction(tmp_path):
+    attempts = []
+
+    def failing_build(*args, **kwargs):
+        attempts.append(1)
+        raise RuntimeError('connection refused')
+
+    original = utils.build_model
+    utils.build_model = failing_build
+    utils.model_client_pool.clear()
+    cache = configure_judgment_cache(str(tmp_path / 'cache.sqlite'))
+    try:
+        with pytest.raises(BatchResponseError) as error:
+            batch_model_responses('', ['a'], 'broken', max_retries=2, base_delay=0)
+        assert error.value.failures == [{'index': 0, 'attempts': 2, 'error': 'connection refused'}]
+        assert len(attempts) == 2
+        # Prompts answered from the cache never build a client
+        cache.put(judgment_cache_key('broken', None, '', 'b'), 'YES')
+        assert batch_model_responses('', ['b'], 'broken') == ['YES']
+        assert len(attempts) == 2
+    finally:
+        disable_judgment_cache()
+        utils.build_model = original
+        utils.model_client_pool.clear()
+
+
+def test_abatch_model_responses_reports_failures(flaky_provider):
+    with pytest.raises(BatchResponseError) as error:
+        asyncio.run(abatch_model_responses('', ['flaky', 'bad'], 'flaky', max_retries=2, base_delay=0))
+    assert error.value.responses == ['YES', None]
+    assert [failure['index'] for failure in error.value.failures] == [1]
+
+
+def test_invoke_model_feeds_rate_limiter():
+    class HeaderProvider:
+        def invoke(self, messages):
+            return AIMessage(content=' yes ',
+                             response_metadata={'headers': {'x-ratelimit-remaining-requests': '0',
+                                                            'x-ratelimit-reset-requests': '3s'}})
+
+    reset_rate_limiters()
+    try:
+        assert invoke_model(HeaderProvider(), 'sys', 'user', 'headers', 'm') == 'YES'
+        assert 2.9 < get_rate_limiter('headers', 'm').reserve() <= 3
+    finally:
+        reset_rate_limiters()
+
+
+class RecordingProvider:
+    """Answers YES to prompts starting with 'y' and NO otherwise, after a delay
+    given by the prompt's last digit (in hundredths of a second)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages):
+        prompt = messages[1].content
+        time.sleep(int(prompt[-1]) / 100)
+        self.calls.append(prompt)
+        return SystemMessage(content='YES' if prompt.startswith('y') else 'NO')
+
+    async def ainvoke(self, messages):
+        prompt = messages[1].content
+        await asyncio.sleep(int(prompt[-1]) / 100)
+        self.calls.append(prompt)
+        return SystemMessage(content='YES' if prompt.startswith('y') else 'NO')
+
+
+@pytest.fixture
+def recording_provider():
+    provider = RecordingProvider()
+    original = utils.build_model
+    utils.build_model = lambda *args, **kwargs: provider
+    utils.model_client_pool.clear()
+    yield provider
+    utils.build_model = original
+    utils.model_client_pool.clear()
+
+
+def test_batch_model_responses_stops_on_first_no(recording_provider):
+    prompts = ['y0', 'n0', 'y1', 'n2']
+    assert batch_model_responses('', prompts, 'recording', max_concurrency=1, stop_on='NO') == \
+        ['YES', 'NO', None, None]
+    assert recording_provider.calls == ['y0', 'n0']
+    assert batch_model_responses('', ['y0', 'y1'], 'recording', stop_on='NO') == ['YES', 'YES']
+
+
+def test_batch_model_responses_stop_on_sends_few_calls(recording_provider):
+    # At the default batch concurrency, only STOP_ON_CONCURRENCY prompts are in flight
+    prompts = ['y5', 'n0', 'y0', 'y1', 'y2']
+    assert batch_model_responses('', prompts, 'recording', stop_on='NO') == \
+        [DROPPED_RESPONSE, 'NO', None, None, None]
+    time.sleep(0.1)
+    assert sorted(recording_provider.calls) == ['n0', 'y5']
+
+
+def test_abatch_model_responses_cancels_pending(recording_provider):
+    responses = asyncio.run(
+        abatch_model_responses('', ['y9', 'n0', 'y8'], 'recording', stop_on='NO')
+    )
+    assert responses == [DROPPED_RESPONSE, 'NO', None]
+    assert recording_provider.calls == ['n0']
+
+
+def test_cancelled_calls_free_concurrency_slots(recording_provider):
+    configure_adaptive_concurrency(initial=4, maximum=4)
+    try:
+        responses = asyncio.run(
+            abatch_model_responses('', ['n0', 'y9', 'y8', 'y7'], 'recording', stop_on='NO')
+        )
+        assert responses == ['NO', DROPPED_RESPONSE, None, None]
+        stats = get_concurrency_stats()['recording/None']
+        assert stats['in_flight'] == 0
+        # Cancellations neither count as successes nor shrink the limit
+        assert stats['successes'] == 1 and stats['overloads'] == 0
+    finally:
+        disable_adaptive_concurrency()
+
+
+def test_refund_returns_unsent_reservation():
+    reset_rate_limiters()
+    limiter = get_rate_limiter('refund', 'm')
+    limiter.requests.set_rate(1.0, capacity=1.0)
+    assert limiter.reserve() == 0
+    limiter.refund()
+    assert limiter.reserve() == 0
+    assert limiter.reserve() > 0
+    reset_rate_limiters()
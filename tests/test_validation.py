@@ -0,0 +1,50 @@
+from report_gen_eval.citations import DocTable
+from report_gen_eval.nuggets import NuggetBank
+from report_gen_eval.validation import check_report_schema, validate_report, validate_reports
+
+
+def report(request_id='300', *citations, collections=('neuclir/1/zh',)):
+    return {'request_id': request_id, 'run_id': 'r', 'collection_ids': list(collections),
+            'sentences': [{'text': f's{i}', 'citations': list(c)} for i, c in enumerate(citations)]}
+
+
+def doc_table():
+    table = DocTable()
+    table.add('D1', 'neuclir/1/zh', 'text of D1')
+    table.add('D2', 'neuclir/1/zh', None)
+    return table
+
+
+NUGGETS = NuggetBank([{'query_id': '300', 'items': []}])
+
+
+def test_check_report_schema():
+    assert check_report_schema(report('300', ['D1'])) == []
+    assert check_report_schema({'request_id': '300'}) == \
+        ['Missing required fields in report: run_id, collection_ids, sentences']
+    assert check_report_schema({**report(), 'sentences': [{'citations': []}]}) == ['Sentence 1 has no text']
+    assert check_report_schema({**report(), 'collection_ids': 'neuclir/1/zh'}) == ['collection_ids must be a list']
+    assert check_report_schema(['not', 'a', 'report']) == ['Report is not a JSON object']
+
+
+def test_validate_report_citations():
+    assert validate_report(report('300', ['D1'], []), doc_table(), NUGGETS) == []
+    assert validate_report(report('300', ['D1'], ['D2']), doc_table(), NUGGETS) == \
+        ['Sentence 2: citation D2 was not found in any collection']
+    assert validate_report(report('300', ['D3']), doc_table(), NUGGETS) == \
+        ['Sentence 1: citation D3 could not be looked up in neuclir/1/zh']
+
+
+def test_validate_report_nuggets():
+    assert validate_report(report('999', ['D1']), doc_table(), NUGGETS) == ['No nuggets found for request 999']
+    # Without a nugget bank, missing nuggets are allowed
+    assert validate_report(report('999', ['D1']), doc_table()) == []
+
+
+def test_validate_reports_splits_accepted_and_rejected():
+    reports = [report('300', ['D1']), report('999'), {'request_id': '301'}, report('300', ['D2'])]
+    accepted, rejected = validate_reports(reports, NUGGETS, doc_table())
+    assert accepted == [reports[0]]
+    assert [r['report_id'] for r in rejected] == ['999', '301', '300']
+    assert rejected[0]['errors'] == ['No nuggets found for request 999']
+    assert rejected[2]['report_data'] is reports[3]